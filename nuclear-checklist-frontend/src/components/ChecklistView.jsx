@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
@@ -57,6 +57,29 @@ export function ChecklistView() {
     fetchItems()
   }, [selectedCategory, selectedSubCategory, statusFilter])
 
+  // Sunucudan gelen değişiklik olaylarını dinle (her değişiklikte tüm listeyi yeniden çekmek yerine)
+  const fetchItemsRef = useRef(null)
+  fetchItemsRef.current = fetchItems
+
+  useEffect(() => {
+    const source = new EventSource('http://localhost:8000/events/')
+
+    source.addEventListener('changes', (event) => {
+      const { events } = JSON.parse(event.data)
+      if (events.some(change => change.type !== 'item_updated')) {
+        fetchItemsRef.current()
+        return
+      }
+      const statusUpdates = new Map(events.map(change => [change.item_id, change.status]))
+      setItems(current => current.map(item =>
+        statusUpdates.has(item.item_id) ? { ...item, status: statusUpdates.get(item.item_id) } : item
+      ))
+    })
+    source.addEventListener('resync', () => fetchItemsRef.current())
+
+    return () => source.close()
+  }, [])
+
   const fetchItems = async () => {
     setLoading(true)
     try {
@@ -34,33 +34,19 @@ export function VisualizationCharts() {
 
   const fetchData = async () => {
     try {
-      // İstatistikleri çek
-      const statsResponse = await fetch('http://localhost:8000/statistics/')
+      // İstatistikleri kategori kırılımı ile tek istekte çek
+      const statsResponse = await fetch('http://localhost:8000/statistics/?breakdown=true')
       const statsData = await statsResponse.json()
       setStatistics(statsData)
 
-      // Kategorileri çek ve her kategori için veri oluştur
-      const categoriesResponse = await fetch('http://localhost:8000/categories/')
-      const categories = await categoriesResponse.json()
-      
-      // Her kategori için madde sayısını hesapla
-      const categoryStats = await Promise.all(
-        categories.map(async (category) => {
-          const itemsResponse = await fetch(`http://localhost:8000/checklist-items/?category=${encodeURIComponent(category)}`)
-          const items = await itemsResponse.json()
-          const completed = items.filter(item => item.status).length
-          const total = items.length
-          
-          return {
-            name: category.length > 20 ? category.substring(0, 20) + '...' : category,
-            fullName: category,
-            total: total,
-            completed: completed,
-            pending: total - completed,
-            completionRate: total > 0 ? Math.round((completed / total) * 100) : 0
-          }
-        })
-      )
+      const categoryStats = statsData.categories.map((category) => ({
+        name: category.category.length > 20 ? category.category.substring(0, 20) + '...' : category.category,
+        fullName: category.category,
+        total: category.total_items,
+        completed: category.completed_items,
+        pending: category.pending_items,
+        completionRate: Math.round(category.completion_rate)
+      }))
       
       setCategoryData(categoryStats)
     } catch (error) {
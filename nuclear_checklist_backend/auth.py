@@ -2,34 +2,112 @@ from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import hashlib
 import os
+import threading
+import time
+
+from database import AsyncSessionLocal
+from models import User
 
 # JWT ayarları
 SECRET_KEY = os.getenv("SECRET_KEY", "nuclear-checklist-secret-key-2024")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Doğrulanmış token önbelleği (token süresi dolmadan da en geç TTL sonunda yeniden doğrulanır)
+TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "300"))
+# Kullanıcı kayıtlarının önbellekte tutulma süresi (saniye)
+USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+# bcrypt işlemleri için ayrılan iş parçacığı sayısı (giriş yoğunluğu diğer istekleri bekletmez)
+PASSWORD_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+
 # Şifre hashleme
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
 
 # Bearer token güvenliği
 security = HTTPBearer()
 
-# Basit kullanıcı veritabanı (gerçek uygulamada veritabanından gelecek)
-fake_users_db = {
-    "admin": {
+# İlk kurulumda oluşturulan varsayılan kullanıcılar (şifre: secret - kurulumdan sonra değiştirilmeli)
+DEFAULT_USERS = [
+    {
         "username": "admin",
         "hashed_password": "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",  # secret
         "role": "admin"
     },
-    "user": {
+    {
         "username": "user",
         "hashed_password": "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",  # secret
         "role": "user"
     }
-}
+]
+
+class TTLCache:
+    """Boyutu sınırlı, girdi başına son kullanma zamanı olan LRU önbellek"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0
+            }
+
+# Token özeti -> doğrulanmış JWT içeriği
+token_cache = TTLCache(TOKEN_CACHE_SIZE)
+# Kullanıcı adı -> kullanıcı sözlüğü
+user_cache = TTLCache(USER_CACHE_SIZE)
+
+def token_digest(token: str) -> str:
+    """Token'ın önbellek anahtarı (ham token bellekte anahtar olarak tutulmaz)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
 def verify_password(plain_password, hashed_password):
     """Şifreyi doğrula"""
@@ -39,19 +117,57 @@ def get_password_hash(password):
     """Şifreyi hashle"""
     return pwd_context.hash(password)
 
-def get_user(username: str):
-    """Kullanıcıyı getir"""
-    if username in fake_users_db:
-        user_dict = fake_users_db[username]
-        return user_dict
-    return None
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """Şifreyi olay döngüsünü bloklamadan bcrypt iş parçacığı havuzunda doğrula"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    """Şifreyi bcrypt iş parçacığı havuzunda hashle"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
 
-def authenticate_user(username: str, password: str):
+def _user_to_dict(user: User) -> Dict[str, Any]:
+    return {
+        "username": user.username,
+        "hashed_password": user.hashed_password,
+        "role": user.role,
+        "is_active": user.is_active
+    }
+
+def ensure_default_users(db: Session) -> None:
+    """Kullanıcı tablosu boşsa varsayılan kullanıcıları oluştur"""
+    if db.query(User.username).first() is None:
+        db.add_all(User(**user) for user in DEFAULT_USERS)
+        db.commit()
+
+async def get_user(username: str) -> Optional[Dict[str, Any]]:
+    """Kullanıcıyı getir (önbellekte yoksa veritabanından)"""
+    user = user_cache.get(username)
+    if user is not None:
+        return user
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).where(User.username == username))
+        db_user = result.scalar_one_or_none()
+    if db_user is None:
+        return None
+
+    user = _user_to_dict(db_user)
+    user_cache.set(username, user, time.time() + USER_CACHE_TTL)
+    return user
+
+def invalidate_user(username: str) -> None:
+    """Kullanıcı kaydı değiştiğinde önbellekteki kullanıcıyı ve tokenlarını geçersiz kıl"""
+    user_cache.discard(username)
+    token_cache.clear()
+
+async def authenticate_user(username: str, password: str):
     """Kullanıcıyı doğrula"""
-    user = get_user(username)
-    if not user:
+    user = await get_user(username)
+    if not user or not user["is_active"]:
         return False
-    if not verify_password(password, user["hashed_password"]):
+    if not await verify_password_async(password, user["hashed_password"]):
         return False
     return user
 
@@ -66,6 +182,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def decode_token(token: str) -> Dict[str, Any]:
+    """Token'ı doğrula; aynı token için imza doğrulamasını önbellek süresince tekrarlama"""
+    key = token_digest(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    expires_at = time.time() + TOKEN_CACHE_TTL
+    if "exp" in payload:
+        expires_at = min(expires_at, float(payload["exp"]))
+    token_cache.set(key, payload, expires_at)
+    return payload
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Mevcut kullanıcıyı getir"""
     credentials_exception = HTTPException(
@@ -74,15 +204,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(credentials.credentials)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    
-    user = get_user(username=username)
-    if user is None:
+
+    user = await get_user(username=username)
+    if user is None or not user["is_active"]:
         raise credentials_exception
     return user
 
@@ -94,4 +224,3 @@ async def get_current_admin_user(current_user: dict = Depends(get_current_user))
             detail="Bu işlem için admin yetkisi gerekli"
         )
     return current_user
-
@@ -0,0 +1,9 @@
+"""Sentetik veri üreteci ve süreç içi yük/performans ölçüm araçları
+
+Kullanım (nuclear_checklist_backend dizininden)::
+
+    python -m benchmarks --items 10000 --concurrency 8 --save-baseline
+    python -m benchmarks --items 10000 --concurrency 8 --baseline benchmarks/baseline.json
+    python -m benchmarks.generator --items 100000 --format csv --output items.csv
+    python -m benchmarks.serialization --items 10000
+"""
@@ -0,0 +1,154 @@
+import argparse
+import csv
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Yapısı örnek alınan gerçek çeklist
+SOURCE_FILE = Path(__file__).resolve().parent.parent / "pasted_content.txt"
+# İçe aktarma CSV biçimindeki başlıklar
+CSV_HEADER = ["Kategori", "Alt Kategori", "Madde Metni", "Standartlar", "Durum"]
+
+
+@dataclass
+class ChecklistTemplate:
+    """Örnek çeklistten çıkarılan kategori yapısı ve metin/standart havuzları"""
+
+    categories: List[Tuple[str, List[str]]]
+    labels: List[str]
+    phrases: List[str]
+    standards: List[str]
+    items_per_sub_category: int
+
+
+def load_template(path: Path = SOURCE_FILE) -> ChecklistTemplate:
+    """Markdown çeklistten üretim şablonunu oluştur"""
+    from ingestion import parse_checklist_file
+
+    items = parse_checklist_file(path)
+    categories: Dict[str, List[str]] = {}
+    labels, phrases, standards = [], [], set()
+    for item in items:
+        sub_categories = categories.setdefault(item["category"], [])
+        if item["sub_category"] not in sub_categories:
+            sub_categories.append(item["sub_category"])
+        label, _, phrase = item["item_text"].partition(":")
+        labels.append(label.strip())
+        phrases.append((phrase or label).strip())
+        if item["standards"]:
+            standards.add(item["standards"])
+
+    sub_category_count = sum(len(subs) for subs in categories.values())
+    return ChecklistTemplate(
+        categories=list(categories.items()),
+        labels=labels,
+        phrases=phrases,
+        standards=sorted(standards) or ["IEC 61513", "SSG-39", "IAEA-TECDOC-1848"],
+        items_per_sub_category=max(len(items) // max(sub_category_count, 1), 1),
+    )
+
+
+def generate_items(count: int, seed: int = 42, start: int = 0, template: Optional[ChecklistTemplate] = None,
+                   completed_ratio: float = 0.1) -> Iterator[Dict[str, Any]]:
+    """Örnek çeklist yapısında ``count`` adet benzersiz madde üret (aynı tohumla aynı çıktı)
+
+    Kategori ve alt kategoriler şablondakiler tükendikçe numaralandırılarak
+    çoğaltılır; böylece alt kategori başına madde sayısı ölçekten bağımsız kalır.
+    """
+    template = template or load_template()
+    rng = random.Random(seed * 1_000_003 + start)
+    per_sub_category = template.items_per_sub_category
+    flat_sub_categories = [
+        (category, sub_category)
+        for category, sub_categories in template.categories
+        for sub_category in sub_categories
+    ]
+
+    for index in range(start, start + count):
+        group = index // per_sub_category
+        category, sub_category = flat_sub_categories[group % len(flat_sub_categories)]
+        cycle = group // len(flat_sub_categories)
+        if cycle:
+            category = f"{category} #{cycle + 1}"
+            sub_category = f"{sub_category} #{cycle + 1}"
+
+        standards = rng.choice(template.standards) if rng.random() < 0.8 else ""
+        yield {
+            "category": category,
+            "sub_category": sub_category,
+            "item_text": f"{rng.choice(template.labels)}: {rng.choice(template.phrases)} [{index}]",
+            "standards": standards,
+            "status": rng.random() < completed_ratio,
+        }
+
+
+def write_json(path: str, count: int, seed: int = 42) -> None:
+    """Üretilen maddeleri içe aktarma JSON biçiminde dosyaya yaz"""
+    with open(path, "w", encoding="utf-8") as output:
+        output.write("[")
+        for index, item in enumerate(generate_items(count, seed)):
+            output.write(("," if index else "") + "\n  " + json.dumps(item, ensure_ascii=False))
+        output.write("\n]\n")
+
+
+def write_csv(path: str, count: int, seed: int = 42) -> None:
+    """Üretilen maddeleri içe aktarma CSV biçiminde dosyaya yaz"""
+    with open(path, "w", encoding="utf-8-sig", newline="") as output:
+        writer = csv.writer(output)
+        writer.writerow(CSV_HEADER)
+        for item in generate_items(count, seed):
+            writer.writerow([
+                item["category"], item["sub_category"], item["item_text"], item["standards"],
+                "Tamamlandı" if item["status"] else "Bekliyor",
+            ])
+
+
+def populate(count: int, seed: int = 42, batch_size: int = 5000) -> int:
+    """Üretilen maddeleri DATABASE_URL veritabanına toplu INSERT ile yaz"""
+    from sqlalchemy import insert
+
+    from content_hash import content_hash
+    from database import Base, engine
+    from models import ChecklistItem
+
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    batch = []
+    with engine.begin() as connection:
+        for item in generate_items(count, seed):
+            batch.append({
+                **item,
+                "content_hash": content_hash(item["category"], item["sub_category"], item["item_text"]),
+                "created_at": now,
+                "updated_at": now,
+            })
+            if len(batch) >= batch_size:
+                connection.execute(insert(ChecklistItem), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(ChecklistItem), batch)
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sentetik çeklist verisi üret")
+    parser.add_argument("--items", type=int, default=10_000, help="Üretilecek madde sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=["json", "csv", "db"], default="json",
+                        help="db: DATABASE_URL veritabanına doğrudan yaz")
+    parser.add_argument("--output", help="json/csv için çıktı dosyası")
+    args = parser.parse_args()
+
+    if args.format == "db":
+        populate(args.items, args.seed)
+    else:
+        output = args.output or f"checklist_{args.items}.{args.format}"
+        (write_json if args.format == "json" else write_csv)(output, args.items, args.seed)
+    print(f"{args.items} madde üretildi")
+
+
+if __name__ == "__main__":
+    main()
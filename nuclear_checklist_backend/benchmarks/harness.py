@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Senaryo başına varsayılan istek sayısı (ağır senaryolar daha az tekrarlanır)
+DEFAULT_REQUESTS = {
+    "list": 200,
+    "filter": 200,
+    "stats": 200,
+    "toggle": 200,
+    "import": 20,
+    "export": 5,
+}
+SCENARIOS = tuple(DEFAULT_REQUESTS)
+# İçe aktarma senaryosunda istek başına gönderilen yeni madde sayısı
+IMPORT_BATCH = 100
+# Karşılaştırmada izin verilen en fazla kötüleşme oranı (p95 artışı / throughput düşüşü)
+DEFAULT_THRESHOLD = 0.25
+
+
+def configure_environment(workdir: str) -> None:
+    """Uygulama modülleri yüklenmeden önce ölçüm veritabanını ve yan dizinleri ayarla"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    os.environ.setdefault("LOG_DIR", os.path.join(workdir, "logs"))
+    os.environ.setdefault("JOB_STORAGE_DIR", os.path.join(workdir, "jobs"))
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Sıralı değerlerde en yakın sıra yöntemiyle yüzdelik"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(percent / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_scenario(client, send: Callable[[Any, int], Awaitable[Any]], requests: int,
+                       concurrency: int) -> Dict[str, Any]:
+    """``send`` isteğini ``concurrency`` eşzamanlı işçiyle ``requests`` kez çalıştır ve ölç"""
+    latencies: List[float] = []
+    errors = 0
+    indices = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for index in indices:
+            started = time.perf_counter()
+            response = await send(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def build_scenarios(items: int, categories: List[str], seed: int) -> Dict[str, Callable]:
+    """Senaryo adı -> (istemci, sıra) alıp tek istek gönderen eşyordam"""
+    from benchmarks.generator import generate_items, load_template
+
+    rng = random.Random(seed)
+    template = load_template()
+
+    async def list_items(client, index):
+        skip = rng.randrange(0, max(items - 100, 1))
+        return await client.get("/checklist-items/", params={"skip": skip, "limit": 100})
+
+    async def filter_items(client, index):
+        params = {"category": rng.choice(categories), "status": "false", "limit": 100}
+        return await client.get("/checklist-items/", params=params)
+
+    async def stats(client, index):
+        return await client.get("/statistics/", params={"breakdown": "true"})
+
+    async def toggle(client, index):
+        item_id = rng.randint(1, items)
+        return await client.put(f"/checklist-items/{item_id}", json={"status": bool(index % 2)})
+
+    async def import_items(client, index):
+        batch = list(generate_items(IMPORT_BATCH, seed, start=items + index * IMPORT_BATCH, template=template))
+        return await client.post("/data-management/import/json", json={"data": json.dumps(batch)})
+
+    async def export(client, index):
+        return await client.get("/data-management/export/csv")
+
+    return {
+        "list": list_items,
+        "filter": filter_items,
+        "stats": stats,
+        "toggle": toggle,
+        "import": import_items,
+        "export": export,
+    }
+
+
+async def run_benchmarks(items: int, concurrency: int, scenarios: List[str], seed: int,
+                         requests: Optional[int] = None) -> Dict[str, Any]:
+    """Uygulamayı süreç içinde ASGI istemcisiyle çalıştırıp senaryoları sırayla ölç"""
+    import httpx
+
+    import main as app_module
+    from database import async_engine
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            categories = (await client.get("/categories/")).json()
+            senders = build_scenarios(items, categories, seed)
+            for name in scenarios:
+                count = requests or DEFAULT_REQUESTS[name]
+                results[name] = await run_scenario(client, senders[name], count, concurrency)
+                print(_format_row(name, results[name]), flush=True)
+    finally:
+        await async_engine.dispose()
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Temel ölçüme göre eşiği aşan kötüleşmeleri listele"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']:.2f} ms -> {current['p95_ms']:.2f} ms"
+            )
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f} istek/sn"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: hata sayısı {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def _format_row(name: str, result: Dict[str, Any]) -> str:
+    return (
+        f"{name:<8} {result['requests']:>6} istek  {result['throughput_rps']:>9.1f} istek/sn  "
+        f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  hata {result['errors']}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Çeklist API'si için süreç içi yük ve performans ölçümü")
+    parser.add_argument("--items", type=int, default=10_000, help="Sentetik madde sayısı (ör. 10000, 100000, 1000000)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Eşzamanlı istemci sayısı")
+    parser.add_argument("--requests", type=int, help="Tüm senaryolar için istek sayısı (varsayılan senaryoya göre)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Virgülle ayrılmış senaryo listesi")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="Ölçüm veritabanı dizini (varsayılan geçici dizin)")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", default=os.path.join(os.path.dirname(__file__), "baseline.json"),
+                        help="Karşılaştırma için temel ölçüm dosyası")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları temel ölçüm olarak kaydet")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="İzin verilen kötüleşme oranı (0.25 = %%25)")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="checklist-benchmark-")
+    os.makedirs(workdir, exist_ok=True)
+    configure_environment(workdir)
+
+    from benchmarks.generator import populate
+
+    started = time.perf_counter()
+    populate(args.items, args.seed)
+    print(f"{args.items} madde oluşturuldu ({time.perf_counter() - started:.1f} sn): {workdir}", flush=True)
+
+    scenario_results = asyncio.run(
+        run_benchmarks(args.items, args.concurrency, scenarios, args.seed, args.requests)
+    )
+    results = {
+        "meta": {
+            "items": args.items,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.utcnow().isoformat(),
+        },
+        "scenarios": scenario_results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+        print(f"Temel ölçüm kaydedildi: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("Temel ölçüm bulunamadı; karşılaştırma yapılmadı")
+        return
+
+    with open(args.baseline, encoding="utf-8") as source:
+        baseline = json.load(source)
+    if (baseline["meta"]["items"], baseline["meta"]["concurrency"]) != (args.items, args.concurrency):
+        print("Uyarı: temel ölçüm farklı madde sayısı/eşzamanlılık ile alınmış")
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("Performans kötüleşmesi:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print(f"Kötüleşme yok (eşik %{args.threshold * 100:.0f})")
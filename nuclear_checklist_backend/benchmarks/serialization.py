@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Karşılaştırılan istekler: (ad, hızlı yol anahtarı, yol, sorgu parametreleri)
+CASES = (
+    ("list", "checklist_items", "/checklist-items/", {"limit": 1000}),
+    ("list_offset", "checklist_items", "/checklist-items/", {"skip": 500, "limit": 500, "include_total": "true"}),
+    ("list_cursor", "checklist_items", "/checklist-items/", {"cursor": "", "sort": "category", "limit": 1000}),
+    ("list_filter", "checklist_items", "/checklist-items/", {"status": "false", "limit": 1000}),
+    ("list_edge", "checklist_items", "/checklist-items/", {"category": "Serileştirme Denetimi"}),
+    ("export_json", "export", "/data-management/export/json", {}),
+    ("export_ndjson", "export", "/data-management/export/ndjson", {}),
+    ("export_columns", "export", "/data-management/export/json", {"columns": "item_id,item_text,updated_at"}),
+)
+# Kaçış kuralları farklı kodlayıcılarda ayrışabilecek metinler
+EDGE_TEXTS = (
+    'Tırnak " ve ters bölü \\ içeren madde',
+    "Satır\nsonu, sekme\t ve denetim \x01 karakteri",
+    "Ayraçlar     ve emoji \U0001F680",
+    "ÇĞİÖŞÜ çğıöşü – “tipografik” ‘tırnak’",
+)
+# Başlıklardan yalnızca içerikle ilgili olanlar karşılaştırılır
+COMPARED_HEADERS = ("content-type", "content-length", "etag", "x-next-cursor", "x-total-count")
+
+
+async def add_edge_items(client) -> None:
+    """Byte eşitliği denetimi için kaçış gerektiren metinlerle madde ekle"""
+    for index, text in enumerate(EDGE_TEXTS):
+        response = await client.post("/checklist-items/", json={
+            "category": "Serileştirme Denetimi",
+            "sub_category": f"Özel Karakterler {index}",
+            "item_text": text,
+            "standards": None if index % 2 else text,
+            "status": bool(index % 2),
+        })
+        response.raise_for_status()
+
+
+async def fetch(client, endpoint: str, fast: bool, path: str, params: Dict[str, Any]) -> Tuple[Any, float]:
+    """İsteği hızlı yol açık/kapalı olarak gönder; yanıtı ve süresini döndür"""
+    import fast_json
+
+    if fast:
+        fast_json.FAST_JSON_ENDPOINTS.add(endpoint)
+    else:
+        fast_json.FAST_JSON_ENDPOINTS.discard(endpoint)
+    started = time.perf_counter()
+    response = await client.get(path, params=params, headers={"Accept-Encoding": "identity"})
+    return response, time.perf_counter() - started
+
+
+def row_count(name: str, response) -> int:
+    if name.startswith("export_ndjson"):
+        return response.content.count(b"\n")
+    return len(response.json())
+
+
+async def run(repeat: int) -> List[str]:
+    """Her durumda iki yolun çıktısını karşılaştır ve satır/sn ölç; farkları döndür"""
+    import httpx
+
+    import fast_json
+    import main as app_module
+    from database import async_engine
+
+    original = set(fast_json.FAST_JSON_ENDPOINTS)
+    mismatches = []
+    transport = httpx.ASGITransport(app=app_module.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            await add_edge_items(client)
+            for name, endpoint, path, params in CASES:
+                timings = {True: [], False: []}
+                bodies = {}
+                for _ in range(repeat):
+                    for fast in (False, True):
+                        response, elapsed = await fetch(client, endpoint, fast, path, params)
+                        response.raise_for_status()
+                        timings[fast].append(elapsed)
+                        bodies[fast] = response
+                slow, quick = bodies[False], bodies[True]
+                if slow.content != quick.content:
+                    mismatches.append(f"{name}: gövde farklı")
+                for header in COMPARED_HEADERS:
+                    if slow.headers.get(header) != quick.headers.get(header):
+                        mismatches.append(
+                            f"{name}: {header} farklı ({slow.headers.get(header)!r} != {quick.headers.get(header)!r})"
+                        )
+                rows = row_count(name, quick)
+                orm_rate = rows / min(timings[False])
+                fast_rate = rows / min(timings[True])
+                print(
+                    f"{name:<15} {rows:>8} satır  ORM {orm_rate:>11.0f} satır/sn  "
+                    f"hızlı {fast_rate:>11.0f} satır/sn  x{fast_rate / orm_rate:.2f}",
+                    flush=True,
+                )
+    finally:
+        fast_json.FAST_JSON_ENDPOINTS.clear()
+        fast_json.FAST_JSON_ENDPOINTS.update(original)
+        await async_engine.dispose()
+    return mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="ORM'siz hızlı serileştirme yolunu ORM/yanıt modeli yoluyla karşılaştır (byte eşitliği ve satır/sn)"
+    )
+    parser.add_argument("--items", type=int, default=10_000, help="Sentetik madde sayısı")
+    parser.add_argument("--repeat", type=int, default=5, help="Her durum için tekrar sayısı (en iyi süre alınır)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="Ölçüm veritabanı dizini (varsayılan geçici dizin)")
+    args = parser.parse_args(argv)
+
+    from benchmarks.harness import configure_environment
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="checklist-serialization-")
+    os.makedirs(workdir, exist_ok=True)
+    configure_environment(workdir)
+
+    from benchmarks.generator import populate
+
+    populate(args.items, args.seed)
+    import fast_json
+
+    print(f"{args.items} madde, kodlayıcı: {'orjson' if fast_json.orjson is not None else 'json'}", flush=True)
+
+    mismatches = asyncio.run(run(args.repeat))
+    if mismatches:
+        print("Hızlı yol çıktısı farklı:")
+        for mismatch in mismatches:
+            print(f"  - {mismatch}")
+        sys.exit(1)
+    print("Tüm durumlarda çıktı bayt bayt aynı")
+
+
+if __name__ == "__main__":
+    main()
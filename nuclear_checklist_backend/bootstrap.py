@@ -0,0 +1,34 @@
+from database import Base, engine
+from models import ChecklistItem, ChecklistItemHistory
+from migrations import upgrade_schema, create_missing_indexes
+from search_index import search_index
+from data_version import data_version
+from history import status_history
+
+
+def prepare_database() -> None:
+    """Veritabanını kullanıma hazırla (tablolar, şema yükseltmeleri, arama indeksi, veri sürümü, geçmiş)
+
+    Yalnızca şemayı ve kalıcı yapıları hazırlar; sunucuya özgü yan etkiler
+    (arka plan işlerinin kurtarılması, varsayılan kullanıcılar) ``main`` içinde
+    kalır. Böylece ingestion CLI ve data_loader çalışan sunucunun işlerine
+    dokunmadan aynı veritabanını hazırlayabilir. Bu süreçlerin yazmaları kalıcı
+    veri sürümünü artırır; sunucu bir sonraki okumada kendi önbelleklerini
+    geçersiz kılar.
+    """
+    # Tabloları oluştur
+    Base.metadata.create_all(bind=engine)
+
+    # Mevcut veritabanlarını yeni şemaya yükselt (eksik sütunlar, content_hash doldurma, indeksler)
+    upgrade_schema(engine, ChecklistItem.__table__)
+
+    # Tam metin arama indeksini hazırla (SQLite'ta FTS5, aksi halde bellek içi indeks)
+    search_index.setup(engine, ChecklistItem.__table__)
+
+    # Kalıcı veri sürümünü yükle
+    data_version.setup()
+
+    # Madde geçmişini hazırla (sonradan eklenen indeksler; boşsa mevcut maddeler başlangıç kaydı olur)
+    # ve kontrol noktası al
+    create_missing_indexes(engine, ChecklistItemHistory.__table__)
+    status_history.setup()
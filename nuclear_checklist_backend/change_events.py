@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger("nuclear_checklist_api")
+
+# Aynı pencere içindeki olaylar tek mesajda birleştirilir (saniye)
+COALESCE_WINDOW = 0.1
+# Abone başına bekleyen mesaj sınırı; aşılırsa abone "resync" ile yeniden senkronizasyona yönlendirilir
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscriber:
+    """Tek bir bağlı istemcinin mesaj kuyruğu ve kategori filtresi"""
+
+    def __init__(self, categories: Optional[Set[str]] = None):
+        self.categories = categories or None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        if self.categories is None:
+            return True
+        if "category" in event:
+            return event["category"] in self.categories
+        if "categories" in event:
+            return bool(self.categories.intersection(event["categories"]))
+        # Kategori bilgisi olmayan olaylar (ör. tüm tabloyu değiştiren içe aktarma) herkese gider
+        return True
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        """Mesajı kuyruğa koy; kuyruk doluysa bekleyenleri atıp tek bir resync mesajı bırak"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "reason": "backpressure"})
+            self.overflowed = True
+
+
+class ChangeBroker:
+    """Yazma işlemlerinden gelen değişiklik olaylarını bağlı istemcilere yayınlar
+
+    Olaylar ``COALESCE_WINDOW`` süresince biriktirilir; aynı maddeye ait
+    ardışık olaylardan yalnızca sonuncusu gönderilir.
+    """
+
+    def __init__(self):
+        self._subscribers: Set[Subscriber] = set()
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_scheduled = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered_batches = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, categories: Optional[Set[str]] = None) -> Subscriber:
+        self._loop = asyncio.get_running_loop()
+        subscriber = Subscriber(categories)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, **data: Any) -> None:
+        """Değişiklik olayı yayınla (olay döngüsünden veya iş parçacıklarından çağrılabilir)"""
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        with self._lock:
+            self.published += 1
+            self._pending.append({"type": event_type, **data})
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            loop.call_later(COALESCE_WINDOW, self._flush)
+        else:
+            loop.call_soon_threadsafe(loop.call_later, COALESCE_WINDOW, self._flush)
+
+    @staticmethod
+    def _coalesce(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        latest: Dict[Any, int] = {}
+        for index, event in enumerate(events):
+            if "item_id" in event:
+                latest[event["item_id"]] = index
+        return [
+            event for index, event in enumerate(events)
+            if "item_id" not in event or latest[event["item_id"]] == index
+        ]
+
+    def _flush(self) -> None:
+        with self._lock:
+            events, self._pending = self._pending, []
+            self._flush_scheduled = False
+        events = self._coalesce(events)
+        if not events:
+            return
+        for subscriber in list(self._subscribers):
+            selected = [event for event in events if subscriber.wants(event)]
+            if selected:
+                subscriber.offer({"type": "changes", "events": selected})
+        self.delivered_batches += 1
+
+    async def stream(self, subscriber: Subscriber, heartbeat: float = 15.0):
+        """Aboneye gelen mesajları Server-Sent Events biçiminde üret"""
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {message['type']}\ndata: {json.dumps(message, ensure_ascii=False, default=str)}\n\n"
+            if message["type"] == "resync":
+                # İstemci yeniden bağlanıp tüm veriyi çekmeli
+                break
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "delivered_batches": self.delivered_batches,
+        }
+
+
+# Uygulama genelinde paylaşılan yayıncı
+change_broker = ChangeBroker()
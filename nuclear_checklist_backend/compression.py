@@ -0,0 +1,285 @@
+import gzip
+import io
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+import anyio
+
+try:
+    import zstandard
+except ImportError:  # zstd isteğe bağlıdır; kurulu değilse yalnızca gzip kullanılır
+    zstandard = None
+
+# Bu boyutun altındaki tek parçalı yanıtlar sıkıştırılmaz (bayt)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+# Bu boyuttan büyük parçalar olay döngüsünü bloklamamak için iş parçacığında sıkıştırılır (bayt)
+COMPRESSION_THREAD_THRESHOLD = int(os.getenv("COMPRESSION_THREAD_THRESHOLD", str(256 * 1024)))
+
+# Sunucu tercihi: istemcinin q değerleri eşitse önce zstd
+SUPPORTED_ENCODINGS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+# Yüklemelerde tanınan sıkıştırma uzantıları
+UPLOAD_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/xml",
+                       "application/javascript", "application/vnd.msgpack")
+# Olay akışı parça parça anında iletilmelidir; tamponlayan sıkıştırma uygulanmaz
+_EXCLUDED_TYPES = ("text/event-stream",)
+
+
+# --- Yüklemeler ---
+
+def split_upload_name(filename: str) -> Tuple[str, Optional[str]]:
+    """Dosya adından sıkıştırma uzantısını ayır: 'veri.csv.gz' -> ('veri.csv', 'gzip')"""
+    root, extension = os.path.splitext(filename or "")
+    encoding = UPLOAD_SUFFIXES.get(extension.lower())
+    if encoding is None:
+        return filename, None
+    return root, encoding
+
+
+class DecompressingReader(io.RawIOBase):
+    """Sıkıştırılmış ikili akışı okurken açan dosya benzeri nesne
+
+    ``tell()`` sıkıştırılmış kaynaktaki konumu döndürür; içe aktarma ilerlemesi
+    yüklenen dosya boyutuna göre hesaplanmaya devam eder.
+    """
+
+    def __init__(self, source, encoding: str):
+        self._source = source
+        if encoding == "gzip":
+            self._reader = gzip.GzipFile(fileobj=source, mode="rb")
+        elif encoding == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd sıkıştırması için 'zstandard' paketi kurulu değil")
+            self._reader = zstandard.ZstdDecompressor().stream_reader(
+                source, read_across_frames=True, closefd=False
+            )
+        else:
+            raise ValueError(f"Desteklenmeyen sıkıştırma: {encoding}")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._reader.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def tell(self) -> int:
+        return self._source.tell()
+
+
+def open_upload(source, encoding: Optional[str]):
+    """Yüklenen dosyayı gerekiyorsa açarak okunacak ikili akışı döndür"""
+    if encoding is None:
+        return source
+    return DecompressingReader(source, encoding)
+
+
+# --- Yanıtlar ---
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding başlığına göre desteklenen en uygun kodlamayı seç (yoksa None)"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compressor(encoding: str):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compressobj()
+    return zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def _encoded_etag(etag: bytes, encoding: str) -> bytes:
+    """Güçlü ETag sıkıştırılmış temsil için kodlama son eki alır: "v" -> "v-gzip" """
+    if etag.endswith(b'"'):
+        return etag[:-1] + b"-" + encoding.encode() + b'"'
+    return etag
+
+
+def _strip_etag_suffixes(if_none_match: bytes) -> Tuple[bytes, Optional[str]]:
+    """If-None-Match içindeki kodlama son eklerini kaldır; kaldırılan kodlamayı da döndür"""
+    stripped = None
+    values: List[bytes] = []
+    for value in if_none_match.split(b","):
+        value = value.strip()
+        for encoding in SUPPORTED_ENCODINGS:
+            suffix = b"-" + encoding.encode() + b'"'
+            if value.endswith(suffix):
+                value = value[:-len(suffix)] + b'"'
+                stripped = encoding
+                break
+        values.append(value)
+    return b", ".join(values), stripped
+
+
+class CompressionMiddleware:
+    """Accept-Encoding'e göre yanıtları gzip/zstd ile sıkıştıran saf ASGI middleware
+
+    Tek parçalı yanıtlar ``minimum_size`` altındaysa olduğu gibi gönderilir; akış
+    yanıtları (parça parça dışa aktarmalar, dosya indirmeleri) parça parça
+    sıkıştırılır. Sıkıştırılmış yanıtın ETag'i kodlamaya özgü son ek alır.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = b""
+        if_none_match_index = None
+        for index, (name, value) in enumerate(scope["headers"]):
+            if name == b"accept-encoding":
+                accept_encoding = value
+            elif name == b"if-none-match":
+                if_none_match_index = index
+        encoding = negotiate_encoding(accept_encoding.decode("latin-1"))
+
+        # İstemci sıkıştırılmış temsilin ETag'ini gönderdiyse uygulama asıl ETag ile karşılaştırır
+        validator_encoding = None
+        if if_none_match_index is not None:
+            headers = list(scope["headers"])
+            name, value = headers[if_none_match_index]
+            value, validator_encoding = _strip_etag_suffixes(value)
+            headers[if_none_match_index] = (name, value)
+            scope = {**scope, "headers": headers}
+
+        start_message = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor
+            message_type = message["type"]
+
+            if message_type == "http.response.start":
+                headers = _ResponseHeaders(message.get("headers", []))
+                if message["status"] == 304:
+                    if validator_encoding:
+                        headers.update_etag(validator_encoding)
+                    await send({**message, "headers": headers.raw})
+                    return
+                if self._eligible(message["status"], headers):
+                    headers.add_vary()
+                    if encoding is not None:
+                        # Sıkıştırma kararı ilk gövde parçası görülünce verilir
+                        start_message = {**message, "headers": headers.raw}
+                        return
+                    message = {**message, "headers": headers.raw}
+                await send(message)
+                return
+
+            if message_type != "http.response.body" or (start_message is None and compressor is None):
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                pending, start_message = start_message, None
+                if not more_body and len(body) < self.minimum_size:
+                    await send(pending)
+                    await send(message)
+                    return
+                headers = _ResponseHeaders(pending["headers"])
+                headers.set_encoding(encoding)
+                compressor = _compressor(encoding)
+                if not more_body:
+                    compressed = await self._compress(compressor, body, finish=True)
+                    compressor = None
+                    headers.set(b"content-length", str(len(compressed)).encode())
+                    await send({**pending, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                headers.remove(b"content-length")
+                await send({**pending, "headers": headers.raw})
+
+            compressed = await self._compress(compressor, body, finish=not more_body)
+            if not more_body:
+                compressor = None
+            if compressed or not more_body:
+                await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _eligible(status: int, headers: "_ResponseHeaders") -> bool:
+        if status < 200 or status in (204, 206):
+            return False
+        if headers.get(b"content-encoding") or headers.get(b"content-range"):
+            return False
+        content_type = (headers.get(b"content-type") or b"").decode("latin-1").lower()
+        if content_type.startswith(_EXCLUDED_TYPES):
+            return False
+        return content_type.startswith(_COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    async def _compress(compressor, data: bytes, finish: bool) -> bytes:
+        def run() -> bytes:
+            output = compressor.compress(data) if data else b""
+            return output + compressor.flush() if finish else output
+
+        if len(data) >= COMPRESSION_THREAD_THRESHOLD:
+            return await anyio.to_thread.run_sync(run)
+        return run()
+
+
+class _ResponseHeaders:
+    """ASGI yanıt başlık listesi üzerinde küçük yardımcılar"""
+
+    def __init__(self, raw):
+        self.raw = list(raw)
+
+    def get(self, name: bytes) -> Optional[bytes]:
+        for key, value in self.raw:
+            if key.lower() == name:
+                return value
+        return None
+
+    def remove(self, name: bytes) -> None:
+        self.raw = [(key, value) for key, value in self.raw if key.lower() != name]
+
+    def set(self, name: bytes, value: bytes) -> None:
+        self.remove(name)
+        self.raw.append((name, value))
+
+    def add_vary(self) -> None:
+        vary = self.get(b"vary")
+        if vary is None:
+            self.raw.append((b"vary", b"Accept-Encoding"))
+        elif b"accept-encoding" not in vary.lower():
+            self.set(b"vary", vary + b", Accept-Encoding")
+
+    def update_etag(self, encoding: str) -> None:
+        etag = self.get(b"etag")
+        if etag is not None:
+            self.set(b"etag", _encoded_etag(etag, encoding))
+
+    def set_encoding(self, encoding: str) -> None:
+        self.set(b"content-encoding", encoding.encode())
+        self.update_etag(encoding)
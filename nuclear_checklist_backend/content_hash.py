@@ -0,0 +1,32 @@
+import hashlib
+
+from sqlalchemy import inspect
+
+# Anahtar alanlarını birleştirirken kullanılan ayraç (metinlerde geçmeyen birim ayırıcı)
+_SEPARATOR = '\x1f'
+
+
+def content_hash(category: str, sub_category: str, item_text: str) -> str:
+    """(kategori, alt kategori, madde metni) üçlüsünün 32 karakterlik içerik özetini hesapla"""
+    key = _SEPARATOR.join((category or '', sub_category or '', item_text or ''))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# content_hash'in hesaplandığı alanlar
+HASHED_FIELDS = ('category', 'sub_category', 'item_text')
+
+
+def set_content_hash(mapper, connection, target):
+    """ORM ekleme öncesi content_hash sütununu doldur (mapper olay dinleyicisi)"""
+    target.content_hash = content_hash(target.category, target.sub_category, target.item_text)
+
+
+def update_content_hash(mapper, connection, target):
+    """ORM güncelleme öncesi, yalnızca içerik alanları değiştiyse content_hash'i yeniden hesapla
+    
+    Taşıma sırasında tekrar eden eski kayıtlar NULL özetle bırakılır; yalnızca durum
+    ya da standart değiştiğinde bu kayıtlara özet yazılmaz (benzersiz indeks çakışmaz).
+    """
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in HASHED_FIELDS):
+        set_content_hash(mapper, connection, target)
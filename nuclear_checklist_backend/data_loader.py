@@ -1,91 +1,40 @@
-import re
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from main import ChecklistItem, Base
-from datetime import datetime
-from pathlib import Path  # Bu satırı ekledim
+import logging
+import os
+import sys
+from pathlib import Path
 
-# Veritabanı bağlantısı
-SQLALCHEMY_DATABASE_URL = "sqlite:///./nuclear_checklist.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from bootstrap import prepare_database
+from models import ChecklistItem
+from database import SessionLocal
+from ingestion import parse_checklist_file, sync_checklists  # noqa: F401
 
-def parse_checklist_file(file_path):
-    """Çeklist dosyasını parse eder ve veri yapısını döndürür"""
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-    
-    items = []
-    current_category = ""
-    current_sub_category = ""
-    
-    lines = content.split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        
-        # Ana kategori (## ile başlayan)
-        if line.startswith('## ') and not line.startswith('### '):
-            current_category = line[3:].strip()
-            continue
-        
-        # Alt kategori (### ile başlayan)
-        if line.startswith('### '):
-            current_sub_category = line[4:].strip()
-            continue
-        
-        # Çeklist maddesi (- [ ] ile başlayan)
-        if line.startswith('- [ ] '):
-            item_text = line[6:].strip()
-            
-            # Standartları çıkar (parantez içindeki kısım)
-            standards_match = re.search(r'\(([^)]+)\)$', item_text)
-            standards = ""
-            if standards_match:
-                standards = standards_match.group(1)
-                item_text = item_text[:standards_match.start()].strip()
-            
-            # **Bold** kısmını temizle
-            item_text = re.sub(r'\*\*(.*?)\*\*:', r'\1:', item_text)
-            
-            items.append({
-                'category': current_category,
-                'sub_category': current_sub_category,
-                'item_text': item_text,
-                'standards': standards,
-                'status': False
-            })
-    
-    return items
+logger = logging.getLogger(__name__)
+
+# Varsayılan örnek çeklist dosyası (CHECKLIST_FILE ortam değişkeni veya komut satırı ile değiştirilebilir)
+DEFAULT_CHECKLIST_FILE = Path(__file__).resolve().parent / 'pasted_content.txt'
 
-def load_sample_data():
-    """Örnek veriyi veritabanına yükler"""
-    db = SessionLocal()
+def load_sample_data(file_path=None):
+    """Örnek veriyi veritabanıyla artımlı olarak eşitler (mevcut durum bilgileri korunur)"""
+    file_path = Path(file_path or os.getenv('CHECKLIST_FILE') or DEFAULT_CHECKLIST_FILE)
+    logger.info("Örnek veri dosyası: %s", file_path)
+    prepare_database()
     
     try:
-        # Mevcut verileri temizle
-        db.query(ChecklistItem).delete()
-        db.commit()
-        
-        # Örnek dosyayı parse et
-        # Buradaki yolu kendi bilgisayarınızdaki dosya yoluna göre düzenledim.
-        # En güvenilir yol olan 'Pathlib' ve 'raw string' yöntemini kullandım.
-        file_path = Path('C:\\Users\\Ebru\\Documents\\dataanalyst\\NuclearICChecklist\\nuclear_checklist_backend\\pasted_content.txt')
-        items = parse_checklist_file(file_path)
-        print(file_path)
-        # Verileri veritabanına ekle
-        for item_data in items:
-            if item_data['category'] and item_data['sub_category'] and item_data['item_text']:
-                db_item = ChecklistItem(**item_data)
-                db.add(db_item)
-        
-        db.commit()
-        print(f"{len(items)} çeklist maddesi başarıyla yüklendi.")
+        result = sync_checklists([str(file_path)])
+        print(
+            f"{result['parsed_count']} çeklist maddesi işlendi: "
+            f"{result['inserted_count']} eklendi, {result['updated_count']} güncellendi, "
+            f"{result['deleted_count']} silindi, {result['unchanged_count']} değişmedi."
+        )
         
         # İstatistikleri göster
-        total_items = db.query(ChecklistItem).count()
-        categories = db.query(ChecklistItem.category).distinct().count()
-        sub_categories = db.query(ChecklistItem.sub_category).distinct().count()
+        db = SessionLocal()
+        try:
+            total_items = db.query(ChecklistItem).count()
+            categories = db.query(ChecklistItem.category).distinct().count()
+            sub_categories = db.query(ChecklistItem.sub_category).distinct().count()
+        finally:
+            db.close()
         
         print(f"Toplam madde: {total_items}")
         print(f"Toplam kategori: {categories}")
@@ -93,9 +42,6 @@ def load_sample_data():
         
     except Exception as e:
         print(f"Hata oluştu: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
-    load_sample_data()
\ No newline at end of file
+    load_sample_data(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,12 +1,25 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
+from datetime import datetime
 import io
-from import_export import DataImportExport
+import codecs
+import os
+import shutil
+import tempfile
+from import_export import DataImportExport, ExportOptions, import_progress, EXPORT_FORMATS, missing_export_dependency
+from change_events import change_broker
+from jobs import job_manager, JobQueueFull
+from ingestion import sync_checklists
+from profiling import run_in_threadpool, profiled_iterator
+from data_version import conditional_get, CACHE_CONTROL
+from compression import open_upload, split_upload_name
 
 router = APIRouter(prefix="/data-management", tags=["data-management"])
 
+ExportFormat = Literal["json", "csv", "ndjson", "msgpack", "arrow", "parquet"]
+
 class ImportRequest(BaseModel):
     data: str
     replace_existing: bool = False
@@ -14,34 +27,114 @@ class ImportRequest(BaseModel):
 class ValidationRequest(BaseModel):
     data: str
 
-@router.get("/export/json")
-async def export_json():
-    """Tüm çeklist verilerini JSON formatında dışa aktar"""
+async def _stream_export(chunks, media_type: str, filename: str, bom: bytes = b'', etag: Optional[str] = None):
+    """Dışa aktarma parçalarını kodlayarak akış halinde gönder
+    
+    İlk parça yanıt başlamadan önce üretilir; böylece veritabanı hataları
+    yarım kalmış bir indirme yerine 500 olarak döner. Parçalar iş parçacığı
+    havuzunda üretildiği için olay döngüsü bloklanmaz.
+    """
+    first_chunk = await run_in_threadpool(next, chunks, b'')
+    
+    def encoded():
+        yield bom + _encode(first_chunk)
+        for chunk in chunks:
+            yield _encode(chunk)
+    
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    if etag:
+        headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return StreamingResponse(
+        profiled_iterator(encoded()),
+        media_type=media_type,
+        headers=headers
+    )
+
+def _encode(chunk) -> bytes:
+    """Metin biçimlerinin parçalarını UTF-8'e çevir; ikili biçimler olduğu gibi gönderilir"""
+    return chunk if isinstance(chunk, bytes) else chunk.encode('utf-8')
+
+def _export_options(
+    columns: Optional[str] = None,
+    category: Optional[List[str]] = Query(None),
+    status: Optional[bool] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None
+) -> ExportOptions:
+    """Dışa aktarma sütun seçimi (virgülle ayrılmış) ve SQL'e indirilen filtreler"""
     try:
-        exporter = DataImportExport()
-        json_data = exporter.export_to_json()
-        
-        # JSON dosyası olarak indir
-        return StreamingResponse(
-            io.BytesIO(json_data.encode('utf-8')),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=checklist_data.json"}
+        return ExportOptions(
+            columns=[name.strip() for name in columns.split(',') if name.strip()] if columns else None,
+            categories=category,
+            status=status,
+            updated_from=updated_from,
+            updated_to=updated_to
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _require_export_format(format: str) -> None:
+    """İsteğe bağlı paketi kurulu olmayan biçim istenirse 501 döndür"""
+    missing = missing_export_dependency(format)
+    if missing:
+        raise HTTPException(status_code=501, detail=f"{format} dışa aktarma için '{missing}' paketi kurulu değil")
 
-@router.get("/export/csv")
-async def export_csv():
-    """Tüm çeklist verilerini CSV formatında dışa aktar"""
+def _publish_import(result, replace_existing: bool):
+    """İçe aktarmayı bağlı istemcilere satır satır değil tek bir toplu olay olarak bildir"""
+    if result.get('imported_count') or replace_existing:
+        change_broker.publish(
+            "items_imported",
+            imported_count=result.get('imported_count', 0),
+            replace_existing=replace_existing
+        )
+
+def _upload_compression(filename: str, extension: str) -> Optional[str]:
+    """Yüklenen dosyanın uzantısını doğrula ve sıkıştırma türünü döndür (.json, .json.gz, .csv.zst ...)"""
+    name, compression = split_upload_name(filename)
+    if not name.endswith(extension):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sadece {extension[1:].upper()} dosyaları kabul edilir ({extension}, {extension}.gz, {extension}.zst)"
+        )
+    return compression
+
+async def _import_upload(file: UploadFile, replace_existing: bool, import_id: Optional[str], import_stream,
+                         compression: Optional[str] = None):
+    """Yüklenen dosyayı iş parçacığı havuzunda akış halinde (gerekirse açarak) içe aktar ve ilerlemeyi kaydet"""
+    progress = import_progress.start(import_id, file.filename, file.size)
+    await file.seek(0)
+    
+    importer = DataImportExport()
+    source = open_upload(file.file, compression)
+    result = await run_in_threadpool(import_stream, importer, source, replace_existing, progress)
+    
+    import_progress.finish(progress, result['success'])
+    result['import_id'] = progress.import_id
+    return result
+
+@router.get("/export/{format}")
+async def export_data(
+    format: ExportFormat,
+    etag: str = Depends(conditional_get),
+    options: ExportOptions = Depends(_export_options)
+):
+    """Çeklist verilerini seçilen biçimde (json, csv, ndjson, msgpack, arrow, parquet) dışa aktar
+    
+    ``columns`` ile sütun seçilebilir; ``category``, ``status``, ``updated_from`` ve
+    ``updated_to`` filtreleri sorguya eklenir, yalnızca eşleşen satırlar okunur.
+    """
+    _require_export_format(format)
     try:
         exporter = DataImportExport()
-        csv_data = exporter.export_to_csv()
+        spec = EXPORT_FORMATS[format]
         
-        # CSV dosyası olarak indir
-        return StreamingResponse(
-            io.BytesIO(csv_data.encode('utf-8-sig')),  # BOM ekle (Excel uyumluluğu için)
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=checklist_data.csv"}
+        # Parça parça indir; CSV'ye BOM ekle (Excel uyumluluğu için)
+        return await _stream_export(
+            exporter.iter_export(format, options=options),
+            spec["media_type"],
+            f"checklist_data{spec['extension']}",
+            bom=codecs.BOM_UTF8 if format == "csv" else b'',
+            etag=etag
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -51,9 +144,10 @@ async def import_json(request: ImportRequest):
     """JSON formatından veri içe aktar"""
     try:
         importer = DataImportExport()
-        result = importer.import_from_json(request.data, request.replace_existing)
+        result = await run_in_threadpool(importer.import_from_json, request.data, request.replace_existing)
         
         if result['success']:
+            _publish_import(result, request.replace_existing)
             return result
         else:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -65,9 +159,10 @@ async def import_csv(request: ImportRequest):
     """CSV formatından veri içe aktar"""
     try:
         importer = DataImportExport()
-        result = importer.import_from_csv(request.data, request.replace_existing)
+        result = await run_in_threadpool(importer.import_from_csv, request.data, request.replace_existing)
         
         if result['success']:
+            _publish_import(result, request.replace_existing)
             return result
         else:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -77,20 +172,18 @@ async def import_csv(request: ImportRequest):
 @router.post("/import/file/json")
 async def import_json_file(
     file: UploadFile = File(...),
-    replace_existing: bool = Form(False)
+    replace_existing: bool = Form(False),
+    import_id: Optional[str] = Form(None)
 ):
-    """JSON dosyasından veri içe aktar"""
+    """JSON dosyasından veri içe aktar (dosya belleğe alınmadan parça parça çözülür; .gz/.zst kabul edilir)"""
     try:
-        if not file.filename.endswith('.json'):
-            raise HTTPException(status_code=400, detail="Sadece JSON dosyaları kabul edilir")
-        
-        content = await file.read()
-        json_data = content.decode('utf-8')
+        compression = _upload_compression(file.filename, '.json')
         
-        importer = DataImportExport()
-        result = importer.import_from_json(json_data, replace_existing)
+        result = await _import_upload(file, replace_existing, import_id, DataImportExport.import_from_json_stream,
+                                      compression)
         
         if result['success']:
+            _publish_import(result, replace_existing)
             return result
         else:
             raise HTTPException(status_code=400, detail=result['error'])
@@ -100,32 +193,137 @@ async def import_json_file(
 @router.post("/import/file/csv")
 async def import_csv_file(
     file: UploadFile = File(...),
-    replace_existing: bool = Form(False)
+    replace_existing: bool = Form(False),
+    import_id: Optional[str] = Form(None)
 ):
-    """CSV dosyasından veri içe aktar"""
+    """CSV dosyasından veri içe aktar (dosya belleğe alınmadan parça parça çözülür; .gz/.zst kabul edilir)"""
     try:
-        if not file.filename.endswith('.csv'):
-            raise HTTPException(status_code=400, detail="Sadece CSV dosyaları kabul edilir")
-        
-        content = await file.read()
-        csv_data = content.decode('utf-8')
+        compression = _upload_compression(file.filename, '.csv')
         
-        importer = DataImportExport()
-        result = importer.import_from_csv(csv_data, replace_existing)
+        result = await _import_upload(file, replace_existing, import_id, DataImportExport.import_from_csv_stream,
+                                      compression)
         
         if result['success']:
+            _publish_import(result, replace_existing)
             return result
         else:
             raise HTTPException(status_code=400, detail=result['error'])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/import/progress")
+async def list_import_progress():
+    """Devam eden ve son tamamlanan içe aktarmaların ilerlemesini döndür"""
+    return import_progress.all()
+
+@router.get("/import/progress/{import_id}")
+async def get_import_progress(import_id: str):
+    """Tek bir içe aktarmanın ilerlemesini döndür"""
+    progress = import_progress.get(import_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="İçe aktarma bulunamadı")
+    return progress
+
+@router.post("/jobs/import/{format}", status_code=202)
+async def create_import_job(
+    format: Literal["json", "csv"],
+    file: UploadFile = File(...),
+    replace_existing: bool = Form(False)
+):
+    """Dosyayı arka planda içe aktarmak için iş oluştur ve iş kimliğini hemen döndür"""
+    _upload_compression(file.filename, f'.{format}')
+    
+    await file.seek(0)
+    try:
+        return await run_in_threadpool(
+            job_manager.submit_import, format, file.file, file.filename, file.size, replace_existing,
+            lambda result: _publish_import(result, replace_existing)
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+@router.post("/jobs/export/{format}", status_code=202)
+async def create_export_job(format: ExportFormat, options: ExportOptions = Depends(_export_options)):
+    """Dışa aktarmayı (sütun seçimi ve filtrelerle) arka planda dosyaya yazmak için iş oluştur"""
+    _require_export_format(format)
+    try:
+        return await run_in_threadpool(job_manager.submit_export, format, options)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+@router.get("/jobs")
+async def list_jobs(limit: int = 50):
+    """Son içe/dışa aktarma işlerini döndür"""
+    return {
+        "jobs": await run_in_threadpool(job_manager.recent, limit),
+        **job_manager.metrics()
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """İşin durumunu, sayaçlarını ve hata listesini döndür"""
+    job = await run_in_threadpool(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
+
+@router.get("/jobs/{job_id}/download")
+async def download_job_artifact(job_id: str):
+    """Tamamlanmış dışa aktarma işinin çıktısını indir"""
+    artifact = await run_in_threadpool(job_manager.artifact, job_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="İndirilecek dosya bulunamadı")
+    return FileResponse(artifact["path"], media_type=artifact["media_type"], filename=artifact["filename"])
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Bitmiş işi ve çıktı dosyasını sil"""
+    deleted = await run_in_threadpool(job_manager.delete, job_id)
+    if deleted is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    if not deleted:
+        raise HTTPException(status_code=409, detail="Devam eden iş silinemez")
+    return {"message": "İş silindi"}
+
+def _sync_uploaded_checklists(files: List[UploadFile], prune: str, dry_run: bool):
+    """Yüklenen Markdown dosyalarını geçici dizine yazıp veritabanıyla eşitle"""
+    with tempfile.TemporaryDirectory(prefix="checklist-ingest-") as directory:
+        paths = []
+        for index, file in enumerate(files):
+            path = os.path.join(directory, f"{index}.md")
+            file.file.seek(0)
+            with open(path, "wb") as target:
+                shutil.copyfileobj(file.file, target, 1024 * 1024)
+            paths.append(path)
+        return sync_checklists(paths, prune, dry_run)
+
+@router.post("/ingest/markdown")
+async def ingest_markdown(
+    files: List[UploadFile] = File(...),
+    prune: Literal["categories", "all", "none"] = Form("categories"),
+    dry_run: bool = Form(False)
+):
+    """Markdown çeklistlerini yalnızca farkları yazarak eşitle (item_id ve durumlar korunur)"""
+    try:
+        result = await run_in_threadpool(_sync_uploaded_checklists, files, prune, dry_run)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Çeklist eşitleme hatası: {str(e)}")
+    
+    if not dry_run and (result['inserted_count'] or result['updated_count'] or result['deleted_count']):
+        change_broker.publish(
+            "items_synced",
+            inserted_count=result['inserted_count'],
+            updated_count=result['updated_count'],
+            deleted_count=result['deleted_count']
+        )
+    return result
+
 @router.post("/validate/json")
 async def validate_json(request: ValidationRequest):
     """JSON veri yapısını doğrula"""
     try:
         validator = DataImportExport()
-        result = validator.validate_json_structure(request.data)
+        result = await run_in_threadpool(validator.validate_json_structure, request.data)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,135 @@
+import contextlib
+import hashlib
+import threading
+import uuid
+from typing import Callable, Iterator, List, Optional
+from urllib.parse import urlencode
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, get_async_db
+from models import DataVersionState
+
+# Koşullu isteklerde istemcinin önbellekteki yanıtı her seferinde doğrulaması istenir
+CACHE_CONTROL = "no-cache"
+
+_VERSION_ROW = 1
+
+
+class DataVersion:
+    """Veritabanında tutulan ve çeklist verisindeki her yazmada aynı işlemde artan sürüm
+
+    Sürüm tek satırlık ``data_version`` tablosundadır; bu yüzden başka süreçlerin
+    (ingestion CLI, ikinci uvicorn çalışanı) yazmaları da ETag'leri değiştirir.
+    Okuyucular sürümü sorgudan önce alır; bir ETag hiçbir zaman kendisinden eski
+    veriyle eşleşmez. Süreç içi önbellekler (istatistik, arama) son bilinen sürümle
+    karşılaştırılır: başka bir sürecin yazması görülünce ``on_external_change`` ile
+    kaydedilen geri çağrılar önbellekleri geçersiz kılar.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._known: Optional[int] = None
+        self.token = ""
+        self._listeners: List[Callable[[], None]] = []
+
+    def setup(self) -> None:
+        """Sürüm satırını (yoksa) oluştur ve güncel sürümü yükle"""
+        with SessionLocal() as db:
+            state = db.get(DataVersionState, _VERSION_ROW)
+            if state is None:
+                state = DataVersionState(id=_VERSION_ROW, version=0, token=uuid.uuid4().hex[:12])
+                db.add(state)
+                db.commit()
+            self.token = state.token
+            with self._lock:
+                self._known = state.version
+
+    def on_external_change(self, callback: Callable[[], None]) -> None:
+        """Başka bir süreçte (ya da sırası dışında) yazma görüldüğünde çağrılacak geçersiz kılma"""
+        self._listeners.append(callback)
+
+    def _notify(self) -> None:
+        for callback in self._listeners:
+            callback()
+
+    @staticmethod
+    def bump(session: Session) -> int:
+        """Yazma ile aynı işlemde sürümü artır ve yeni sürümü döndür (commit öncesi çağrılır)
+
+        Asenkron oturumlarda ``await db.run_sync(data_version.bump)`` ile kullanılır.
+        """
+        session.execute(
+            update(DataVersionState).where(DataVersionState.id == _VERSION_ROW)
+            .values(version=DataVersionState.version + 1)
+        )
+        return session.scalar(select(DataVersionState.version).where(DataVersionState.id == _VERSION_ROW))
+
+    @contextlib.contextmanager
+    def publish(self, version: int) -> Iterator[bool]:
+        """Commit edilen yazmanın süreç içi önbellek güncellemelerini sarmalar
+
+        Bu süreç sürümü sırasıyla izliyorsa True verir ve artımlı güncellemeler
+        uygulanır. Araya başka bir yazma girdiyse ya da bir okuyucu yeni sürümü
+        önceden gördüyse False verir; artımlı güncellemeler atlanmalıdır, önbellekler
+        geçersiz kılınır.
+        """
+        with self._lock:
+            in_order = self._known is not None and self._known == version - 1
+            try:
+                yield in_order
+            finally:
+                if not in_order:
+                    self._notify()
+                self._known = max(self._known or 0, version)
+
+    def observe(self, version: int) -> None:
+        """Okunan sürüm bu sürecin bildiğinden yeniyse süreç içi önbellekleri geçersiz kıl"""
+        with self._lock:
+            if self._known is None or version > self._known:
+                self._notify()
+                self._known = version
+
+    def etag(self, version: int, path: str, query: str = "") -> str:
+        """Sürüm, yol ve sorgu parametrelerinden güçlü ETag üret"""
+        digest = hashlib.blake2b(f"{path}?{query}".encode("utf-8"), digest_size=8).hexdigest()
+        return f'"{self.token}-{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match başlığı verilen ETag ile eşleşiyor mu (zayıf karşılaştırma, RFC 9110)"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+# Uygulama genelinde paylaşılan veri sürümü
+data_version = DataVersion()
+
+
+async def current_data_version(db: AsyncSession = Depends(get_async_db)) -> int:
+    """Kalıcı veri sürümünü oku ve süreç içi önbellekleri onunla eşitle (FastAPI bağımlılığı)"""
+    version = await db.scalar(select(DataVersionState.version).where(DataVersionState.id == _VERSION_ROW))
+    data_version.observe(version)
+    return version
+
+
+async def conditional_get(request: Request, response: Response,
+                          version: int = Depends(current_data_version)) -> str:
+    """Okuma uç noktaları için ETag bağımlılığı; veri değişmediyse sorguyu çalıştırmadan 304 döndürür
+
+    Uç nokta kendi ``Response`` nesnesini döndürüyorsa dönen ETag başlığa eklenmelidir.
+    """
+    query = urlencode(sorted(request.query_params.multi_items()))
+    etag = data_version.etag(version, request.url.path, query)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return etag
@@ -0,0 +1,125 @@
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+# Veritabanı yapılandırması (SQLite ile başlanır, DATABASE_URL ile MS SQL'e geçilebilir)
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./nuclear_checklist.db")
+
+# Senkron sürücülerin asenkron karşılıkları (ASYNC_DATABASE_URL ile doğrudan da verilebilir)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mssql": "mssql+aioodbc",
+}
+
+# Bağlantı havuzu ayarları
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# SQLite PRAGMA ayarları (her yeni bağlantıda uygulanır)
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", str(-64 * 1024)),  # negatif değer KiB cinsindendir
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT", "5000"),
+}
+
+
+def to_async_url(url: str) -> str:
+    """Senkron veritabanı adresini asenkron sürücülü adrese çevir"""
+    parsed = make_url(url)
+    async_driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if async_driver is None:
+        raise ValueError(f"Asenkron sürücü desteklenmiyor: {parsed.drivername}")
+    return parsed.set(drivername=async_driver).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str) -> dict:
+    """Veritabanı türüne göre create_engine seçeneklerini oluştur"""
+    parsed = make_url(url)
+    options = {"pool_pre_ping": POOL_PRE_PING}
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.drivername == "sqlite":
+            options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            # Bellek içi SQLite tek bağlantılı havuz kullanır; boyut ayarları geçerli değildir
+            return options
+    options.update(
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            if value:
+                cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def _configure_engine(sync_engine):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+    return sync_engine
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Süreç başına tek senkron ve tek asenkron motor (tüm modüller bunları paylaşır)
+engine = _configure_engine(create_engine(DATABASE_URL, **_engine_options(DATABASE_URL)))
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL))
+_configure_engine(async_engine.sync_engine)
+# Commit sonrası nesneler yeniden yüklenmez; yanıt serileştirilirken ek sorgu (ve bloklama) olmaz
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
+
+
+def get_db():
+    """İstek başına senkron veritabanı oturumu"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """İstek başına asenkron veritabanı oturumu (FastAPI bağımlılığı)"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _pool_status(pool) -> dict:
+    status = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    if "size" in status and "checkedout" in status:
+        capacity = status["size"] + max(getattr(pool, "_max_overflow", 0), 0)
+        status["utilization"] = round(status["checkedout"] / capacity * 100, 2) if capacity else 0
+    return status
+
+
+def pool_metrics() -> dict:
+    """Senkron ve asenkron bağlantı havuzlarının kullanım metriklerini döndür"""
+    return {
+        "sync": _pool_status(engine.pool),
+        "async": _pool_status(async_engine.sync_engine.pool),
+    }
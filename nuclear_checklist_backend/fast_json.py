@@ -0,0 +1,63 @@
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Iterable, Sequence
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # orjson isteğe bağlıdır; kurulu değilse standart json ile aynı çıktı üretilir
+    orjson = None
+
+# ORM'siz hızlı serileştirmenin açık olduğu uç noktalar (virgülle ayrılmış; boş bırakılırsa kapalı)
+#   checklist_items: GET /checklist-items/
+#   export: JSON ve NDJSON dışa aktarmaları (eşzamanlı ve iş kuyruğu)
+FAST_JSON_ENDPOINTS = {
+    name.strip() for name in os.getenv("FAST_JSON_ENDPOINTS", "checklist_items,export").split(",") if name.strip()
+}
+
+
+def enabled(endpoint: str) -> bool:
+    """Uç nokta için hızlı serileştirme yolu açık mı"""
+    return endpoint in FAST_JSON_ENDPOINTS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+# FastAPI JSONResponse ile aynı biçim: ASCII kaçışı yok, boşluksuz ayraçlar
+_compact = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=_default)
+_indented = json.JSONEncoder(ensure_ascii=False, indent=2, default=_default)
+
+
+def dumps(value: Any) -> bytes:
+    """Değeri JSONResponse ile bayt bayt aynı, boşluksuz JSON'a çevir
+
+    Tarih/saat değerleri ``isoformat()`` ile yazılır (Pydantic'in JSON çıktısıyla aynı).
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return _compact.encode(value).encode("utf-8")
+
+
+def dumps_indented(value: Any) -> str:
+    """Değeri ``json.dumps(..., ensure_ascii=False, indent=2)`` ile aynı metne çevir"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return _indented.encode(value)
+
+
+def rows_response(rows: Iterable[Sequence[Any]], fields: Sequence[str], response: Response) -> Response:
+    """Sütun demetlerini yanıt modeli doğrulamasından geçirmeden JSON dizisi olarak döndür
+
+    ``fields`` yanıt modelindeki alan sırasıyla verilmelidir; çıktı, aynı satırların
+    ``response_model`` üzerinden serileştirilmesiyle bayt bayt aynıdır. Bağımlılıkların
+    ``response`` üzerine eklediği başlıklar (ETag, X-Next-Cursor vb.) korunur.
+    """
+    fast = Response(content=dumps([dict(zip(fields, row)) for row in rows]), media_type="application/json")
+    fast.raw_headers.extend(response.raw_headers)
+    return fast
@@ -0,0 +1,455 @@
+import logging
+import os
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import DateTime, String, event, func, insert, inspect, literal, select
+from sqlalchemy.orm import Session, object_session
+
+from database import SessionLocal
+from models import ChecklistItem, ChecklistItemHistory, ChecklistHistoryCheckpoint
+from profiling import run_in_threadpool
+from statistics_cache import StatisticsCache, item_key
+
+logger = logging.getLogger("nuclear_checklist_db")
+
+# Son kontrol noktasından bu yana bu kadar geçmiş kaydı birikince arka planda yeni kontrol noktası alınır
+HISTORY_CHECKPOINT_EVERY = int(os.getenv("HISTORY_CHECKPOINT_EVERY", "10000"))
+# Kontrol noktaları yalnızca bu kadar saniyeden eski kayıtları kapsar; zaman damgası alınıp henüz
+# commit edilmemiş (eşzamanlı işlemlerde sırası dışında görünecek) kayıtlar dışarıda kalır
+HISTORY_CHECKPOINT_HORIZON = float(os.getenv("HISTORY_CHECKPOINT_HORIZON", "300"))
+# Kontrol noktasındaki kayıtlar IN listesi başına bu kadar çekilir (SQLite parametre sınırının altında)
+HISTORY_FETCH_BATCH = 900
+
+# Geçmişe yazılan madde durumu alanları
+STATE_FIELDS = ("category", "sub_category", "item_text", "standards", "status")
+_STATE_COLUMNS = tuple(getattr(ChecklistItem, name) for name in STATE_FIELDS)
+_HISTORY_STATE_COLUMNS = tuple(getattr(ChecklistItemHistory, name) for name in STATE_FIELDS)
+
+
+# --- Kayıt ---
+
+def record_items(where, change_type: str, changed_at: datetime):
+    """Koşula uyan maddelerin güncel durumunu geçmişe yazan küme tabanlı INSERT ... SELECT
+
+    Toplu güncelleme ve eklemelerde yazma ile aynı işlem içinde, yazmadan sonra çalıştırılır.
+    """
+    items = select(
+        ChecklistItem.item_id, literal(changed_at, DateTime), literal(change_type, String), *_STATE_COLUMNS
+    )
+    if where is not None:
+        items = items.where(where)
+    return insert(ChecklistItemHistory).from_select(["item_id", "changed_at", "change_type", *STATE_FIELDS], items)
+
+
+class HistoryRecorder:
+    """Bir işlemdeki toplu geçmiş kayıtlarını biriktirip commit öncesinde tek zaman damgasıyla yazar
+
+    Uzun süren toplu yazmalarda kayıtlar işlemin başladığı anla damgalanırsa, commit
+    edilmeden önceki bir an için sorulan durum henüz görünmeyen satırları içerir.
+    Silinecek maddelerin kimlikleri silmeden önce verilir; eklenen/güncellenen
+    maddelerin durumu ``write`` anında, yazmalardan sonraki haliyle okunur.
+    """
+
+    def __init__(self):
+        self._deleted: List[int] = []
+        self._recorded: List[Tuple[Any, str]] = []
+
+    def deleted(self, item_ids: Iterable[int]) -> None:
+        self._deleted.extend(item_ids)
+
+    def items(self, where, change_type: str) -> None:
+        self._recorded.append((where, change_type))
+
+    def write(self, db: Session) -> int:
+        """Biriken kayıtları şimdiki zamanla yaz (commit'ten hemen önce); yazılan kayıt sayısını döndür"""
+        changed_at = datetime.utcnow()
+        count = 0
+        for start in range(0, len(self._deleted), HISTORY_FETCH_BATCH):
+            item_ids = self._deleted[start:start + HISTORY_FETCH_BATCH]
+            db.execute(insert(ChecklistItemHistory), [
+                {"item_id": item_id, "changed_at": changed_at, "change_type": "delete"} for item_id in item_ids
+            ])
+            count += len(item_ids)
+        for where, change_type in self._recorded:
+            count += db.execute(record_items(where, change_type, changed_at)).rowcount
+        self._deleted.clear()
+        self._recorded.clear()
+        return count
+
+
+# ORM dinleyicilerinin commit edilmeyi bekleyen geçmiş kaydı sayısı (oturum başına)
+_PENDING_KEY = "history_pending"
+
+
+def _orm_listener(change_type: str):
+    """Tek madde yazmalarını (ORM) flush sırasında aynı bağlantı üzerinden geçmişe yazan dinleyici"""
+    def listener(mapper, connection, target):
+        if change_type == "update":
+            state = inspect(target)
+            # Durumu değiştirmeyen güncellemeler (yalnızca updated_at) kaydedilmez
+            if not any(state.attrs[name].history.has_changes() for name in STATE_FIELDS):
+                return
+        values = {"item_id": target.item_id, "change_type": change_type}
+        if change_type == "delete":
+            values["changed_at"] = datetime.utcnow()
+        else:
+            values["changed_at"] = target.updated_at or datetime.utcnow()
+            values.update((name, getattr(target, name)) for name in STATE_FIELDS)
+        connection.execute(insert(ChecklistItemHistory), values)
+        # Kontrol noktası sayacına commit sonrasında eklenir; geri alınan flush'lar sayılmaz
+        session = object_session(target)
+        if session is not None:
+            session.info[_PENDING_KEY] = session.info.get(_PENDING_KEY, 0) + 1
+    return listener
+
+
+def _report_committed(session: Session) -> None:
+    count = session.info.pop(_PENDING_KEY, 0)
+    if count:
+        status_history.changes_recorded(count)
+
+
+def _drop_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+event.listen(ChecklistItem, "after_insert", _orm_listener("create"))
+event.listen(ChecklistItem, "after_update", _orm_listener("update"))
+event.listen(ChecklistItem, "after_delete", _orm_listener("delete"))
+event.listen(Session, "after_commit", _report_committed)
+event.listen(Session, "after_rollback", _drop_rolled_back)
+
+
+# --- Kontrol noktaları ---
+
+def _encode_states(states: Dict[int, int]) -> bytes:
+    """item_id -> history_id eşlemesini sıralı int64 çiftleri olarak sıkıştır"""
+    values = array("q")
+    for item_id in sorted(states):
+        values.append(item_id)
+        values.append(states[item_id])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return zlib.compress(values.tobytes())
+
+
+def _decode_states(payload: bytes) -> Dict[int, int]:
+    values = array("q")
+    values.frombytes(zlib.decompress(payload))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return dict(zip(values[0::2], values[1::2]))
+
+
+def _apply_log(db: Session, states: Dict[int, int], after: Optional[datetime], until: datetime) -> int:
+    """``after`` < changed_at <= ``until`` aralığındaki geçmiş kayıtlarını eşlemeye uygula; değişen madde sayısını döndür
+
+    Aralık kimliğe göre değil zaman damgasına göre seçilir; eşzamanlı işlemlerde küçük
+    kimlikli bir kayıt daha sonra commit edilebilir. Her madde için yalnızca aralıktaki en
+    son kayıt okunur (aynı maddenin yazmaları satır kilidiyle sıralanır); silinen maddeler
+    eşlemeden çıkar.
+    """
+    latest = select(
+        ChecklistItemHistory.item_id, func.max(ChecklistItemHistory.history_id).label("history_id")
+    ).where(ChecklistItemHistory.changed_at <= until)
+    if after is not None:
+        latest = latest.where(ChecklistItemHistory.changed_at > after)
+    latest = latest.group_by(ChecklistItemHistory.item_id).subquery()
+
+    rows = db.execute(
+        select(latest.c.item_id, latest.c.history_id, ChecklistItemHistory.change_type)
+        .join(ChecklistItemHistory, ChecklistItemHistory.history_id == latest.c.history_id)
+    )
+    applied = 0
+    for item_id, history_id, change_type in rows:
+        applied += 1
+        if change_type == "delete":
+            states.pop(item_id, None)
+        else:
+            states[item_id] = history_id
+    return applied
+
+
+def checkpoint_to_dict(checkpoint: ChecklistHistoryCheckpoint) -> Dict[str, Any]:
+    return {
+        "checkpoint_id": checkpoint.checkpoint_id,
+        "created_at": checkpoint.created_at,
+        "last_history_id": checkpoint.last_history_id,
+        "item_count": checkpoint.item_count,
+        "size_bytes": len(checkpoint.payload),
+    }
+
+
+def as_utc(value: datetime) -> datetime:
+    """Saat dilimli zaman damgasını veritabanındaki saf UTC biçimine çevir"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class StatusHistory:
+    """Salt eklemeli madde geçmişi üzerinde kontrol noktaları ve zaman noktası sorguları
+
+    Her kontrol noktası, ``created_at`` anına kadarki her madde için geçerli geçmiş
+    kaydının kimliğini tutar (madde verisinin kopyasını değil). Bir andaki durum, o
+    andan önceki son kontrol noktası ile sonrasında damgalanmış geçmiş kayıtlarından
+    kurulur. Kontrol noktası anı, alındığı zamandan ``horizon`` saniye geridedir;
+    damgası bu pencerede kalan ama henüz commit edilmemiş kayıtlar atlanmaz, sonraki
+    kontrol noktasına ya da günlük uygulamasına kalır. Toplu yazmalar kayıtlarını
+    ``HistoryRecorder`` ile commit anında damgalar; tekil yazmalar flush anında.
+    """
+
+    def __init__(self, checkpoint_every: int = HISTORY_CHECKPOINT_EVERY,
+                 horizon: float = HISTORY_CHECKPOINT_HORIZON):
+        self._lock = threading.Lock()
+        self.checkpoint_every = checkpoint_every
+        self.horizon = horizon
+        self._pending = 0
+        self._checkpointing = False
+        self._not_before = 0.0
+        self.checkpoints_created = 0
+
+    def setup(self) -> None:
+        """Geçmiş boşsa mevcut maddeleri başlangıç kaydı olarak yaz ve ilk kontrol noktasını al"""
+        with SessionLocal() as db:
+            if db.scalar(select(ChecklistItemHistory.history_id).limit(1)) is None:
+                changed_at = func.coalesce(ChecklistItem.updated_at, ChecklistItem.created_at, datetime.utcnow())
+                result = db.execute(insert(ChecklistItemHistory).from_select(
+                    ["item_id", "changed_at", "change_type", *STATE_FIELDS],
+                    select(ChecklistItem.item_id, changed_at, literal("baseline", String), *_STATE_COLUMNS)
+                ))
+                db.commit()
+                if result.rowcount:
+                    logger.info("Madde geçmişi başlatıldı: %d başlangıç kaydı", result.rowcount)
+
+            covered_until = db.scalar(select(func.max(ChecklistHistoryCheckpoint.created_at)))
+            pending = self._count_after(db, covered_until)
+        with self._lock:
+            self._pending = pending
+        if pending and (covered_until is None or pending >= self.checkpoint_every):
+            self.create_checkpoint()
+
+    @staticmethod
+    def _count_after(db: Session, covered_until: Optional[datetime]) -> int:
+        """Verilen andan sonra damgalanmış (kontrol noktasına girmemiş) kayıt sayısı"""
+        query = select(func.count()).select_from(ChecklistItemHistory)
+        if covered_until is not None:
+            query = query.where(ChecklistItemHistory.changed_at > covered_until)
+        return db.scalar(query)
+
+    def changes_recorded(self, count: int) -> None:
+        """Yazılan geçmiş kaydı sayısını işle; eşik aşılırsa arka planda kontrol noktası al"""
+        with self._lock:
+            self._pending += count
+            start = (self._pending >= self.checkpoint_every and not self._checkpointing
+                     and time.monotonic() >= self._not_before)
+            if start:
+                self._checkpointing = True
+        if start:
+            threading.Thread(target=self._background_checkpoint, name="history-checkpoint", daemon=True).start()
+
+    def _background_checkpoint(self) -> None:
+        try:
+            self.create_checkpoint()
+        except Exception:
+            logger.exception("Geçmiş kontrol noktası oluşturulamadı")
+        finally:
+            with self._lock:
+                self._checkpointing = False
+
+    def create_checkpoint(self) -> Dict[str, Any]:
+        """Önceki kontrol noktasına yalnızca ufuk öncesine kadarki yeni kayıtları uygulayarak kontrol noktası al"""
+        with SessionLocal() as db:
+            previous = db.scalars(
+                select(ChecklistHistoryCheckpoint).order_by(ChecklistHistoryCheckpoint.created_at.desc(),
+                                                            ChecklistHistoryCheckpoint.checkpoint_id.desc()).limit(1)
+            ).first()
+            after = previous.created_at if previous else None
+            until = datetime.utcnow() - timedelta(seconds=self.horizon)
+            window = select(func.max(ChecklistItemHistory.history_id)).where(ChecklistItemHistory.changed_at <= until)
+            if after is not None:
+                window = window.where(ChecklistItemHistory.changed_at > after)
+            window_last_id = db.scalar(window)
+            if previous is not None and (window_last_id is None or until <= after):
+                result = checkpoint_to_dict(previous)
+                created = False
+            else:
+                states = _decode_states(previous.payload) if previous else {}
+                _apply_log(db, states, after, until)
+                checkpoint = ChecklistHistoryCheckpoint(
+                    created_at=until,
+                    last_history_id=max(previous.last_history_id if previous else 0, window_last_id or 0),
+                    item_count=len(states),
+                    payload=_encode_states(states)
+                )
+                db.add(checkpoint)
+                db.commit()
+                db.refresh(checkpoint)
+                result = checkpoint_to_dict(checkpoint)
+                created = True
+            pending = self._count_after(db, result["created_at"])
+
+        with self._lock:
+            self._pending = pending
+            # Kalan kayıtlar ufkun içindeyse ufuk dolmadan yeniden denenmez
+            if pending >= self.checkpoint_every:
+                self._not_before = time.monotonic() + self.horizon
+            if created:
+                self.checkpoints_created += 1
+        if not created:
+            return result
+        logger.info("Geçmiş kontrol noktası alındı: %d madde, %d bayt", result["item_count"], result["size_bytes"])
+        return result
+
+    # --- Zaman noktası sorguları ---
+
+    def states_at(self, db: Session, at: datetime) -> Tuple[Dict[int, int], Optional[ChecklistHistoryCheckpoint], int]:
+        """Verilen andaki item_id -> history_id eşlemesini, kullanılan kontrol noktasını ve uygulanan kayıt sayısını döndür"""
+        checkpoint = db.scalars(
+            select(ChecklistHistoryCheckpoint)
+            .where(ChecklistHistoryCheckpoint.created_at <= at)
+            .order_by(ChecklistHistoryCheckpoint.created_at.desc(), ChecklistHistoryCheckpoint.checkpoint_id.desc())
+            .limit(1)
+        ).first()
+        states = _decode_states(checkpoint.payload) if checkpoint else {}
+        applied = _apply_log(db, states, checkpoint.created_at if checkpoint else None, at)
+        return states, checkpoint, applied
+
+    @staticmethod
+    def _state_rows(db: Session, history_ids: Sequence[int], columns, where=None) -> Iterator[Any]:
+        for start in range(0, len(history_ids), HISTORY_FETCH_BATCH):
+            query = select(*columns).where(
+                ChecklistItemHistory.history_id.in_(history_ids[start:start + HISTORY_FETCH_BATCH])
+            )
+            if where is not None:
+                query = query.where(where)
+            yield from db.execute(query)
+
+    def items_at(self, db: Session, at: datetime, category: Optional[str] = None) -> Dict[str, Any]:
+        """Verilen andaki çeklist maddelerini (isteğe bağlı kategori filtresi ile) döndür"""
+        states, checkpoint, applied = self.states_at(db, at)
+        columns = (ChecklistItemHistory.item_id, *_HISTORY_STATE_COLUMNS, ChecklistItemHistory.changed_at)
+        where = ChecklistItemHistory.category == category if category else None
+        items = [row._asdict() for row in self._state_rows(db, sorted(states.values()), columns, where)]
+        items.sort(key=lambda item: item["item_id"])
+        return {
+            "as_of": at,
+            "checkpoint_id": checkpoint.checkpoint_id if checkpoint else None,
+            "log_entries_applied": applied,
+            "count": len(items),
+            "items": items,
+        }
+
+    def statistics_at(self, db: Session, at: datetime, breakdown: bool = False) -> Dict[str, Any]:
+        """Verilen andaki istatistikleri /statistics/ ile aynı biçimde döndür"""
+        states, _, _ = self.states_at(db, at)
+        groups: Counter = Counter()
+        completed_groups: Counter = Counter()
+        standards: Counter = Counter()
+        completed_standards: Counter = Counter()
+        columns = (ChecklistItemHistory.category, ChecklistItemHistory.sub_category,
+                   ChecklistItemHistory.standards, ChecklistItemHistory.status)
+        for row in self._state_rows(db, sorted(states.values()), columns):
+            category, sub_category, standards_text, status = item_key(*row)
+            groups[(category, sub_category)] += 1
+            completed_groups[(category, sub_category)] += status
+            if standards_text:
+                standards[standards_text] += 1
+                completed_standards[standards_text] += status
+
+        def loader():
+            return (
+                [(*group, total, completed_groups[group]) for group, total in groups.items()],
+                [(text, total, completed_standards[text]) for text, total in standards.items()],
+            )
+
+        # Paylaşılan önbelleğe dokunmadan aynı özet/kırılım hesaplaması kullanılır
+        snapshot = StatisticsCache()
+        return snapshot.breakdown(loader) if breakdown else snapshot.summary(loader)
+
+    @staticmethod
+    def item_history(db: Session, item_id: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Maddenin geçmiş kayıtlarını eskiden yeniye döndür"""
+        rows = db.execute(
+            select(ChecklistItemHistory.history_id, ChecklistItemHistory.changed_at, ChecklistItemHistory.change_type,
+                   *_HISTORY_STATE_COLUMNS)
+            .where(ChecklistItemHistory.item_id == item_id)
+            .order_by(ChecklistItemHistory.changed_at, ChecklistItemHistory.history_id)
+            .limit(limit)
+        )
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    def checkpoints(db: Session, limit: int = 50) -> List[Dict[str, Any]]:
+        """Son kontrol noktalarını yeniden eskiye döndür"""
+        rows = db.scalars(
+            select(ChecklistHistoryCheckpoint).order_by(ChecklistHistoryCheckpoint.checkpoint_id.desc()).limit(limit)
+        )
+        return [checkpoint_to_dict(checkpoint) for checkpoint in rows]
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "pending_entries": self._pending,
+                "checkpoint_every": self.checkpoint_every,
+                "checkpoint_horizon_seconds": self.horizon,
+                "checkpoints_created": self.checkpoints_created,
+            }
+
+
+# Uygulama genelinde paylaşılan geçmiş yöneticisi
+status_history = StatusHistory()
+
+
+# --- Rotalar ---
+
+router = APIRouter(prefix="/history", tags=["history"])
+
+
+def _in_session(work, *args):
+    with SessionLocal() as db:
+        return work(db, *args)
+
+
+@router.get("/items")
+async def get_items_at(at: datetime, category: Optional[str] = None):
+    """Çeklist maddelerini verilen andaki (UTC) durumlarıyla getir"""
+    return await run_in_threadpool(_in_session, status_history.items_at, as_utc(at), category)
+
+
+@router.get("/statistics")
+async def get_statistics_at(at: datetime, breakdown: bool = False):
+    """Verilen andaki (UTC) istatistikleri getir (isteğe bağlı kırılım ile)"""
+    return await run_in_threadpool(_in_session, status_history.statistics_at, as_utc(at), breakdown)
+
+
+@router.get("/items/{item_id}")
+async def get_item_history(item_id: int, limit: int = Query(100, ge=1, le=10000)):
+    """Maddenin denetim izini (oluşturma, güncelleme ve silme kayıtları) getir"""
+    entries = await run_in_threadpool(_in_session, status_history.item_history, item_id, limit)
+    if not entries:
+        raise HTTPException(status_code=404, detail="Madde geçmişi bulunamadı")
+    return entries
+
+
+@router.get("/checkpoints")
+async def list_checkpoints(limit: int = Query(50, ge=1, le=500)):
+    """Geçmiş kontrol noktalarını listele"""
+    return {
+        **status_history.metrics(),
+        "checkpoints": await run_in_threadpool(_in_session, status_history.checkpoints, limit),
+    }
+
+
+@router.post("/checkpoints", status_code=201)
+async def create_checkpoint():
+    """Ufuk öncesine kadarki durumun kontrol noktasını hemen al (ör. bir inceleme kilometre taşında)"""
+    return await run_in_threadpool(status_history.create_checkpoint)
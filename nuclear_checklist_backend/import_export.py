@@ -1,152 +1,815 @@
 import json
 import csv
 import io
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from sqlalchemy import insert, delete, select, literal, DateTime
+from datetime import datetime, timezone
+from collections import Counter
 import os
+import threading
+import time
+import uuid
 
-# Veritabanı yapılandırması
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./nuclear_checklist.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+try:
+    import msgpack
+except ImportError:  # MessagePack dışa aktarma isteğe bağlıdır
+    msgpack = None
 
-# ChecklistItem modeli
-class ChecklistItem(Base):
-    __tablename__ = "checklist_items"
-    
-    item_id = Column(Integer, primary_key=True, index=True)
-    category = Column(String(255), nullable=False, index=True)
-    sub_category = Column(String(255), nullable=False)
-    item_text = Column(Text, nullable=False)
-    standards = Column(String(255))
-    status = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Arrow/Parquet dışa aktarma isteğe bağlıdır
+    pyarrow = None
 
-class DataImportExport:
+from database import SessionLocal
+from models import ChecklistItem, ChecklistItemTombstone
+from statistics_cache import statistics_cache, item_key
+from content_hash import content_hash
+from search_index import search_index
+from data_version import data_version
+import fast_json
+from history import status_history, HistoryRecorder
+
+# Yüklenen dosyalardan bir seferde okunan karakter sayısı
+READ_CHUNK_SIZE = 64 * 1024
+# Tamamlanan içe aktarmalardan ilerleme sorgusu için saklanan sayısı
+FINISHED_IMPORTS_KEPT = 20
+# Parça parça commit eden içe aktarmalarda commit sonrası bekleme; bekleyen etkileşimli yazmalar kilidi alır (sn)
+IMPORT_BATCH_PAUSE = float(os.getenv("IMPORT_BATCH_PAUSE_MS", "20")) / 1000
+# Parquet çıktısında bir satır grubuna yazılan en az kayıt sayısı
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# Dışa aktarma biçimleri; "requires" verilenler ilgili paket kuruluysa kullanılabilir
+EXPORT_FORMATS = {
+    "json": {"media_type": "application/json", "extension": ".json"},
+    "csv": {"media_type": "text/csv", "extension": ".csv"},
+    "ndjson": {"media_type": "application/x-ndjson", "extension": ".ndjson"},
+    "msgpack": {"media_type": "application/vnd.msgpack", "extension": ".msgpack", "requires": "msgpack"},
+    "arrow": {"media_type": "application/vnd.apache.arrow.stream", "extension": ".arrows", "requires": "pyarrow"},
+    "parquet": {"media_type": "application/vnd.apache.parquet", "extension": ".parquet", "requires": "pyarrow"},
+}
+
+_OPTIONAL_MODULES = {"msgpack": msgpack, "pyarrow": pyarrow}
+
+
+def missing_export_dependency(format: str) -> Optional[str]:
+    """Biçim için gereken isteğe bağlı paket kurulu değilse paket adını döndür"""
+    requires = EXPORT_FORMATS[format].get("requires")
+    if requires and _OPTIONAL_MODULES[requires] is None:
+        return requires
+    return None
+
+
+def iter_json_array(stream, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """Metin akışındaki JSON dizisinin öğelerini tüm dosyayı belleğe almadan tek tek üret
+    
+    Akış parça parça okunur; tampon yalnızca henüz çözümlenmemiş kısmı tutar.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    
+    def read_more() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+    
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ''
+    
+    if next_char() == '\ufeff':
+        pos += 1
+    if next_char() != '[':
+        raise json.JSONDecodeError("JSON verisi bir liste olmalıdır", buffer, pos)
+    pos += 1
+    
+    if next_char() == ']':
+        pos += 1
+    else:
+        while True:
+            if not next_char():
+                raise json.JSONDecodeError("Beklenmeyen dosya sonu", buffer, pos)
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # Tampon sonunda biten sayı/sabit değerler yarım okunmuş olabilir
+                    if end < len(buffer) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                if not read_more():
+                    value, end = decoder.raw_decode(buffer, pos)
+                    break
+            pos = end
+            yield value
+            
+            separator = next_char()
+            pos += 1
+            if separator == ']':
+                break
+            if separator != ',':
+                raise json.JSONDecodeError("',' veya ']' bekleniyordu", buffer, pos - 1)
+    
+    if next_char():
+        raise json.JSONDecodeError("Dizi sonrasında fazladan veri", buffer, pos)
+
+
+class ImportProgress:
+    """Devam eden bir içe aktarmanın ilerleme sayaçları (iş parçacıkları arasında paylaşılır)"""
+    
+    def __init__(self, import_id: str, filename: Optional[str] = None, total_bytes: Optional[int] = None):
+        self.import_id = import_id
+        self.filename = filename
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.rows_read = 0
+        self.imported_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+        self.status = 'running'
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self._lock = threading.Lock()
+    
+    def update(self, **fields: Any) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            percent = None
+            if self.total_bytes:
+                percent = round(min(self.bytes_read / self.total_bytes, 1.0) * 100, 2)
+            return {
+                'import_id': self.import_id,
+                'filename': self.filename,
+                'status': self.status,
+                'total_bytes': self.total_bytes,
+                'bytes_read': self.bytes_read,
+                'percent': percent,
+                'rows_read': self.rows_read,
+                'imported_count': self.imported_count,
+                'skipped_count': self.skipped_count,
+                'error_count': self.error_count,
+                'started_at': self.started_at.isoformat(),
+                'finished_at': self.finished_at.isoformat() if self.finished_at else None
+            }
+
+
+class ImportProgressRegistry:
+    """Süreç içindeki içe aktarmaların ilerlemesini kimlik bazında tutar"""
+    
     def __init__(self):
-        self.db = SessionLocal()
+        self._lock = threading.Lock()
+        self._imports: Dict[str, ImportProgress] = {}
     
-    def export_to_json(self) -> str:
-        """Tüm çeklist verilerini JSON formatında dışa aktar"""
+    def start(self, import_id: Optional[str] = None, filename: Optional[str] = None,
+              total_bytes: Optional[int] = None) -> ImportProgress:
+        progress = ImportProgress(import_id or uuid.uuid4().hex, filename, total_bytes)
+        with self._lock:
+            self._imports[progress.import_id] = progress
+        return progress
+    
+    def finish(self, progress: ImportProgress, success: bool) -> None:
+        progress.update(status='completed' if success else 'failed', finished_at=datetime.utcnow())
+        with self._lock:
+            finished = [key for key, item in self._imports.items() if item.finished_at is not None]
+            for key in finished[:-FINISHED_IMPORTS_KEPT]:
+                del self._imports[key]
+    
+    def get(self, import_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            progress = self._imports.get(import_id)
+        return progress.snapshot() if progress else None
+    
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            imports = list(self._imports.values())
+        return [progress.snapshot() for progress in imports]
+
+
+# Uygulama genelinde paylaşılan ilerleme kaydı
+import_progress = ImportProgressRegistry()
+
+
+class ExportOptions:
+    """Dışa aktarmada seçilen sütunlar ve SQL sorgusuna eklenen filtreler"""
+    
+    def __init__(self, columns: Optional[Sequence[str]] = None, categories: Optional[Sequence[str]] = None,
+                 status: Optional[bool] = None, updated_from: Optional[datetime] = None,
+                 updated_to: Optional[datetime] = None):
+        columns = list(dict.fromkeys(columns)) if columns else None
+        unknown = [name for name in columns or () if name not in DataImportExport.EXPORT_FIELDS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen sütun: {', '.join(unknown)}")
+        # None: tüm sütunlar, mevcut çıktı biçimiyle birebir aynı
+        self.columns = tuple(columns) if columns and tuple(columns) != DataImportExport.EXPORT_FIELDS else None
+        self.categories = list(categories) if categories else None
+        self.status = status
+        self.updated_from = updated_from
+        self.updated_to = updated_to
+    
+    @property
+    def fields(self) -> Sequence[str]:
+        return self.columns or DataImportExport.EXPORT_FIELDS
+    
+    def apply(self, query):
+        """Filtreleri sorguya WHERE koşulu olarak ekle"""
+        if self.categories:
+            query = query.filter(ChecklistItem.category.in_(self.categories))
+        if self.status is not None:
+            query = query.filter(ChecklistItem.status == self.status)
+        if self.updated_from is not None:
+            query = query.filter(ChecklistItem.updated_at >= self.updated_from)
+        if self.updated_to is not None:
+            query = query.filter(ChecklistItem.updated_at <= self.updated_to)
+        return query
+
+
+class _StreamSink(io.RawIOBase):
+    """Yazılan baytları parça parça teslim eden, toplam konumu koruyan yazma hedefi (Arrow/Parquet için)"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class DataImportExport:
+    def __init__(self, db: Optional[Session] = None, commit_batches: bool = False):
+        # Oturum verilmezse ilk veritabanı erişiminde açılır
+        self._db = db
+        self._owns_session = db is None
+        # Arka plan içe aktarmaları her parçadan sonra commit eder; yazma kilidi uzun süre tutulmaz
+        self.commit_batches = commit_batches
+    
+    @property
+    def db(self) -> Session:
+        if self._db is None:
+            self._db = SessionLocal()
+        return self._db
+    
+    def close(self) -> None:
+        """Bu nesnenin açtığı oturumu kapat (dışarıdan verilen oturuma dokunmaz)"""
+        if self._owns_session and self._db is not None:
+            self._db.close()
+            self._db = None
+    
+    # Dışa aktarmada okunan sütunlar (ORM nesnesi oluşturmadan satır olarak çekilir)
+    EXPORT_COLUMNS = (
+        ChecklistItem.item_id,
+        ChecklistItem.category,
+        ChecklistItem.sub_category,
+        ChecklistItem.item_text,
+        ChecklistItem.standards,
+        ChecklistItem.status,
+        ChecklistItem.created_at,
+        ChecklistItem.updated_at,
+    )
+    
+    EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+    
+    CSV_HEADER = [
+        'ID', 'Kategori', 'Alt Kategori', 'Madde Metni', 
+        'Standartlar', 'Durum', 'Oluşturulma Tarihi', 'Güncelleme Tarihi'
+    ]
+    
+    # Sütun seçiminde CSV başlıkları ve biçimlendirilen tarih alanları
+    CSV_LABELS = dict(zip(EXPORT_FIELDS, CSV_HEADER))
+    DATETIME_FIELDS = ('created_at', 'updated_at')
+    
+    def iter_batches(self, batch_size: int = 1000, progress: Optional[ImportProgress] = None,
+                     options: Optional[ExportOptions] = None) -> Iterator[List[Any]]:
+        """Kayıtları item_id üzerinden keyset sayfalama ile parça parça getir
+        
+        ``options`` verilirse yalnızca seçilen sütunlar okunur ve filtreler SQL'de uygulanır.
+        """
+        columns = self.EXPORT_COLUMNS
+        if options is not None and options.columns:
+            selected = set(options.columns)
+            # item_id keyset sayfalama için her zaman okunur
+            columns = [column for column in self.EXPORT_COLUMNS if column.key in selected or column.key == 'item_id']
+        last_id = None
+        rows_read = 0
+        while True:
+            query = self.db.query(*columns)
+            if options is not None:
+                query = options.apply(query)
+            if last_id is not None:
+                query = query.filter(ChecklistItem.item_id > last_id)
+            batch = query.order_by(ChecklistItem.item_id).limit(batch_size).all()
+            if not batch:
+                break
+            rows_read += len(batch)
+            if progress is not None:
+                progress.update(rows_read=rows_read)
+            yield batch
+            last_id = batch[-1].item_id
+            if len(batch) < batch_size:
+                break
+    
+    @staticmethod
+    def _row_to_dict(item) -> Dict[str, Any]:
+        return {
+            'item_id': item.item_id,
+            'category': item.category,
+            'sub_category': item.sub_category,
+            'item_text': item.item_text,
+            'standards': item.standards,
+            'status': item.status,
+            'created_at': item.created_at.isoformat() if item.created_at else None,
+            'updated_at': item.updated_at.isoformat() if item.updated_at else None
+        }
+    
+    @classmethod
+    def _row_to_fields(cls, item, columns: Sequence[str]) -> Dict[str, Any]:
+        """Seçilen sütunları JSON uyumlu değerlerle sözlüğe çevir"""
+        row = {}
+        for name in columns:
+            value = getattr(item, name)
+            if name in cls.DATETIME_FIELDS:
+                value = value.isoformat() if value else None
+            row[name] = value
+        return row
+    
+    @staticmethod
+    def _row_to_csv(item) -> List[Any]:
+        return [
+            item.item_id,
+            item.category,
+            item.sub_category,
+            item.item_text,
+            item.standards or '',
+            'Tamamlandı' if item.status else 'Bekliyor',
+            item.created_at.strftime('%Y-%m-%d %H:%M:%S') if item.created_at else '',
+            item.updated_at.strftime('%Y-%m-%d %H:%M:%S') if item.updated_at else ''
+        ]
+    
+    @classmethod
+    def _csv_cell(cls, name: str, value) -> Any:
+        if name == 'status':
+            return 'Tamamlandı' if value else 'Bekliyor'
+        if name in cls.DATETIME_FIELDS:
+            return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+        if name == 'standards':
+            return value or ''
+        return value
+    
+    def iter_json(self, batch_size: int = 1000, progress: Optional[ImportProgress] = None,
+                  options: Optional[ExportOptions] = None) -> Iterator[str]:
+        """Çeklist verilerini JSON dizisi olarak parça parça üret (export_to_json ile aynı çıktı)"""
+        columns = options.columns if options is not None else None
+        fast = fast_json.enabled("export")
         try:
-            items = self.db.query(ChecklistItem).all()
-            data = []
-            
-            for item in items:
-                data.append({
-                    'item_id': item.item_id,
-                    'category': item.category,
-                    'sub_category': item.sub_category,
-                    'item_text': item.item_text,
-                    'standards': item.standards,
-                    'status': item.status,
-                    'created_at': item.created_at.isoformat() if item.created_at else None,
-                    'updated_at': item.updated_at.isoformat() if item.updated_at else None
-                })
-            
-            return json.dumps(data, ensure_ascii=False, indent=2)
+            first = True
+            for batch in self.iter_batches(batch_size, progress, options):
+                rows = [self._row_to_fields(item, columns) if columns else self._row_to_dict(item) for item in batch]
+                if not rows:
+                    continue
+                if fast:
+                    # Parti tek seferde kodlanır; '[\n  {...},\n  {...}\n]' çıktısından dizi gövdesini al
+                    body = fast_json.dumps_indented(rows)[1:-2]
+                    yield ('[' if first else ',') + body
+                    first = False
+                    continue
+                parts = []
+                for row in rows:
+                    # '[\n  {...}\n]' çıktısından girintili nesne gövdesini al
+                    body = json.dumps([row], ensure_ascii=False, indent=2)[1:-2]
+                    parts.append('[' + body if first else ',' + body)
+                    first = False
+                yield ''.join(parts)
+            yield '[]' if first else '\n]'
         
         except Exception as e:
             raise Exception(f"JSON dışa aktarma hatası: {str(e)}")
         finally:
-            self.db.close()
+            self.close()
     
-    def export_to_csv(self) -> str:
-        """Tüm çeklist verilerini CSV formatında dışa aktar"""
+    def iter_csv(self, batch_size: int = 1000, progress: Optional[ImportProgress] = None,
+                 options: Optional[ExportOptions] = None) -> Iterator[str]:
+        """Çeklist verilerini CSV satırları olarak parça parça üret (export_to_csv ile aynı çıktı)"""
+        columns = options.columns if options is not None else None
         try:
-            items = self.db.query(ChecklistItem).all()
-            
             output = io.StringIO()
             writer = csv.writer(output)
             
             # Başlık satırı
-            writer.writerow([
-                'ID', 'Kategori', 'Alt Kategori', 'Madde Metni', 
-                'Standartlar', 'Durum', 'Oluşturulma Tarihi', 'Güncelleme Tarihi'
-            ])
+            writer.writerow([self.CSV_LABELS[name] for name in columns] if columns else self.CSV_HEADER)
             
             # Veri satırları
-            for item in items:
-                writer.writerow([
-                    item.item_id,
-                    item.category,
-                    item.sub_category,
-                    item.item_text,
-                    item.standards or '',
-                    'Tamamlandı' if item.status else 'Bekliyor',
-                    item.created_at.strftime('%Y-%m-%d %H:%M:%S') if item.created_at else '',
-                    item.updated_at.strftime('%Y-%m-%d %H:%M:%S') if item.updated_at else ''
-                ])
+            for batch in self.iter_batches(batch_size, progress, options):
+                if columns:
+                    writer.writerows(
+                        [self._csv_cell(name, getattr(item, name)) for name in columns] for item in batch
+                    )
+                else:
+                    writer.writerows(self._row_to_csv(item) for item in batch)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
             
-            return output.getvalue()
+            if output.tell():
+                yield output.getvalue()
         
         except Exception as e:
             raise Exception(f"CSV dışa aktarma hatası: {str(e)}")
         finally:
-            self.db.close()
+            self.close()
     
-    def import_from_json(self, json_data: str, replace_existing: bool = False) -> Dict[str, Any]:
-        """JSON formatından veri içe aktar"""
+    def iter_ndjson(self, batch_size: int = 1000, progress: Optional[ImportProgress] = None,
+                    options: Optional[ExportOptions] = None) -> Iterator[str]:
+        """Her satırda bir kayıt olacak şekilde girintisiz JSON (NDJSON) üret"""
+        fields = options.fields if options is not None else self.EXPORT_FIELDS
+        if fast_json.enabled("export"):
+            encode = lambda row: fast_json.dumps(row).decode('utf-8')
+        else:
+            encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
         try:
-            data = json.loads(json_data)
-            
-            if replace_existing:
-                # Mevcut verileri temizle
-                self.db.query(ChecklistItem).delete()
+            for batch in self.iter_batches(batch_size, progress, options):
+                yield ''.join(encode(self._row_to_fields(item, fields)) + '\n' for item in batch)
+        except Exception as e:
+            raise Exception(f"NDJSON dışa aktarma hatası: {str(e)}")
+        finally:
+            self.close()
+    
+    def iter_msgpack(self, batch_size: int = 1000, progress: Optional[ImportProgress] = None,
+                     options: Optional[ExportOptions] = None) -> Iterator[bytes]:
+        """Kayıtları art arda MessagePack haritaları olarak üret (tarihler Timestamp uzantısıyla)"""
+        fields = options.fields if options is not None else self.EXPORT_FIELDS
+        dates = [name for name in fields if name in self.DATETIME_FIELDS]
+        try:
+            packer = msgpack.Packer(datetime=True)
+            for batch in self.iter_batches(batch_size, progress, options):
+                parts = []
+                for item in batch:
+                    row = {name: getattr(item, name) for name in fields}
+                    for name in dates:
+                        if row[name] is not None:
+                            # Veritabanındaki tarihler UTC olarak saklanır
+                            row[name] = row[name].replace(tzinfo=timezone.utc)
+                    parts.append(packer.pack(row))
+                yield b''.join(parts)
+        except Exception as e:
+            raise Exception(f"MessagePack dışa aktarma hatası: {str(e)}")
+        finally:
+            self.close()
+    
+    def _arrow_schema(self, fields: Sequence[str]):
+        types = {
+            'item_id': pyarrow.int64(),
+            'status': pyarrow.bool_(),
+            'created_at': pyarrow.timestamp('us'),
+            'updated_at': pyarrow.timestamp('us'),
+        }
+        return pyarrow.schema([(name, types.get(name, pyarrow.string())) for name in fields])
+    
+    @staticmethod
+    def _arrow_batch(batch, schema):
+        return pyarrow.record_batch(
+            [pyarrow.array([getattr(item, field.name) for item in batch], type=field.type) for field in schema],
+            schema=schema
+        )
+    
+    def iter_arrow(self, batch_size: int = 10000, progress: Optional[ImportProgress] = None,
+                   options: Optional[ExportOptions] = None) -> Iterator[bytes]:
+        """Kayıtları Arrow IPC akış biçiminde, her parça bir kayıt grubu olacak şekilde üret"""
+        schema = self._arrow_schema(options.fields if options is not None else self.EXPORT_FIELDS)
+        sink = _StreamSink()
+        try:
+            with pyarrow.ipc.new_stream(pyarrow.PythonFile(sink, mode='w'), schema) as writer:
+                for batch in self.iter_batches(batch_size, progress, options):
+                    writer.write_batch(self._arrow_batch(batch, schema))
+                    yield sink.drain()
+            yield sink.drain()
+        except Exception as e:
+            raise Exception(f"Arrow dışa aktarma hatası: {str(e)}")
+        finally:
+            self.close()
+    
+    def iter_parquet(self, batch_size: int = 10000, progress: Optional[ImportProgress] = None,
+                     options: Optional[ExportOptions] = None) -> Iterator[bytes]:
+        """Kayıtları Parquet dosyası olarak üret; satır grupları tamamlandıkça gönderilir"""
+        schema = self._arrow_schema(options.fields if options is not None else self.EXPORT_FIELDS)
+        sink = _StreamSink()
+        try:
+            pending, pending_rows = [], 0
+            with pyarrow.parquet.ParquetWriter(pyarrow.PythonFile(sink, mode='w'), schema) as writer:
+                for batch in self.iter_batches(batch_size, progress, options):
+                    pending.append(self._arrow_batch(batch, schema))
+                    pending_rows += len(batch)
+                    if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                        writer.write_table(pyarrow.Table.from_batches(pending, schema=schema))
+                        pending, pending_rows = [], 0
+                        yield sink.drain()
+                if pending:
+                    writer.write_table(pyarrow.Table.from_batches(pending, schema=schema))
+            yield sink.drain()
+        except Exception as e:
+            raise Exception(f"Parquet dışa aktarma hatası: {str(e)}")
+        finally:
+            self.close()
+    
+    def iter_export(self, format: str, progress: Optional[ImportProgress] = None,
+                    options: Optional[ExportOptions] = None) -> Iterator[Union[str, bytes]]:
+        """Biçime göre dışa aktarma parçalarını üret (metin biçimleri str, ikili biçimler bytes)"""
+        missing = missing_export_dependency(format)
+        if missing:
+            raise ValueError(f"{format} dışa aktarma için '{missing}' paketi kurulu değil")
+        return getattr(self, f'iter_{format}')(progress=progress, options=options)
+    
+    def export_to_json(self) -> str:
+        """Tüm çeklist verilerini JSON formatında dışa aktar"""
+        return ''.join(self.iter_json())
+    
+    def export_to_csv(self) -> str:
+        """Tüm çeklist verilerini CSV formatında dışa aktar"""
+        return ''.join(self.iter_csv())
+    
+    def _existing_content_hashes(self, hashes: List[str]) -> set:
+        """Verilen içerik özetlerinden veritabanında zaten bulunanları indeks üzerinden bul"""
+        if not hashes:
+            return set()
+        rows = self.db.query(ChecklistItem.content_hash).filter(ChecklistItem.content_hash.in_(hashes))
+        return {digest for (digest,) in rows}
+    
+    @staticmethod
+    def record_tombstones(db: Session, deleted_at: datetime, where=None) -> None:
+        """Silinecek kayıtlar için küme tabanlı INSERT ... SELECT ile silme izi yaz"""
+        item_ids = select(ChecklistItem.item_id)
+        if where is not None:
+            item_ids = item_ids.where(where)
+        db.execute(delete(ChecklistItemTombstone).where(ChecklistItemTombstone.item_id.in_(item_ids)))
+        db.execute(
+            insert(ChecklistItemTombstone).from_select(
+                ['item_id', 'deleted_at'],
+                item_ids.add_columns(literal(deleted_at, DateTime))
+            )
+        )
+    
+    def _bulk_import(self, records: Iterable[Dict[str, Any]], replace_existing: bool, batch_size: int = 500,
+                     progress: Optional['ImportProgress'] = None) -> Dict[str, int]:
+        """Doğrulanmış kayıtları içerik özeti ile tekrar kontrolü yapıp toplu INSERT ile yaz
+        
+        Kayıtlar parça parça tüketilir; bellek kullanımı toplam satır sayısına değil
+        parça boyutuna bağlıdır. Önceki parçalarda eklenen kayıtlar indeks sorgusunda
+        görüldüğü için dosya içi tekrarlar da atlanır. Varsayılan olarak tüm içe aktarma
+        tek işlemdir; ``commit_batches`` açıksa her parça ayrı commit edilir (hata
+        durumunda önceki parçalar kalır). Bu durumda ``replace_existing`` silmesi kendi
+        başına ilk parça olarak commit edilir; yazma kilidi kayıtlar okunurken tutulmaz.
+        """
+        now = datetime.utcnow()
+        # Geçmiş kayıtları her commit öncesinde commit anıyla damgalanır
+        history = HistoryRecorder()
+        pending_changes = replace_existing
+        if replace_existing:
+            # Mevcut verileri temizle (eklemelerle aynı işlem içinde), silme izlerini ve geçmiş kaydını bırak
+            self.record_tombstones(self.db, now)
+            history.deleted(self.db.scalars(select(ChecklistItem.item_id)))
+            self.db.query(ChecklistItem).delete(synchronize_session=False)
+        
+        imported_count = 0
+        skipped_count = 0
+        added_counts = Counter()
+        batch = {}
+        
+        def commit():
+            nonlocal pending_changes
+            if not pending_changes:
                 self.db.commit()
+                return
+            history_count = history.write(self.db)
+            version = data_version.bump(self.db)
+            self.db.commit()
+            status_history.changes_recorded(history_count)
+            pending_changes = False
             
-            imported_count = 0
-            skipped_count = 0
-            errors = []
+            with data_version.publish(version) as in_order:
+                if replace_existing:
+                    statistics_cache.invalidate()
+                elif in_order:
+                    statistics_cache.item_counts_added(added_counts)
+                added_counts.clear()
+            # Toplu INSERT yeni item_id'leri döndürmediği için bellek içi arama indeksi yeniden oluşturulur
+            search_index.invalidate()
+        
+        def flush():
+            nonlocal imported_count, skipped_count, pending_changes
+            existing = self._existing_content_hashes(list(batch))
+            rows = [row for digest, row in batch.items() if digest not in existing]
+            skipped_count += len(batch) - len(rows)
             
-            for item_data in data:
-                try:
-                    # Gerekli alanları kontrol et
-                    if not all(key in item_data for key in ['category', 'sub_category', 'item_text']):
-                        errors.append(f"Eksik alan: {item_data}")
-                        continue
-                    
-                    # Mevcut kayıt kontrolü (replace_existing False ise)
-                    if not replace_existing:
-                        existing = self.db.query(ChecklistItem).filter(
-                            ChecklistItem.category == item_data['category'],
-                            ChecklistItem.sub_category == item_data['sub_category'],
-                            ChecklistItem.item_text == item_data['item_text']
-                        ).first()
-                        
-                        if existing:
-                            skipped_count += 1
-                            continue
-                    
-                    # Yeni kayıt oluştur
-                    new_item = ChecklistItem(
-                        category=item_data['category'],
-                        sub_category=item_data['sub_category'],
-                        item_text=item_data['item_text'],
-                        standards=item_data.get('standards'),
-                        status=item_data.get('status', False)
-                    )
-                    
-                    self.db.add(new_item)
-                    imported_count += 1
+            if rows:
+                self.db.execute(insert(ChecklistItem), rows)
+                history.items(ChecklistItem.content_hash.in_([row['content_hash'] for row in rows]), "create")
+                imported_count += len(rows)
+                pending_changes = True
+                added_counts.update(
+                    item_key(row['category'], row['sub_category'], row['standards'], row['status'])
+                    for row in rows
+                )
+            batch.clear()
+            if self.commit_batches:
+                commit()
+                time.sleep(IMPORT_BATCH_PAUSE)
+            if progress is not None:
+                progress.update(imported_count=imported_count, skipped_count=skipped_count)
+        
+        if replace_existing and self.commit_batches:
+            commit()
+        
+        for record in records:
+            digest = content_hash(record['category'], record['sub_category'], record['item_text'])
+            # Aynı parça içinde tekrar eden kayıtlar
+            if digest in batch:
+                skipped_count += 1
+                continue
+            
+            batch[digest] = {**record, 'content_hash': digest, 'created_at': now, 'updated_at': now}
+            if len(batch) >= batch_size:
+                flush()
+        
+        if batch:
+            flush()
+        
+        commit()
+        
+        return {'imported_count': imported_count, 'skipped_count': skipped_count}
+    
+    @staticmethod
+    def _json_records(data, errors: List[str]) -> Iterator[Dict[str, Any]]:
+        """JSON öğelerini doğrulayıp içe aktarma kayıtlarına dönüştür"""
+        for item_data in data:
+            try:
+                # Gerekli alanları kontrol et
+                if not all(key in item_data for key in ['category', 'sub_category', 'item_text']):
+                    errors.append(f"Eksik alan: {item_data}")
+                    continue
                 
-                except Exception as e:
-                    errors.append(f"Kayıt hatası: {str(e)} - {item_data}")
+                yield {
+                    'category': item_data['category'],
+                    'sub_category': item_data['sub_category'],
+                    'item_text': item_data['item_text'],
+                    'standards': item_data.get('standards'),
+                    'status': item_data.get('status', False)
+                }
             
-            self.db.commit()
+            except Exception as e:
+                errors.append(f"Kayıt hatası: {str(e)} - {item_data}")
+    
+    @staticmethod
+    def _csv_records(csv_reader, errors: List[str]) -> Iterator[Dict[str, Any]]:
+        """CSV satırlarını doğrulayıp içe aktarma kayıtlarına dönüştür"""
+        for row_num, row in enumerate(csv_reader, start=2):  # 2'den başla (başlık satırı 1)
+            try:
+                # Gerekli alanları kontrol et
+                category = row.get('Kategori') or row.get('category')
+                sub_category = row.get('Alt Kategori') or row.get('sub_category')
+                item_text = row.get('Madde Metni') or row.get('item_text')
+                
+                if not all([category, sub_category, item_text]):
+                    errors.append(f"Satır {row_num}: Eksik alan")
+                    continue
+                
+                # Durum alanını işle
+                status_text = row.get('Durum') or row.get('status', '')
+                status = status_text.lower() in ['tamamlandı', 'true', '1', 'completed']
+                
+                yield {
+                    'category': category,
+                    'sub_category': sub_category,
+                    'item_text': item_text,
+                    'standards': row.get('Standartlar') or row.get('standards'),
+                    'status': status
+                }
+            
+            except Exception as e:
+                errors.append(f"Satır {row_num}: {str(e)}")
+    
+    @staticmethod
+    def _tracked(records: Iterable[Dict[str, Any]], source, progress: Optional[ImportProgress],
+                 errors: List[str], every: int = 500) -> Iterator[Dict[str, Any]]:
+        """Okunan kayıt ve bayt sayısını ilerleme sayaçlarına işle"""
+        rows_read = 0
+        for record in records:
+            rows_read += 1
+            if progress is not None and rows_read % every == 0:
+                progress.update(rows_read=rows_read, bytes_read=source.tell(), error_count=len(errors))
+            yield record
+        if progress is not None:
+            progress.update(rows_read=rows_read, bytes_read=source.tell(), error_count=len(errors))
+    
+    def import_from_json_stream(self, source, replace_existing: bool = False,
+                                progress: Optional[ImportProgress] = None) -> Dict[str, Any]:
+        """İkili dosya akışındaki JSON dizisini parça parça okuyarak içe aktar"""
+        errors = []
+        try:
+            stream = io.TextIOWrapper(source, encoding='utf-8-sig')
+            records = self._json_records(iter_json_array(stream), errors)
+            counts = self._bulk_import(self._tracked(records, source, progress, errors), replace_existing,
+                                       progress=progress)
             
             return {
                 'success': True,
-                'imported_count': imported_count,
-                'skipped_count': skipped_count,
+                **counts,
                 'errors': errors,
-                'message': f"{imported_count} kayıt başarıyla içe aktarıldı"
+                'message': f"{counts['imported_count']} kayıt başarıyla içe aktarıldı"
+            }
+        
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self.db.rollback()
+            return {
+                'success': False,
+                'errors': errors,
+                'error': f"JSON format hatası: {str(e)}"
+            }
+        except Exception as e:
+            self.db.rollback()
+            statistics_cache.invalidate()
+            search_index.invalidate()
+            return {
+                'success': False,
+                'errors': errors,
+                'error': f"İçe aktarma hatası: {str(e)}"
+            }
+        finally:
+            self.close()
+    
+    def import_from_csv_stream(self, source, replace_existing: bool = False,
+                               progress: Optional[ImportProgress] = None) -> Dict[str, Any]:
+        """İkili dosya akışındaki CSV satırlarını tek tek çözerek içe aktar"""
+        errors = []
+        try:
+            stream = io.TextIOWrapper(source, encoding='utf-8-sig', newline='')
+            records = self._csv_records(csv.DictReader(stream), errors)
+            counts = self._bulk_import(self._tracked(records, source, progress, errors), replace_existing,
+                                       progress=progress)
+            
+            return {
+                'success': True,
+                **counts,
+                'errors': errors,
+                'message': f"{counts['imported_count']} kayıt başarıyla içe aktarıldı"
+            }
+        
+        except Exception as e:
+            self.db.rollback()
+            statistics_cache.invalidate()
+            search_index.invalidate()
+            return {
+                'success': False,
+                'errors': errors,
+                'error': f"CSV içe aktarma hatası: {str(e)}"
+            }
+        finally:
+            self.close()
+    
+    def import_from_json(self, json_data: str, replace_existing: bool = False) -> Dict[str, Any]:
+        """JSON formatından veri içe aktar"""
+        try:
+            data = json.loads(json_data)
+            errors = []
+            counts = self._bulk_import(self._json_records(data, errors), replace_existing)
+            
+            return {
+                'success': True,
+                **counts,
+                'errors': errors,
+                'message': f"{counts['imported_count']} kayıt başarıyla içe aktarıldı"
             }
         
         except json.JSONDecodeError as e:
@@ -156,87 +819,39 @@ class DataImportExport:
             }
         except Exception as e:
             self.db.rollback()
+            statistics_cache.invalidate()
+            search_index.invalidate()
             return {
                 'success': False,
                 'error': f"İçe aktarma hatası: {str(e)}"
             }
         finally:
-            self.db.close()
+            self.close()
     
     def import_from_csv(self, csv_data: str, replace_existing: bool = False) -> Dict[str, Any]:
         """CSV formatından veri içe aktar"""
         try:
             csv_reader = csv.DictReader(io.StringIO(csv_data))
-            
-            if replace_existing:
-                # Mevcut verileri temizle
-                self.db.query(ChecklistItem).delete()
-                self.db.commit()
-            
-            imported_count = 0
-            skipped_count = 0
             errors = []
-            
-            for row_num, row in enumerate(csv_reader, start=2):  # 2'den başla (başlık satırı 1)
-                try:
-                    # Gerekli alanları kontrol et
-                    category = row.get('Kategori') or row.get('category')
-                    sub_category = row.get('Alt Kategori') or row.get('sub_category')
-                    item_text = row.get('Madde Metni') or row.get('item_text')
-                    
-                    if not all([category, sub_category, item_text]):
-                        errors.append(f"Satır {row_num}: Eksik alan")
-                        continue
-                    
-                    # Mevcut kayıt kontrolü
-                    if not replace_existing:
-                        existing = self.db.query(ChecklistItem).filter(
-                            ChecklistItem.category == category,
-                            ChecklistItem.sub_category == sub_category,
-                            ChecklistItem.item_text == item_text
-                        ).first()
-                        
-                        if existing:
-                            skipped_count += 1
-                            continue
-                    
-                    # Durum alanını işle
-                    status_text = row.get('Durum') or row.get('status', '')
-                    status = status_text.lower() in ['tamamlandı', 'true', '1', 'completed']
-                    
-                    # Yeni kayıt oluştur
-                    new_item = ChecklistItem(
-                        category=category,
-                        sub_category=sub_category,
-                        item_text=item_text,
-                        standards=row.get('Standartlar') or row.get('standards'),
-                        status=status
-                    )
-                    
-                    self.db.add(new_item)
-                    imported_count += 1
-                
-                except Exception as e:
-                    errors.append(f"Satır {row_num}: {str(e)}")
-            
-            self.db.commit()
+            counts = self._bulk_import(self._csv_records(csv_reader, errors), replace_existing)
             
             return {
                 'success': True,
-                'imported_count': imported_count,
-                'skipped_count': skipped_count,
+                **counts,
                 'errors': errors,
-                'message': f"{imported_count} kayıt başarıyla içe aktarıldı"
+                'message': f"{counts['imported_count']} kayıt başarıyla içe aktarıldı"
             }
         
         except Exception as e:
             self.db.rollback()
+            statistics_cache.invalidate()
+            search_index.invalidate()
             return {
                 'success': False,
                 'error': f"CSV içe aktarma hatası: {str(e)}"
             }
         finally:
-            self.db.close()
+            self.close()
     
     def validate_json_structure(self, json_data: str) -> Dict[str, Any]:
         """JSON veri yapısını doğrula"""
@@ -0,0 +1,289 @@
+import argparse
+import os
+import re
+import time
+from collections import Counter
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import ChecklistItem
+from content_hash import content_hash
+from import_export import DataImportExport
+from statistics_cache import statistics_cache
+from search_index import search_index
+from data_version import data_version
+from history import status_history, HistoryRecorder
+
+# Sondaki parantez içindeki standart listesi: "... (IEC 61513, SSG-39)"
+STANDARDS_PATTERN = re.compile(r'\(([^)]+)\)$')
+# "**Başlık**:" biçimindeki kalın etiket
+BOLD_LABEL_PATTERN = re.compile(r'\*\*(.*?)\*\*:')
+# CLI'de paralel ayrıştırmada kullanılacak en fazla süreç sayısı
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", str(min(os.cpu_count() or 1, 8))))
+# Toplu yazmalarda parça boyutu
+WRITE_BATCH_SIZE = 500
+
+PruneScope = Literal["categories", "all", "none"]
+
+
+def iter_checklist_items(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Markdown çeklist satırlarını tek geçişte okuyup maddeleri üret"""
+    current_category = ""
+    current_sub_category = ""
+
+    for line in lines:
+        line = line.strip()
+
+        # Ana kategori (## ile başlayan)
+        if line.startswith('## '):
+            current_category = line[3:].strip()
+            continue
+
+        # Alt kategori (### ile başlayan)
+        if line.startswith('### '):
+            current_sub_category = line[4:].strip()
+            continue
+
+        # Çeklist maddesi (- [ ] ile başlayan)
+        if line.startswith('- [ ] '):
+            item_text = line[6:].strip()
+
+            # Standartları çıkar (parantez içindeki kısım)
+            standards = ""
+            if item_text.endswith(')'):
+                standards_match = STANDARDS_PATTERN.search(item_text)
+                if standards_match:
+                    standards = standards_match.group(1)
+                    item_text = item_text[:standards_match.start()].strip()
+
+            # **Bold** kısmını temizle
+            if '**' in item_text:
+                item_text = BOLD_LABEL_PATTERN.sub(r'\1:', item_text)
+
+            yield {
+                'category': current_category,
+                'sub_category': current_sub_category,
+                'item_text': item_text,
+                'standards': standards,
+                'status': False
+            }
+
+
+def parse_checklist_file(file_path) -> List[Dict[str, Any]]:
+    """Çeklist dosyasını satır satır okuyarak ayrıştır ve maddeleri döndür"""
+    with open(file_path, 'r', encoding='utf-8-sig') as file:
+        return list(iter_checklist_items(file))
+
+
+def parse_checklist_files(paths: List[str], workers: int = 1) -> List[Dict[str, Any]]:
+    """Çeklist dosyalarını ayrıştır (dosya sırası korunur)
+
+    Varsayılan olarak süreç içinde ayrıştırılır; API isteklerinde iş parçacıklı
+    sunucudan süreç çatallanmaz. ``workers`` > 1 yalnızca CLI'den verilir; havuz
+    ``spawn`` bağlamıyla başlatılır, böylece ana süreçteki kilit ve bağlantılar
+    alt süreçlere kopyalanmaz.
+    """
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        parsed = [parse_checklist_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            parsed = list(pool.map(parse_checklist_file, paths))
+    return [item for items in parsed for item in items]
+
+
+def item_label(item_text: str) -> Optional[str]:
+    """Madde metnindeki "Etiket:" önekini döndür (metni değişen maddeleri eşleştirmek için)"""
+    label, separator, _ = item_text.partition(':')
+    return label.strip() if separator and label.strip() else None
+
+
+def plan_sync(parsed: List[Dict[str, Any]], existing: List[Any]) -> Dict[str, Any]:
+    """Ayrıştırılan maddeleri veritabanındakilerle içerik anahtarına göre karşılaştır
+
+    Önce (kategori, alt kategori, madde metni) özeti eşleştirilir; kalanlar
+    tekil "Etiket:" önekiyle eşleştirilir ve güncelleme sayılır. Böylece metni
+    revize edilen maddelerin item_id ve durum bilgisi korunur.
+    """
+    incoming: Dict[str, Dict[str, Any]] = {}
+    duplicates = 0
+    for item in parsed:
+        if not (item['category'] and item['sub_category'] and item['item_text']):
+            continue
+        digest = content_hash(item['category'], item['sub_category'], item['item_text'])
+        if digest in incoming:
+            duplicates += 1
+            continue
+        incoming[digest] = item
+
+    updates = []
+    unmatched_rows = []
+    matched = set()
+    for row in existing:
+        digest = row.content_hash or content_hash(row.category, row.sub_category, row.item_text)
+        item = incoming.get(digest)
+        if item is None or digest in matched:
+            unmatched_rows.append(row)
+            continue
+        matched.add(digest)
+        if (row.standards or '') != (item['standards'] or '') or row.content_hash != digest:
+            updates.append({'item_id': row.item_id, 'standards': item['standards'], 'content_hash': digest})
+
+    # Metni ya da alt kategori başlığı değişmiş maddeler: önce aynı alt kategoride, sonra aynı
+    # kategoride iki tarafta da tekil olan "Etiket:" önekiyle eşleştir
+    unmatched_items = {digest: item for digest, item in incoming.items() if digest not in matched}
+
+    for scope in (('category', 'sub_category'), ('category',)):
+        def label_key(values):
+            label = item_label(values['item_text'])
+            return tuple(values[name] for name in scope) + (label,) if label else None
+
+        row_keys = [(row, label_key(row._mapping)) for row in unmatched_rows]
+        item_keys = {digest: label_key(item) for digest, item in unmatched_items.items()}
+        row_counts = Counter(key for _, key in row_keys)
+        item_counts = Counter(item_keys.values())
+        items_by_key = {key: digest for digest, key in item_keys.items()}
+
+        remaining = []
+        for row, key in row_keys:
+            if key is None or row_counts[key] != 1 or item_counts[key] != 1:
+                remaining.append(row)
+                continue
+            digest = items_by_key[key]
+            item = unmatched_items.pop(digest)
+            updates.append({
+                'item_id': row.item_id,
+                'sub_category': item['sub_category'],
+                'item_text': item['item_text'],
+                'standards': item['standards'],
+                'content_hash': digest
+            })
+        unmatched_rows = remaining
+
+    deletes = [row.item_id for row in unmatched_rows]
+    inserts = [{**item, 'content_hash': digest} for digest, item in unmatched_items.items()]
+
+    return {
+        'inserts': inserts,
+        'updates': updates,
+        'deletes': deletes,
+        'unchanged': len(existing) - len(updates) - len(deletes),
+        'duplicates': duplicates
+    }
+
+
+def _chunks(values: List[Any], size: int = WRITE_BATCH_SIZE) -> Iterator[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def apply_sync(db: Session, plan: Dict[str, Any]) -> None:
+    """Planlanan ekleme, güncelleme ve silmeleri toplu olarak tek işlemde yaz"""
+    now = datetime.utcnow()
+    # Geçmiş kayıtları commit öncesinde commit anıyla damgalanır
+    history = HistoryRecorder()
+
+    if plan['deletes']:
+        history.deleted(plan['deletes'])
+        for item_ids in _chunks(plan['deletes']):
+            DataImportExport.record_tombstones(db, now, ChecklistItem.item_id.in_(item_ids))
+            db.execute(delete(ChecklistItem).where(ChecklistItem.item_id.in_(item_ids)))
+
+    # Eşleşen kayıtlar önce güncellenir; böylece yeni eklenenlerle benzersiz özet çakışmaz
+    for rows in _chunks(plan['updates']):
+        db.execute(update(ChecklistItem), [{**row, 'updated_at': now} for row in rows])
+        history.items(ChecklistItem.item_id.in_([row['item_id'] for row in rows]), "update")
+
+    for rows in _chunks(plan['inserts']):
+        db.execute(insert(ChecklistItem), [{**row, 'created_at': now, 'updated_at': now} for row in rows])
+        history.items(ChecklistItem.content_hash.in_([row['content_hash'] for row in rows]), "create")
+
+    history_count = history.write(db)
+    version = data_version.bump(db)
+    db.commit()
+    data_version.observe(version)
+    status_history.changes_recorded(history_count)
+
+
+def sync_checklists(paths: List[str], prune: PruneScope = "categories", dry_run: bool = False,
+                    workers: int = 1, db: Optional[Session] = None) -> Dict[str, Any]:
+    """Markdown çeklistlerini ayrıştırıp veritabanıyla artımlı olarak eşitle
+
+    ``prune`` belgede bulunmayan maddelerin hangi kapsamda silineceğini belirler:
+    yalnızca belgelerdeki kategorilerde (varsayılan), tüm tabloda ya da hiç.
+    """
+    started = time.perf_counter()
+    parsed = parse_checklist_files(paths, workers)
+    parsed_seconds = time.perf_counter() - started
+
+    owns_session = db is None
+    db = db or SessionLocal()
+    try:
+        query = db.query(
+            ChecklistItem.item_id, ChecklistItem.category, ChecklistItem.sub_category,
+            ChecklistItem.item_text, ChecklistItem.standards, ChecklistItem.content_hash
+        )
+        if prune != "all":
+            query = query.filter(ChecklistItem.category.in_({item['category'] for item in parsed}))
+        existing = query.order_by(ChecklistItem.item_id).all()
+
+        plan = plan_sync(parsed, existing)
+        if prune == "none":
+            plan['unchanged'] += len(plan['deletes'])
+            plan['deletes'] = []
+
+        if not dry_run and (plan['inserts'] or plan['updates'] or plan['deletes']):
+            try:
+                apply_sync(db, plan)
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                statistics_cache.invalidate()
+                search_index.invalidate()
+    finally:
+        if owns_session:
+            db.close()
+
+    return {
+        'files': len(paths),
+        'parsed_count': len(parsed),
+        'inserted_count': len(plan['inserts']),
+        'updated_count': len(plan['updates']),
+        'deleted_count': len(plan['deletes']),
+        'unchanged_count': plan['unchanged'],
+        'duplicate_count': plan['duplicates'],
+        'dry_run': dry_run,
+        'parse_seconds': round(parsed_seconds, 3),
+        'total_seconds': round(time.perf_counter() - started, 3)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Markdown çeklist dosyalarını veritabanıyla eşitle")
+    parser.add_argument("files", nargs="+", help="Markdown çeklist dosyaları")
+    parser.add_argument("--prune", choices=["categories", "all", "none"], default="categories",
+                        help="Belgede olmayan maddelerin silineceği kapsam")
+    parser.add_argument("--workers", type=int, default=INGEST_WORKERS, help="Ayrıştırma süreç sayısı")
+    parser.add_argument("--dry-run", action="store_true", help="Değişiklikleri yazmadan yalnızca raporla")
+    args = parser.parse_args(argv)
+
+    # Şemayı hazırla; sunucu modülü yüklenmez, çalışan sunucunun arka plan işlerine dokunulmaz.
+    # Yazmalar kalıcı veri sürümünü artırır, sunucu önbelleklerini bir sonraki okumada yeniler.
+    from bootstrap import prepare_database
+
+    prepare_database()
+
+    result = sync_checklists(args.files, args.prune, args.dry_run, args.workers)
+    for key, value in result.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+import codecs
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+
+from database import SessionLocal
+from models import ChecklistItem, ImportExportJob
+from import_export import DataImportExport, ExportOptions, ImportProgress, EXPORT_FORMATS
+from compression import open_upload, split_upload_name
+
+logger = logging.getLogger("nuclear_checklist_api")
+
+# Aynı anda çalışan arka plan işi sayısı (etkileşimli isteklerin veritabanı ve CPU payını korur)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Çalışanlar doluyken kuyrukta bekleyebilecek en fazla iş sayısı; aşılırsa yeni iş reddedilir
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "20"))
+# Yüklenen dosyaların ve dışa aktarma çıktılarının saklandığı dizin
+JOB_STORAGE_DIR = os.getenv("JOB_STORAGE_DIR", "./job_files")
+# İlerleme sayaçlarının iş kaydına yazılma aralığı (saniye)
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "1.0"))
+
+# Son durum yazılamazsa (ör. SQLite kilidi) yeniden deneme sayısı ve aralığı (saniye)
+JOB_FINISH_ATTEMPTS = 5
+JOB_FINISH_RETRY_DELAY = 1.0
+
+PROGRESS_FIELDS = ("bytes_read", "rows_read", "imported_count", "skipped_count", "error_count")
+
+
+class JobQueueFull(Exception):
+    """Çalışan ve kuyruk kapasitesi dolu olduğunda fırlatılır"""
+
+
+class JobProgress(ImportProgress):
+    """İlerleme sayaçlarını belirli aralıklarla iş kaydına da yazar
+
+    ``persist`` kapalıysa sayaçlar yalnızca bellekte tutulur ve iş bitince yazılır.
+    Yazma en iyi çabadır: veritabanı kilitliyse sayaçlar bellekte kalır, iş sürer.
+    """
+
+    def __init__(self, manager: "JobManager", job_id: str, total_bytes: Optional[int] = None,
+                 persist: bool = True):
+        super().__init__(job_id, None, total_bytes)
+        self._manager = manager
+        self._persist = persist
+        self._last_saved = 0.0
+
+    def counts(self) -> Dict[str, int]:
+        snapshot = self.snapshot()
+        return {name: snapshot[name] for name in PROGRESS_FIELDS}
+
+    def update(self, **fields: Any) -> None:
+        super().update(**fields)
+        if not self._persist:
+            return
+        now = time.monotonic()
+        if now - self._last_saved >= JOB_PROGRESS_INTERVAL:
+            self._last_saved = now
+            try:
+                self._manager.save(self.import_id, **self.counts())
+            except OperationalError as e:
+                logger.debug("İlerleme kaydedilemedi (%s): %s", self.import_id, e)
+
+
+def completion_percent(job: Dict[str, Any]) -> Optional[float]:
+    """İçe aktarmada okunan bayt, dışa aktarmada yazılan satır oranından yüzde hesapla"""
+    if job["status"] == "completed":
+        return 100.0
+    if job["kind"] == "import" and job["total_bytes"]:
+        return round(min(job["bytes_read"] / job["total_bytes"], 1.0) * 100, 2)
+    if job["kind"] == "export" and job["total_rows"]:
+        return round(min(job["rows_read"] / job["total_rows"], 1.0) * 100, 2)
+    return None
+
+
+def job_to_dict(job: ImportExportJob) -> Dict[str, Any]:
+    """İş kaydını API yanıtı sözlüğüne dönüştür"""
+    result = {
+        "job_id": job.job_id,
+        "kind": job.kind,
+        "format": job.format,
+        "status": job.status,
+        "filename": job.filename,
+        "replace_existing": job.replace_existing,
+        "percent": None,
+        "total_bytes": job.total_bytes,
+        "bytes_read": job.bytes_read,
+        "total_rows": job.total_rows,
+        "rows_read": job.rows_read,
+        "imported_count": job.imported_count,
+        "skipped_count": job.skipped_count,
+        "error_count": job.error_count,
+        "errors": json.loads(job.errors) if job.errors else [],
+        "message": job.message,
+        "download_url": (
+            f"/data-management/jobs/{job.job_id}/download"
+            if job.kind == "export" and job.status == "completed" else None
+        ),
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    result["percent"] = completion_percent(result)
+    return result
+
+
+class JobManager:
+    """İçe/dışa aktarma işlerini sınırlı bir iş parçacığı havuzunda çalıştırır
+
+    İşler istek döngüsünden bağımsız çalışır; durumları, sayaçları ve hata
+    listesi ``import_export_jobs`` tablosunda tutulur. İşler senkron motorun
+    bağlantı havuzunu kullanır, etkileşimli istekler ise asenkron motoru.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_limit: int = JOB_QUEUE_LIMIT,
+                 storage_dir: str = JOB_STORAGE_DIR):
+        self.workers = max(workers, 1)
+        self.queue_limit = max(queue_limit, 0)
+        self.storage_dir = storage_dir
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active: Dict[str, JobProgress] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="checklist-job")
+            return self._executor
+
+    # --- Kayıt işlemleri ---
+
+    def save(self, job_id: str, **fields: Any) -> None:
+        """İş kaydının verilen alanlarını güncelle"""
+        db = SessionLocal()
+        try:
+            db.query(ImportExportJob).filter(ImportExportJob.job_id == job_id).update(
+                fields, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """İşin güncel durumunu döndür"""
+        db = SessionLocal()
+        try:
+            job = db.get(ImportExportJob, job_id)
+            return self._with_live_counts(job_to_dict(job)) if job else None
+        finally:
+            db.close()
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Son oluşturulan işleri döndür"""
+        db = SessionLocal()
+        try:
+            jobs = db.query(ImportExportJob).order_by(ImportExportJob.created_at.desc()).limit(limit).all()
+            return [self._with_live_counts(job_to_dict(job)) for job in jobs]
+        finally:
+            db.close()
+
+    def _with_live_counts(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Çalışan işin kayıttaki sayaçlarını bellekteki güncel değerlerle değiştir"""
+        with self._lock:
+            progress = self._active.get(job["job_id"])
+        if progress is not None and job["status"] == "running":
+            job.update(progress.counts())
+            job["percent"] = completion_percent(job)
+        return job
+
+    def artifact(self, job_id: str) -> Optional[Dict[str, str]]:
+        """Tamamlanmış dışa aktarma işinin çıktı dosyası bilgisini döndür"""
+        db = SessionLocal()
+        try:
+            job = db.get(ImportExportJob, job_id)
+            if job is None or job.kind != "export" or job.status != "completed" or not job.artifact_path:
+                return None
+            if not os.path.exists(job.artifact_path):
+                return None
+            return {
+                "path": job.artifact_path,
+                "filename": job.filename,
+                "media_type": EXPORT_FORMATS[job.format]["media_type"],
+            }
+        finally:
+            db.close()
+
+    def delete(self, job_id: str) -> Optional[bool]:
+        """Bitmiş işi ve dosyalarını sil (iş yoksa None, henüz bitmediyse False döner)"""
+        db = SessionLocal()
+        try:
+            job = db.get(ImportExportJob, job_id)
+            if job is None:
+                return None
+            if job.status in ("queued", "running"):
+                return False
+            self._remove_file(job.artifact_path)
+            db.delete(job)
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+    def recover_interrupted(self) -> int:
+        """Süreç yeniden başladığında yarım kalan işleri başarısız olarak işaretle"""
+        db = SessionLocal()
+        try:
+            interrupted = db.query(ImportExportJob).filter(ImportExportJob.status.in_(("queued", "running"))).all()
+            for job in interrupted:
+                if job.kind == "import":
+                    self._remove_file(job.artifact_path)
+                job.status = "failed"
+                job.message = "Sunucu yeniden başlatıldığı için iş yarıda kaldı"
+                job.finished_at = datetime.utcnow()
+            db.commit()
+            if interrupted:
+                logger.warning("%d yarım kalmış iş başarısız olarak işaretlendi", len(interrupted))
+            return len(interrupted)
+        finally:
+            db.close()
+
+    # --- İş gönderme ---
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise JobQueueFull("İş kuyruğu dolu, daha sonra tekrar deneyin")
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        os.makedirs(self.storage_dir, exist_ok=True)
+        return os.path.join(self.storage_dir, f"{job_id}{suffix}")
+
+    @staticmethod
+    def _remove_file(path: Optional[str]) -> None:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def _create(self, job_id: str, **fields: Any) -> ImportExportJob:
+        db = SessionLocal()
+        try:
+            job = ImportExportJob(job_id=job_id, status="queued", **fields)
+            db.add(job)
+            db.commit()
+            return job
+        finally:
+            db.close()
+
+    def submit_import(self, format: str, source, filename: Optional[str], total_bytes: Optional[int],
+                      replace_existing: bool = False,
+                      on_success: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Yüklenen dosyayı iş dizinine kopyala ve içe aktarma işini kuyruğa al"""
+        self._reserve()
+        job_id = uuid.uuid4().hex
+        path = None
+        try:
+            path = self._path(job_id, ".upload")
+            with open(path, "wb") as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+
+            self._create(
+                job_id, kind="import", format=format, filename=filename, replace_existing=replace_existing,
+                total_bytes=total_bytes or os.path.getsize(path), artifact_path=path,
+            )
+            compression = split_upload_name(filename)[1]
+            self.executor.submit(
+                self._run, job_id, self._run_import, job_id, format, replace_existing, on_success, compression
+            )
+        except Exception:
+            self._release()
+            self._remove_file(path)
+            raise
+        return self.get(job_id)
+
+    def submit_export(self, format: str, options: Optional[ExportOptions] = None) -> Dict[str, Any]:
+        """Dışa aktarma işini (isteğe bağlı sütun seçimi ve filtrelerle) kuyruğa al"""
+        self._reserve()
+        job_id = uuid.uuid4().hex
+        try:
+            self._create(job_id, kind="export", format=format, filename=f"checklist_data{EXPORT_FORMATS[format]['extension']}")
+            self.executor.submit(self._run, job_id, self._run_export, job_id, format, options)
+        except Exception:
+            self._release()
+            raise
+        return self.get(job_id)
+
+    # --- Çalıştırma ---
+
+    def _track(self, progress: JobProgress) -> JobProgress:
+        with self._lock:
+            self._active[progress.import_id] = progress
+        return progress
+
+    def _finish(self, job_id: str, **fields: Any) -> None:
+        """İşin son durumunu kaydet; veritabanı geçici olarak kilitliyse yeniden dene"""
+        for attempt in range(JOB_FINISH_ATTEMPTS):
+            try:
+                self.save(job_id, **fields)
+                return
+            except OperationalError:
+                if attempt == JOB_FINISH_ATTEMPTS - 1:
+                    logger.exception("İş sonucu kaydedilemedi: %s", job_id)
+                    return
+                time.sleep(JOB_FINISH_RETRY_DELAY)
+
+    def _run(self, job_id: str, work: Callable, *args: Any) -> None:
+        try:
+            self.save(job_id, status="running", started_at=datetime.utcnow())
+            fields = work(*args)
+            self._finish(job_id, finished_at=datetime.utcnow(), **fields)
+        except Exception as e:
+            logger.exception("Arka plan işi başarısız: %s", job_id)
+            self._finish(job_id, status="failed", message=str(e), finished_at=datetime.utcnow())
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+            self._release()
+
+    def _run_import(self, job_id: str, format: str, replace_existing: bool,
+                    on_success: Optional[Callable[[Dict[str, Any]], None]],
+                    compression: Optional[str] = None) -> Dict[str, Any]:
+        path = self._path(job_id, ".upload")
+        progress = self._track(JobProgress(self, job_id, total_bytes=os.path.getsize(path)))
+        # Her parça ayrı commit edilir; yazma kilidi etkileşimli istekleri uzun süre bekletmez
+        importer = DataImportExport(commit_batches=True)
+        import_stream = importer.import_from_json_stream if format == "json" else importer.import_from_csv_stream
+
+        try:
+            with open(path, "rb") as source:
+                result = import_stream(open_upload(source, compression), replace_existing, progress)
+        finally:
+            self._remove_file(path)
+
+        fields = {
+            **progress.counts(),
+            "artifact_path": None,
+            "error_count": len(result["errors"]),
+            "errors": json.dumps(result["errors"], ensure_ascii=False),
+        }
+        if not result["success"]:
+            # Önceki parçalar commit edilmiş olabilir; kaç kaydın yazıldığı mesajda belirtilir
+            message = f"{result['error']} ({progress.snapshot()['imported_count']} kayıt içe aktarılmıştı)"
+            return {**fields, "status": "failed", "message": message}
+
+        if on_success is not None:
+            on_success(result)
+        return {
+            **fields,
+            "status": "completed",
+            "imported_count": result["imported_count"],
+            "skipped_count": result["skipped_count"],
+            "message": result["message"],
+        }
+
+    def _run_export(self, job_id: str, format: str, options: Optional[ExportOptions] = None) -> Dict[str, Any]:
+        exporter = DataImportExport()
+        try:
+            count_query = exporter.db.query(func.count(ChecklistItem.item_id))
+            if options is not None:
+                count_query = options.apply(count_query)
+            self.save(job_id, total_rows=count_query.scalar())
+
+            progress = self._track(JobProgress(self, job_id))
+            chunks = exporter.iter_export(format, progress=progress, options=options)
+            path = self._path(job_id, EXPORT_FORMATS[format]["extension"])
+            partial = path + ".part"
+
+            try:
+                with open(partial, "wb") as target:
+                    if format == "csv":
+                        # Excel uyumluluğu için BOM (doğrudan indirme ile aynı çıktı)
+                        target.write(codecs.BOM_UTF8)
+                    for chunk in chunks:
+                        target.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+                os.replace(partial, path)
+            finally:
+                self._remove_file(partial)
+
+            return {
+                **progress.counts(),
+                "status": "completed",
+                "artifact_path": path,
+                "message": f"{progress.rows_read} kayıt dışa aktarıldı",
+            }
+        finally:
+            # Sayım sorgusu ya da hazırlık hata verse de oturum havuza geri verilir
+            exporter.close()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"workers": self.workers, "queue_limit": self.queue_limit, "pending": self._pending}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# Uygulama genelinde paylaşılan iş yöneticisi
+job_manager = JobManager()
@@ -1,55 +1,280 @@
+import atexit
+import contextvars
+import glob
+import gzip
+import itertools
+import json
 import logging
-import sys
-from datetime import datetime
+import logging.handlers
 import os
+import queue
+import shutil
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Log dizini ve ayarları
+log_dir = os.getenv("LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Dosya bu boyuta ulaşınca gün dolmadan da döndürülür (bayt)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+# Saklanacak sıkıştırılmış eski dosya sayısı (dosya türü başına)
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "14"))
+# Başarılı ve hızlı isteklerin erişim loguna yazılma oranı (hatalı/yavaş istekler her zaman yazılır)
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+ACCESS_LOG_SLOW_MS = float(os.getenv("ACCESS_LOG_SLOW_MS", "500"))
+# Konsola JSON yerine okunabilir metin yazmak için LOG_CONSOLE_FORMAT=text
+LOG_CONSOLE_FORMAT = os.getenv("LOG_CONSOLE_FORMAT", "json")
+# uvicorn CLI'nin kendi handler'larını kaldırıp kayıtlarını bu yapılandırmaya yönlendirmek için
+# LOG_TAKEOVER_UVICORN=true (varsayılan kapalı; barındıran sürecin handler'larına dokunulmaz)
+LOG_TAKEOVER_UVICORN = os.getenv("LOG_TAKEOVER_UVICORN", "false").lower() in ("1", "true", "yes")
+
+# Log formatı (metin konsol çıktısı için)
+log_format = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+
+ACCESS_LOGGER_NAME = "nuclear_checklist_access"
+
+# İstek kimliği; istek boyunca tüm log kayıtlarına eklenir
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+# LogRecord'un standart alanları (JSON çıktısına "extra" olarak eklenmez)
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Kayda çağıran bağlamdaki istek kimliğini ekle (kuyruğa koymadan önce çalışır)"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class AccessLogSampler:
+    """Erişim kayıtlarını örnekle: hatalı ve yavaş istekler her zaman, diğerleri belirli oranda yazılır
+
+    Karar log kaydı oluşturulmadan önce verilir; atlanan istekler için kayıt maliyeti oluşmaz.
+    """
+
+    def __init__(self, rate: float = ACCESS_LOG_SAMPLE_RATE, slow_ms: float = ACCESS_LOG_SLOW_MS):
+        self.slow_ms = slow_ms
+        self.every = max(int(round(1 / rate)), 1) if rate > 0 else 0
+        self._counter = itertools.count()
+
+    def sample_rate(self, status: int, duration_ms: float):
+        """Kayıt yazılacaksa örnekleme oranını, atlanacaksa None döndür"""
+        if status >= 400 or duration_ms >= self.slow_ms:
+            return 1.0
+        if not self.every or next(self._counter) % self.every:
+            return None
+        return 1 / self.every
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON olarak biçimlendir"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class CompressingRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """Gece yarısında veya boyut sınırında döndürülen, eski dosyaları gzip ile sıkıştıran dosya handler'ı"""
+
+    def __init__(self, filename, max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT,
+                 encoding="utf-8"):
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rollover_at = self._next_midnight()
+
+    @staticmethod
+    def _next_midnight() -> float:
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        return time.mktime(tomorrow.timetuple())
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            return True
+        if self.max_bytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.stream.tell() >= self.max_bytes:
+                return True
+        return False
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            target = f"{self.baseFilename}.{stamp}"
+            suffix = 1
+            while os.path.exists(target + ".gz"):
+                target = f"{self.baseFilename}.{stamp}-{suffix}"
+                suffix += 1
+            os.replace(self.baseFilename, target)
+            with open(target, "rb") as source, gzip.open(target + ".gz", "wb") as compressed:
+                shutil.copyfileobj(source, compressed)
+            os.remove(target)
+
+        if self.backup_count > 0:
+            backups = sorted(glob.glob(glob.escape(self.baseFilename) + ".*.gz"), key=os.path.getmtime)
+            for old in backups[:-self.backup_count]:
+                os.remove(old)
+
+        self.rollover_at = self._next_midnight()
+        self.stream = self._open()
 
-# Log dizinini oluştur
-log_dir = "logs"
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
 
-# Log formatı
-log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Kaydı biçimlendirmeden kuyruğa koy; biçimlendirme dinleyici iş parçacığında yapılır"""
+
+    def prepare(self, record):
+        return record
+
+
+def _text_formatter() -> logging.Formatter:
+    formatter = logging.Formatter(log_format)
+    formatter.default_msec_format = "%s.%03d"
+    return formatter
+
 
 # Ana logger yapılandırması
 def setup_logging():
-    """Loglama sistemini yapılandır"""
-    
+    """Loglama sistemini yapılandır
+
+    Uygulama iş parçacıkları kayıtları yalnızca bellek içi kuyruğa koyar; konsol
+    ve dosya yazımı ile JSON biçimlendirme ayrı bir dinleyici iş parçacığında yapılır.
+    """
+    global _listener
+
     # Root logger
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    
+    if _listener is not None:
+        return logger
+    logger.setLevel(LOG_LEVEL)
+
+    os.makedirs(log_dir, exist_ok=True)
+    json_formatter = JsonFormatter()
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter(log_format)
-    console_handler.setFormatter(console_formatter)
-    
-    # File handler - genel loglar
-    file_handler = logging.FileHandler(
-        f"{log_dir}/nuclear_checklist_{datetime.now().strftime('%Y%m%d')}.log",
-        encoding='utf-8'
-    )
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter(log_format)
-    file_handler.setFormatter(file_formatter)
-    
+    console_handler.setLevel(LOG_LEVEL)
+    console_handler.setFormatter(_text_formatter() if LOG_CONSOLE_FORMAT == "text" else json_formatter)
+
+    # File handler - genel loglar (JSON satırları)
+    file_handler = CompressingRotatingFileHandler(os.path.join(log_dir, "nuclear_checklist.log"))
+    file_handler.setLevel(LOG_LEVEL)
+    file_handler.setFormatter(json_formatter)
+
     # Error file handler - sadece hatalar
-    error_handler = logging.FileHandler(
-        f"{log_dir}/errors_{datetime.now().strftime('%Y%m%d')}.log",
-        encoding='utf-8'
-    )
+    error_handler = CompressingRotatingFileHandler(os.path.join(log_dir, "errors.log"))
     error_handler.setLevel(logging.ERROR)
-    error_formatter = logging.Formatter(log_format)
-    error_handler.setFormatter(error_formatter)
-    
-    # Handler'ları ekle
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    logger.addHandler(error_handler)
-    
+    error_handler.setFormatter(json_formatter)
+
+    # Handler'lar dinleyiciye, root logger'a yalnızca kuyruk handler'ı eklenir
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    # Yalnızca bu modülün önceden eklediği handler kaldırılır (pytest caplog, gunicorn vb. korunur)
+    _remove_own_handlers(logger)
+    logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, error_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    # Erişim kayıtları RequestLoggingMiddleware tarafından örneklenerek yazılır
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    if LOG_TAKEOVER_UVICORN:
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers.clear()
+            uvicorn_logger.propagate = True
+
     return logger
 
+def _remove_own_handlers(logger: logging.Logger) -> None:
+    for handler in list(logger.handlers):
+        if isinstance(handler, _QueueHandler):
+            logger.removeHandler(handler)
+
+def shutdown_logging():
+    """Kuyruktaki kayıtları yazıp dinleyiciyi durdur"""
+    global _listener
+    if _listener is not None and _listener._thread is not None:
+        _remove_own_handlers(logging.getLogger())
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+class RequestLoggingMiddleware:
+    """Her isteğe kimlik ata, yanıta X-Request-ID ekle ve erişim kaydı yaz (saf ASGI middleware)"""
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_access_logger()
+        self.sampler = AccessLogSampler()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            sample_rate = self.sampler.sample_rate(status_code, duration_ms)
+            if sample_rate is not None and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "%s %s %s", scope["method"], scope["path"], status_code,
+                    extra={"method": scope["method"], "path": scope["path"], "status": status_code,
+                           "duration_ms": duration_ms, "sample_rate": sample_rate}
+                )
+            request_id_var.reset(token)
+
 # API işlemleri için özel logger
 def get_api_logger():
     """API işlemleri için logger"""
@@ -65,3 +290,7 @@ def get_db_logger():
     """Veritabanı işlemleri için logger"""
     return logging.getLogger("nuclear_checklist_db")
 
+# HTTP erişim kayıtları için logger
+def get_access_logger():
+    """Erişim kayıtları için logger (örneklenir)"""
+    return logging.getLogger(ACCESS_LOGGER_NAME)
@@ -1,15 +1,38 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from sqlalchemy import func, case, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, exists
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 from datetime import datetime
-import os
+import json
+import base64
 
 # Veri yönetimi rotalarını import et
 from data_management_routes import router as data_management_router
+from statistics_cache import statistics_cache, item_key
+from content_hash import content_hash
+from bootstrap import prepare_database
+from search_index import search_index
+from change_events import change_broker
+from jobs import job_manager
+from data_version import data_version, conditional_get, current_data_version
+import fast_json
+from auth import ensure_default_users, token_cache, user_cache
+from logging_config import setup_logging, RequestLoggingMiddleware
+from metrics import metrics_registry, instrument_engine, MetricsMiddleware
+from profiling import ProfilingMiddleware, router as profiling_router
+from history import status_history, record_items, router as history_router
+from compression import CompressionMiddleware
+from database import engine, async_engine, SessionLocal, get_db, get_async_db, pool_metrics
+from models import ChecklistItem, ChecklistItemTombstone
+
+# Loglama (kuyruk tabanlı, JSON satırları, döndürülen dosyalar)
+setup_logging()
 
 # FastAPI uygulaması
 app = FastAPI(
@@ -25,30 +48,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Request-ID", "Server-Timing", "X-Profile-Id", "ETag"],
 )
 
-# Veritabanı yapılandırması (SQLite kullanarak başlayalım, daha sonra MS SQL'e geçilebilir)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./nuclear_checklist.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# İstek başına örneklemeli profilleme (X-Profile başlığı veya PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
 
-Base = declarative_base()
+# Accept-Encoding'e göre gzip/zstd yanıt sıkıştırma (akış yanıtları dahil)
+app.add_middleware(CompressionMiddleware)
 
-# Veritabanı modeli
-class ChecklistItem(Base):
-    __tablename__ = "checklist_items"
-    
-    item_id = Column(Integer, primary_key=True, index=True)
-    category = Column(String(255), nullable=False, index=True)
-    sub_category = Column(String(255), nullable=False, index=True)
-    item_text = Column(Text, nullable=False)
-    standards = Column(Text, nullable=True)
-    status = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+# Rota bazında süre/boyut histogramları ve istek başına SQL sayısı
+app.add_middleware(MetricsMiddleware)
+
+# İstek kimliği ve örneklenmiş erişim kayıtları
+app.add_middleware(RequestLoggingMiddleware)
+
+# Her iki motordaki SQL ifadeleri metriklere işlenir
+instrument_engine(engine, "sync", metrics_registry)
+instrument_engine(async_engine.sync_engine, "async", metrics_registry)
+
+# Tabloları, şema yükseltmelerini, arama indeksini, veri sürümünü ve madde geçmişini hazırla
+prepare_database()
 
-# Tabloları oluştur
-Base.metadata.create_all(bind=engine)
+# Başka süreçlerin (ingestion CLI, diğer çalışanlar) yazmaları süreç içi önbellekleri geçersiz kılar
+data_version.on_external_change(statistics_cache.invalidate)
+data_version.on_external_change(search_index.invalidate)
+
+# Önceki süreçte yarım kalan arka plan işlerini kapat
+job_manager.recover_interrupted()
+
+# Kullanıcı deposu boşsa varsayılan kullanıcıları oluştur
+with SessionLocal() as _db:
+    ensure_default_users(_db)
 
 # Pydantic modelleri
 class ChecklistItemBase(BaseModel):
@@ -68,6 +99,20 @@ class ChecklistItemUpdate(BaseModel):
     standards: Optional[str] = None
     status: Optional[bool] = None
 
+class ChecklistItemBulkUpdate(BaseModel):
+    # Seçim: madde kimlikleri ve/veya birebir kategori/alt kategori filtresi
+    item_ids: Optional[List[int]] = Field(None, max_length=10000)
+    category: Optional[str] = None
+    sub_category: Optional[str] = None
+    # Güncellenecek alanlar (içerik özetini değiştirmeyen alanlar)
+    status: Optional[bool] = None
+    standards: Optional[str] = None
+    return_items: bool = False
+
+class ChecklistItemBulkUpdateResponse(BaseModel):
+    updated_count: int
+    items: Optional[List["ChecklistItemResponse"]] = None
+
 class ChecklistItemResponse(ChecklistItemBase):
     item_id: int
     created_at: datetime
@@ -76,13 +121,44 @@ class ChecklistItemResponse(ChecklistItemBase):
     class Config:
         from_attributes = True
 
-# Veritabanı bağımlılığı
-def get_db():
-    db = SessionLocal()
+# Hızlı serileştirme yolunda seçilen sütunlar (yanıt modelindeki alan sırasıyla)
+ITEM_RESPONSE_FIELDS = tuple(ChecklistItemResponse.model_fields)
+ITEM_RESPONSE_COLUMNS = tuple(getattr(ChecklistItem, name) for name in ITEM_RESPONSE_FIELDS)
+
+class DeletedItemResponse(BaseModel):
+    item_id: int
+    deleted_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class ChecklistChangesResponse(BaseModel):
+    items: List[ChecklistItemResponse]
+    deleted: List[DeletedItemResponse]
+    next_token: str
+    has_more: bool
+
+def _item_key(item):
+    """ORM nesnesinden istatistik önbelleği anahtarı oluştur"""
+    return item_key(item.category, item.sub_category, item.standards, item.status)
+
+def _publish_item(event_type: str, item):
+    """Bağlı istemcilere tek maddelik kısa değişiklik olayı gönder"""
+    change_broker.publish(
+        event_type,
+        item_id=item.item_id,
+        category=item.category,
+        sub_category=item.sub_category,
+        status=bool(item.status)
+    )
+
+async def _commit_unique(db: AsyncSession):
+    """Değişiklikleri kaydet; içerik özeti çakışırsa 409 döndür"""
     try:
-        yield db
-    finally:
-        db.close()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Aynı içerikte bir çeklist maddesi zaten mevcut")
 
 # API uç noktaları
 @app.get("/")
@@ -93,107 +169,467 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow()}
 
+@app.get("/health/database")
+async def database_health_check():
+    """Veritabanı bağlantı havuzu kullanım metriklerini getir"""
+    return pool_metrics()
+
+def _runtime_metrics():
+    """Bağlantı havuzu, önbellek, olay yayını ve iş kuyruğu durumunu metrik olarak üret"""
+    for pool_name, status in pool_metrics().items():
+        for key in ("checkedout", "overflow"):
+            if key in status:
+                yield f"db_pool_{key}_{pool_name}", "gauge", f"{pool_name} havuzu {key}", status[key]
+    cache = statistics_cache.metrics()
+    yield "statistics_cache_hits_total", "counter", "İstatistik önbelleği isabetleri", cache["hits"]
+    yield "statistics_cache_misses_total", "counter", "İstatistik önbelleği ıskalamaları", cache["misses"]
+    yield "sse_subscribers", "gauge", "Bağlı değişiklik akışı aboneleri", change_broker.subscriber_count
+    yield "jobs_pending", "gauge", "Kuyrukta ve çalışmakta olan arka plan işleri", job_manager.metrics()["pending"]
+    for cache_name, auth_cache in (("token", token_cache), ("user", user_cache)):
+        auth_metrics = auth_cache.metrics()
+        yield f"auth_{cache_name}_cache_hits_total", "counter", f"Kimlik doğrulama {cache_name} önbelleği isabetleri", auth_metrics["hits"]
+        yield f"auth_{cache_name}_cache_misses_total", "counter", f"Kimlik doğrulama {cache_name} önbelleği ıskalamaları", auth_metrics["misses"]
+        yield f"auth_{cache_name}_cache_size", "gauge", f"Kimlik doğrulama {cache_name} önbelleğindeki kayıt sayısı", auth_metrics["size"]
+
+metrics_registry.register_collector(_runtime_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metin biçiminde uygulama metrikleri"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.post("/checklist-items/", response_model=ChecklistItemResponse)
-async def create_checklist_item(item: ChecklistItemCreate, db: Session = Depends(get_db)):
+async def create_checklist_item(item: ChecklistItemCreate, db: AsyncSession = Depends(get_async_db)):
     """Yeni çeklist maddesi oluştur"""
     db_item = ChecklistItem(**item.dict())
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    version = await db.run_sync(data_version.bump)
+    await _commit_unique(db)
+    await db.refresh(db_item)
+    with data_version.publish(version) as in_order:
+        if in_order:
+            statistics_cache.item_added(_item_key(db_item))
+    search_index.item_upserted(db_item)
+    _publish_item("item_created", db_item)
     return db_item
 
-@app.get("/checklist-items/", response_model=List[ChecklistItemResponse])
+# Keyset (imleç) sayfalamada desteklenen sıralama anahtarları
+CURSOR_SORT_KEYS = {
+    "item_id": ("item_id",),
+    "category": ("category", "sub_category", "item_id"),
+}
+
+def _encode_token(payload) -> str:
+    """JSON yükünden URL güvenli opak belirteç oluştur"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_token(token: str):
+    """Opak belirteci çözüp JSON yükünü döndür"""
+    padded = token + '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+def _encode_cursor(sort: str, values) -> str:
+    """Sıralama anahtarı değerlerinden opak imleç oluştur"""
+    return _encode_token([sort, *values])
+
+def _decode_cursor(cursor: str, sort: str):
+    """Opak imleci çözüp sıralama anahtarı değerlerini döndür"""
+    try:
+        cursor_sort, *values = _decode_token(cursor)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Geçersiz imleç")
+    if cursor_sort != sort or len(values) != len(CURSOR_SORT_KEYS[sort]):
+        raise HTTPException(status_code=400, detail="İmleç bu sıralama ile uyumlu değil")
+    return values
+
+def _keyset_filter(columns, values):
+    """(a, b, c) > (x, y, z) karşılaştırmasını taşınabilir OR/AND ifadesine çevir"""
+    clauses = []
+    for position, column in enumerate(columns):
+        equals = [columns[i] == values[i] for i in range(position)]
+        clauses.append(and_(*equals, column > values[position]))
+    return or_(*clauses)
+
+@app.get("/checklist-items/", response_model=List[ChecklistItemResponse], dependencies=[Depends(conditional_get)])
 async def get_checklist_items(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
     category: Optional[str] = None,
     sub_category: Optional[str] = None,
     status: Optional[bool] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    sort: Literal["item_id", "category"] = "item_id",
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Çeklist maddelerini listele (filtreleme seçenekleri ile)"""
-    query = db.query(ChecklistItem)
+    """Çeklist maddelerini listele (filtreleme seçenekleri ile)
+    
+    ``cursor`` verildiğinde (ilk sayfa için boş) keyset sayfalama kullanılır ve
+    sonraki sayfanın imleci ``X-Next-Cursor`` başlığında döner. ``skip``/``limit``
+    ile offset sayfalama geriye dönük uyumluluk için çalışmaya devam eder.
+    Hızlı yol açıksa yalnızca yanıt sütunları demet olarak okunur ve ORM nesnesi
+    ile yanıt modeli doğrulaması atlanarak doğrudan JSON baytlarına çevrilir.
+    """
+    fast = fast_json.enabled("checklist_items")
+    query = select(*ITEM_RESPONSE_COLUMNS) if fast else select(ChecklistItem)
     
     if category:
-        query = query.filter(ChecklistItem.category.contains(category))
+        query = query.where(ChecklistItem.category.contains(category))
     if sub_category:
-        query = query.filter(ChecklistItem.sub_category.contains(sub_category))
+        query = query.where(ChecklistItem.sub_category.contains(sub_category))
     if status is not None:
-        query = query.filter(ChecklistItem.status == status)
+        query = query.where(ChecklistItem.status == status)
+    
+    if include_total:
+        response.headers["X-Total-Count"] = str(await _estimate_total(query, category, sub_category, status, db))
     
-    items = query.offset(skip).limit(limit).all()
+    async def fetch(statement):
+        if fast:
+            return (await db.execute(statement)).all()
+        return (await db.scalars(statement)).all()
+    
+    if cursor is None:
+        items = await fetch(query.offset(skip).limit(limit))
+    else:
+        sort_columns = [getattr(ChecklistItem, name) for name in CURSOR_SORT_KEYS[sort]]
+        if cursor:
+            query = query.where(_keyset_filter(sort_columns, _decode_cursor(cursor, sort)))
+        
+        # Bir fazla satır çekerek sonraki sayfanın varlığını anla
+        items = await fetch(query.order_by(*sort_columns).limit(limit + 1))
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            response.headers["X-Next-Cursor"] = _encode_cursor(
+                sort, [getattr(last, name) for name in CURSOR_SORT_KEYS[sort]]
+            )
+    
+    if fast:
+        return fast_json.rows_response(items, ITEM_RESPONSE_FIELDS, response)
     return items
 
-@app.get("/checklist-items/{item_id}", response_model=ChecklistItemResponse)
-async def get_checklist_item(item_id: int, db: Session = Depends(get_db)):
+async def _estimate_total(query, category, sub_category, status, db: AsyncSession) -> int:
+    """Toplam kayıt sayısını döndür; metin filtresi yoksa istatistik önbelleğinden okunur"""
+    if category or sub_category:
+        return await db.scalar(select(func.count()).select_from(query.subquery()))
+    
+    summary = await db.run_sync(lambda session: statistics_cache.summary(_statistics_loader(session)))
+    if status is None:
+        return summary["total_items"]
+    return summary["completed_items"] if status else summary["pending_items"]
+
+@app.get("/checklist-items/exists")
+async def checklist_item_exists(category: str, sub_category: str, item_text: str, db: AsyncSession = Depends(get_async_db)):
+    """Aynı içerikte bir çeklist maddesi olup olmadığını içerik özeti indeksi ile kontrol et"""
+    item_id = await db.scalar(select(ChecklistItem.item_id).where(
+        ChecklistItem.content_hash == content_hash(category, sub_category, item_text)
+    ))
+    return {"exists": item_id is not None, "item_id": item_id}
+
+@app.put("/checklist-items/upsert", response_model=ChecklistItemResponse)
+async def upsert_checklist_item(item: ChecklistItemCreate, db: AsyncSession = Depends(get_async_db)):
+    """Aynı içerikte madde varsa standart ve durumunu güncelle, yoksa yeni madde oluştur"""
+    db_item = await db.scalar(select(ChecklistItem).where(
+        ChecklistItem.content_hash == content_hash(item.category, item.sub_category, item.item_text)
+    ))
+    if db_item is None:
+        return await create_checklist_item(item, db)
+    
+    old_key = _item_key(db_item)
+    db_item.standards = item.standards
+    db_item.status = item.status
+    db_item.updated_at = datetime.utcnow()
+    version = await db.run_sync(data_version.bump)
+    await db.commit()
+    await db.refresh(db_item)
+    with data_version.publish(version) as in_order:
+        if in_order:
+            statistics_cache.item_changed(old_key, _item_key(db_item))
+    search_index.item_upserted(db_item)
+    _publish_item("item_updated", db_item)
+    return db_item
+
+def _differs(column, value):
+    """Sütun değeri verilen değerden farklı mı (NULL karşılaştırmaları dahil)"""
+    if value is None:
+        return column.is_not(None)
+    return or_(column != value, column.is_(None))
+
+@app.patch("/checklist-items/", response_model=ChecklistItemBulkUpdateResponse)
+async def bulk_update_checklist_items(bulk: ChecklistItemBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Birden çok çeklist maddesini tek bir UPDATE ile tek işlemde güncelle"""
+    conditions = []
+    if bulk.item_ids is not None:
+        conditions.append(ChecklistItem.item_id.in_(bulk.item_ids))
+    if bulk.category:
+        conditions.append(ChecklistItem.category == bulk.category)
+    if bulk.sub_category:
+        conditions.append(ChecklistItem.sub_category == bulk.sub_category)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="item_ids, category veya sub_category belirtilmelidir")
+    
+    values = bulk.dict(include={"status", "standards"}, exclude_unset=True)
+    if not values:
+        raise HTTPException(status_code=400, detail="Güncellenecek alan belirtilmedi (status, standards)")
+    
+    where = and_(*conditions)
+    # Yalnızca değeri gerçekten değişecek maddeler güncellenir (updated_at, geçmiş ve değişiklik akışı için)
+    changed = and_(where, or_(*(_differs(getattr(ChecklistItem, name), value) for name, value in values.items())))
+    
+    # İstatistik önbelleği için etkilenen grupları güncellemeden önce say
+    group_columns = (ChecklistItem.category, ChecklistItem.sub_category, ChecklistItem.standards, ChecklistItem.status)
+    groups = (await db.execute(
+        select(*group_columns, func.count(ChecklistItem.item_id)).where(changed).group_by(*group_columns)
+    )).all()
+    
+    now = datetime.utcnow()
+    result = await db.execute(
+        update(ChecklistItem).where(changed).values(**values, updated_at=now)
+    )
+    # Denetim kaydı güncelleme ile aynı işlemde, bu UPDATE'in damgaladığı maddeler için yazılır
+    recorded = await db.execute(record_items(and_(where, ChecklistItem.updated_at == now), "update", now))
+    version = await db.run_sync(data_version.bump)
+    await db.commit()
+    status_history.changes_recorded(recorded.rowcount)
+    
+    changes = []
+    for category, sub_category, standards, status, count in groups:
+        old_key = item_key(category, sub_category, standards, status)
+        new_key = item_key(
+            category, sub_category,
+            values.get("standards", standards),
+            values.get("status", status)
+        )
+        changes.append((old_key, new_key, count))
+    with data_version.publish(version) as in_order:
+        if in_order:
+            statistics_cache.groups_changed(changes)
+    if "standards" in values:
+        search_index.invalidate()
+    if result.rowcount:
+        change_broker.publish(
+            "items_updated",
+            count=result.rowcount,
+            categories=sorted({category for category, *_ in groups}),
+            item_ids=bulk.item_ids,
+            **values
+        )
+    
+    items = None
+    if bulk.return_items:
+        items = (await db.scalars(select(ChecklistItem).where(where).order_by(ChecklistItem.item_id))).all()
+    return {"updated_count": result.rowcount, "items": items}
+
+def _parse_change_token(token: str):
+    """Değişiklik belirtecinden (updated_at, item_id) ve (deleted_at, item_id) filigranlarını çöz"""
+    try:
+        payload = _decode_token(token)
+        return (
+            [datetime.fromisoformat(payload["u"]), payload["ui"]] if payload.get("u") else None,
+            [datetime.fromisoformat(payload["d"]), payload["di"]] if payload.get("d") else None,
+        )
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(status_code=400, detail="Geçersiz değişiklik belirteci")
+
+@app.get("/checklist-items/changes", response_model=ChecklistChangesResponse)
+async def get_checklist_item_changes(
+    since: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Filigrandan sonra eklenen/güncellenen maddeleri ve silinen madde izlerini getir
+    
+    ``since`` önceki yanıttaki ``next_token`` değeridir; ``updated_since`` ilk
+    senkronizasyon için zaman damgası olarak kullanılabilir. ``has_more`` true
+    olduğu sürece ``next_token`` ile devam edilir.
+    """
+    item_mark, tombstone_mark = _parse_change_token(since) if since else (None, None)
+    if updated_since is not None and item_mark is None:
+        item_mark = [updated_since, None]
+        tombstone_mark = [updated_since, None]
+    
+    def after(columns, mark):
+        if mark is None:
+            return None
+        if mark[1] is None:
+            return columns[0] > mark[0]
+        return _keyset_filter(columns, mark)
+    
+    item_columns = [ChecklistItem.updated_at, ChecklistItem.item_id]
+    items_query = select(ChecklistItem).order_by(*item_columns).limit(limit + 1)
+    item_filter = after(item_columns, item_mark)
+    if item_filter is not None:
+        items_query = items_query.where(item_filter)
+    items = (await db.scalars(items_query)).all()
+    
+    # Sonradan aynı item_id ile yeniden oluşturulan kayıtların izleri gönderilmez
+    tombstone_columns = [ChecklistItemTombstone.deleted_at, ChecklistItemTombstone.item_id]
+    tombstones_query = select(ChecklistItemTombstone).where(
+        ~exists().where(ChecklistItem.item_id == ChecklistItemTombstone.item_id)
+    ).order_by(*tombstone_columns).limit(limit + 1)
+    tombstone_filter = after(tombstone_columns, tombstone_mark)
+    if tombstone_filter is not None:
+        tombstones_query = tombstones_query.where(tombstone_filter)
+    tombstones = (await db.scalars(tombstones_query)).all()
+    
+    has_more = len(items) > limit or len(tombstones) > limit
+    items, tombstones = items[:limit], tombstones[:limit]
+    
+    if items:
+        item_mark = [items[-1].updated_at, items[-1].item_id]
+    if tombstones:
+        tombstone_mark = [tombstones[-1].deleted_at, tombstones[-1].item_id]
+    
+    next_token = _encode_token({
+        "u": item_mark[0].isoformat() if item_mark else None,
+        "ui": item_mark[1] if item_mark else None,
+        "d": tombstone_mark[0].isoformat() if tombstone_mark else None,
+        "di": tombstone_mark[1] if tombstone_mark else None,
+    })
+    return {"items": items, "deleted": tombstones, "next_token": next_token, "has_more": has_more}
+
+@app.get("/checklist-items/{item_id}", response_model=ChecklistItemResponse, dependencies=[Depends(conditional_get)])
+async def get_checklist_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
     """Belirli bir çeklist maddesini getir"""
-    item = db.query(ChecklistItem).filter(ChecklistItem.item_id == item_id).first()
+    item = await db.get(ChecklistItem, item_id)
     if item is None:
         raise HTTPException(status_code=404, detail="Çeklist maddesi bulunamadı")
     return item
 
 @app.put("/checklist-items/{item_id}", response_model=ChecklistItemResponse)
-async def update_checklist_item(item_id: int, item_update: ChecklistItemUpdate, db: Session = Depends(get_db)):
+async def update_checklist_item(item_id: int, item_update: ChecklistItemUpdate, db: AsyncSession = Depends(get_async_db)):
     """Çeklist maddesini güncelle"""
-    db_item = db.query(ChecklistItem).filter(ChecklistItem.item_id == item_id).first()
+    db_item = await db.get(ChecklistItem, item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Çeklist maddesi bulunamadı")
     
+    old_key = _item_key(db_item)
     update_data = item_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_item, field, value)
     
     db_item.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(db_item)
+    version = await db.run_sync(data_version.bump)
+    await _commit_unique(db)
+    await db.refresh(db_item)
+    with data_version.publish(version) as in_order:
+        if in_order:
+            statistics_cache.item_changed(old_key, _item_key(db_item))
+    search_index.item_upserted(db_item)
+    _publish_item("item_updated", db_item)
     return db_item
 
 @app.delete("/checklist-items/{item_id}")
-async def delete_checklist_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_checklist_item(item_id: int, db: AsyncSession = Depends(get_async_db)):
     """Çeklist maddesini sil"""
-    db_item = db.query(ChecklistItem).filter(ChecklistItem.item_id == item_id).first()
+    db_item = await db.get(ChecklistItem, item_id)
     if db_item is None:
         raise HTTPException(status_code=404, detail="Çeklist maddesi bulunamadı")
     
-    db.delete(db_item)
-    db.commit()
+    old_key = _item_key(db_item)
+    await db.delete(db_item)
+    # Delta senkronizasyon için silme izi (aynı işlem içinde)
+    await db.merge(ChecklistItemTombstone(item_id=item_id, deleted_at=datetime.utcnow()))
+    version = await db.run_sync(data_version.bump)
+    await db.commit()
+    with data_version.publish(version) as in_order:
+        if in_order:
+            statistics_cache.item_removed(old_key)
+    search_index.item_removed(item_id)
+    change_broker.publish("item_deleted", item_id=item_id, category=db_item.category, sub_category=db_item.sub_category)
     return {"message": "Çeklist maddesi başarıyla silindi"}
 
-@app.get("/categories/")
-async def get_categories(db: Session = Depends(get_db)):
+def _statistics_loader(db: Session):
+    """Önbellek yeniden oluşturulurken kullanılacak gruplanmış sayım sorgularını döndür"""
+    completed_expr = func.sum(case((ChecklistItem.status == True, 1), else_=0))
+    
+    def load():
+        group_rows = db.query(
+            ChecklistItem.category,
+            ChecklistItem.sub_category,
+            func.count(ChecklistItem.item_id),
+            completed_expr
+        ).group_by(ChecklistItem.category, ChecklistItem.sub_category).all()
+        
+        standard_rows = db.query(
+            ChecklistItem.standards,
+            func.count(ChecklistItem.item_id),
+            completed_expr
+        ).group_by(ChecklistItem.standards).all()
+        
+        return group_rows, standard_rows
+    
+    return load
+
+@app.get("/search/", dependencies=[Depends(current_data_version)])
+async def search_checklist_items(
+    q: str,
+    limit: int = Query(20, ge=1, le=200),
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Madde metni, standartlar ve kategoriler üzerinde sıralı tam metin arama (önek eşleşmeli)"""
+    results = await db.run_sync(lambda session: search_index.search(session, q, limit=limit, category=category))
+    return {
+        "backend": search_index.backend,
+        "results": results
+    }
+
+@app.get("/categories/", dependencies=[Depends(conditional_get)])
+async def get_categories(db: AsyncSession = Depends(get_async_db)):
     """Tüm kategorileri listele"""
-    categories = db.query(ChecklistItem.category).distinct().all()
-    return [cat[0] for cat in categories]
+    return await db.run_sync(lambda session: statistics_cache.categories(_statistics_loader(session)))
 
-@app.get("/sub-categories/")
-async def get_sub_categories(category: Optional[str] = None, db: Session = Depends(get_db)):
+@app.get("/sub-categories/", dependencies=[Depends(conditional_get)])
+async def get_sub_categories(category: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
     """Alt kategorileri listele (isteğe bağlı kategori filtresi ile)"""
-    query = db.query(ChecklistItem.sub_category)
-    if category:
-        query = query.filter(ChecklistItem.category == category)
-    sub_categories = query.distinct().all()
-    return [sub_cat[0] for sub_cat in sub_categories]
+    return await db.run_sync(lambda session: statistics_cache.sub_categories(_statistics_loader(session), category))
+
+@app.get("/statistics/", dependencies=[Depends(conditional_get)])
+async def get_statistics(breakdown: bool = False, db: AsyncSession = Depends(get_async_db)):
+    """Çeklist istatistiklerini getir (isteğe bağlı kategori/alt kategori/standart kırılımı ile)"""
+    if breakdown:
+        return await db.run_sync(lambda session: statistics_cache.breakdown(_statistics_loader(session)))
+    return await db.run_sync(lambda session: statistics_cache.summary(_statistics_loader(session)))
 
-@app.get("/statistics/")
-async def get_statistics(db: Session = Depends(get_db)):
-    """Çeklist istatistiklerini getir"""
-    total_items = db.query(ChecklistItem).count()
-    completed_items = db.query(ChecklistItem).filter(ChecklistItem.status == True).count()
-    pending_items = total_items - completed_items
+@app.get("/events/")
+async def stream_change_events(category: Optional[List[str]] = Query(None)):
+    """Değişiklik olaylarını Server-Sent Events ile yayınla (isteğe bağlı kategori filtresi ile)"""
+    subscriber = change_broker.subscribe(set(category) if category else None)
     
-    completion_rate = (completed_items / total_items * 100) if total_items > 0 else 0
+    async def events():
+        try:
+            async for chunk in change_broker.stream(subscriber):
+                yield chunk
+        finally:
+            change_broker.unsubscribe(subscriber)
     
-    return {
-        "total_items": total_items,
-        "completed_items": completed_items,
-        "pending_items": pending_items,
-        "completion_rate": round(completion_rate, 2)
-    }
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/events/metrics")
+async def get_change_event_metrics():
+    """Değişiklik yayını abone ve mesaj sayılarını getir"""
+    return change_broker.metrics()
+
+@app.get("/statistics/cache")
+async def get_statistics_cache_metrics():
+    """İstatistik önbelleğinin isabet/ıskalama metriklerini getir"""
+    return statistics_cache.metrics()
 
 # Veri yönetimi rotalarını ekle
 app.include_router(data_management_router)
+app.include_router(profiling_router)
+app.include_router(history_router)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Uvicorn logları da uygulamanın kuyruk tabanlı log hattından geçer
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
 
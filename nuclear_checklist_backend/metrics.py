@@ -0,0 +1,245 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# Yanıtlara Server-Timing başlığı eklensin mi (uygulama ve veritabanı süreleri)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+# Süre histogramı sınırları (saniye)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Yanıt boyutu histogramı sınırları (bayt)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+# İstek başına SQL ifadesi sayısı histogramı sınırları
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250)
+
+LabelValues = Tuple[str, ...]
+
+
+class RequestQueryStats:
+    """Tek bir isteğin çalıştırdığı SQL ifadesi sayısı ve toplam süresi"""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Aktif isteğin sorgu sayaçları (iş parçacığı havuzuna ve asenkron oturuma bağlamla taşınır)
+request_query_stats: contextvars.ContextVar = contextvars.ContextVar("request_query_stats", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Etiket değerleri bazında artan sayaç"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Gauge(Counter):
+    """Artıp azalabilen anlık değer"""
+
+    kind = "gauge"
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    """Sabit sınırlı, etiket değerleri bazında dağılım"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # etiketler -> [sınır başına sayılar..., toplam, adet]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted((labels, list(series)) for labels, series in self._values.items())
+        for labels, series in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(float(bound))
+                bucket_labels = _labels(self.labelnames, labels, 'le="%s"' % le)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(float(series[-2]))}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}"
+
+
+class MetricsRegistry:
+    """Uygulama metriklerini tutar ve Prometheus metin biçiminde sunar"""
+
+    def __init__(self):
+        self.requests = Counter(
+            "http_requests_total", "İşlenen HTTP istekleri", ("method", "route", "status"))
+        self.latency = Histogram(
+            "http_request_duration_seconds", "HTTP istek süreleri", ("method", "route"))
+        self.in_flight = Gauge("http_requests_in_flight", "Devam eden HTTP istekleri")
+        self.response_size = Histogram(
+            "http_response_size_bytes", "HTTP yanıt gövdesi boyutları", ("method", "route"), SIZE_BUCKETS)
+        self.request_queries = Histogram(
+            "http_request_db_queries", "İstek başına SQL ifadesi sayısı", ("method", "route"), QUERY_COUNT_BUCKETS)
+        self.request_db_seconds = Histogram(
+            "http_request_db_duration_seconds", "İstek başına SQL süresi", ("method", "route"))
+        self.queries = Counter("db_queries_total", "Çalıştırılan SQL ifadeleri", ("engine",))
+        self.query_seconds = Counter("db_query_duration_seconds_total", "SQL ifadelerinde geçen süre", ("engine",))
+        self._metrics = [
+            self.requests, self.latency, self.in_flight, self.response_size,
+            self.request_queries, self.request_db_seconds, self.queries, self.query_seconds,
+        ]
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, float]]]] = []
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, float]]]) -> None:
+        """Okuma anında (ad, tür, açıklama, değer) üreten ek metrik kaynağı ekle"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Tüm metrikleri Prometheus metin biçiminde döndür"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            for name, kind, documentation, value in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def instrument_engine(sync_engine, name: str, registry: "MetricsRegistry") -> None:
+    """Motorun her SQL ifadesini global ve istek bazlı sayaçlara işle"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        registry.queries.inc((name,))
+        registry.query_seconds.inc((name,), elapsed)
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        # Hata veren ifadenin başlangıç zamanını yığından at
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_start"):
+            connection.info["query_start"].pop()
+
+
+class MetricsMiddleware:
+    """Rota bazında süre, eşzamanlı istek, yanıt boyutu ve SQL sayısı ölçen saf ASGI middleware"""
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.registry = registry or metrics_registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        stats = RequestQueryStats()
+        token = request_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+        registry.in_flight.inc()
+
+        async def send_with_metrics(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    timing = (
+                        f'app;dur={elapsed_ms:.1f}, '
+                        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            labels = (method, route_path)
+
+            registry.in_flight.dec()
+            registry.requests.inc((method, route_path, str(status_code)))
+            registry.latency.observe(elapsed, labels)
+            registry.response_size.observe(response_bytes, labels)
+            registry.request_queries.observe(stats.count, labels)
+            registry.request_db_seconds.observe(stats.seconds, labels)
+            request_query_stats.reset(token)
+
+
+# Uygulama genelinde paylaşılan metrik kaydı
+metrics_registry = MetricsRegistry()
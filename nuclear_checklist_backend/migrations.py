@@ -0,0 +1,83 @@
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+
+from content_hash import content_hash
+
+logger = logging.getLogger("nuclear_checklist_db")
+
+
+def add_missing_columns(engine, table):
+    """Modelde olup veritabanı tablosunda olmayan sütunları ALTER TABLE ile ekle"""
+    existing = {column['name'] for column in inspect(engine).get_columns(table.name)}
+    missing = [column for column in table.columns if column.name not in existing]
+    
+    with engine.begin() as connection:
+        for column in missing:
+            column_ddl = CreateColumn(column).compile(dialect=engine.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD {column_ddl}"))
+            logger.info("Sütun eklendi: %s.%s", table.name, column.name)
+    
+    return [column.name for column in missing]
+
+
+def backfill_content_hash(engine, table, batch_size=1000):
+    """content_hash değeri boş olan kayıtları parça parça doldur
+    
+    Aynı içeriğe sahip eski kayıtlardan yalnızca en küçük item_id'li olana
+    özet yazılır; diğerleri benzersiz indeksi bozmamak için NULL bırakılır.
+    """
+    with engine.begin() as connection:
+        seen = set(connection.execute(
+            text(f"SELECT content_hash FROM {table.name} WHERE content_hash IS NOT NULL")
+        ).scalars())
+        
+        filled = 0
+        duplicates = 0
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                text(
+                    f"SELECT item_id, category, sub_category, item_text FROM {table.name} "
+                    f"WHERE content_hash IS NULL AND item_id > :last_id ORDER BY item_id"
+                ),
+                {"last_id": last_id}
+            ).fetchmany(batch_size)
+            if not rows:
+                break
+            
+            updates = []
+            for item_id, category, sub_category, item_text in rows:
+                digest = content_hash(category, sub_category, item_text)
+                if digest in seen:
+                    duplicates += 1
+                    continue
+                seen.add(digest)
+                updates.append({"item_id": item_id, "content_hash": digest})
+            
+            if updates:
+                connection.execute(
+                    text(f"UPDATE {table.name} SET content_hash = :content_hash WHERE item_id = :item_id"),
+                    updates
+                )
+                filled += len(updates)
+            last_id = rows[-1][0]
+    
+    if filled or duplicates:
+        logger.info("content_hash dolduruldu: %d kayıt, %d tekrar eden kayıt atlandı", filled, duplicates)
+    return {"filled": filled, "duplicates": duplicates}
+
+
+def create_missing_indexes(engine, table):
+    """Mevcut veritabanlarında sonradan eklenen indeksleri oluştur"""
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def upgrade_schema(engine, table):
+    """Tabloyu modelle uyumlu hale getir: eksik sütunlar, veri doldurma ve indeksler"""
+    add_missing_columns(engine, table)
+    if 'content_hash' in table.columns:
+        backfill_content_hash(engine, table)
+    create_missing_indexes(engine, table)
@@ -0,0 +1,118 @@
+from sqlalchemy import event, text, Column, Integer, String, Boolean, DateTime, Text, Index, LargeBinary
+from datetime import datetime
+
+from database import Base
+from content_hash import set_content_hash, update_content_hash
+
+# Veritabanı modeli (tüm modüllerin paylaştığı tek eşleme)
+class ChecklistItem(Base):
+    __tablename__ = "checklist_items"
+    
+    item_id = Column(Integer, primary_key=True, index=True)
+    category = Column(String(255), nullable=False, index=True)
+    sub_category = Column(String(255), nullable=False, index=True)
+    item_text = Column(Text, nullable=False)
+    standards = Column(Text, nullable=True)
+    status = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Değişiklik akışı (delta senkronizasyon) updated_at üzerinden indekslenir
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # (kategori, alt kategori, madde metni) özeti - tekrar kontrolü indeks üzerinden yapılır
+    content_hash = Column(String(32), nullable=True)
+    
+    __table_args__ = (
+        # İstatistik kırılımındaki GROUP BY sorgusunu kapsayan bileşik indeks
+        Index("ix_checklist_items_category_sub_category_status", "category", "sub_category", "status"),
+        # (category, sub_category, item_id) sıralı keyset sayfalama için
+        Index("ix_checklist_items_category_sub_category_item_id", "category", "sub_category", "item_id"),
+        Index(
+            "ux_checklist_items_content_hash", "content_hash", unique=True,
+            sqlite_where=text("content_hash IS NOT NULL"),
+            mssql_where=text("content_hash IS NOT NULL")
+        ),
+    )
+
+event.listen(ChecklistItem, "before_insert", set_content_hash)
+event.listen(ChecklistItem, "before_update", update_content_hash)
+
+# Silinen maddelerin izleri (delta senkronizasyonda silmeleri istemcilere bildirmek için)
+class ChecklistItemTombstone(Base):
+    __tablename__ = "checklist_item_tombstones"
+    
+    item_id = Column(Integer, primary_key=True)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+# Madde değişikliklerinin salt eklemeli denetim kaydı (her yazma ile aynı işlemde yazılır)
+class ChecklistItemHistory(Base):
+    __tablename__ = "checklist_item_history"
+    
+    history_id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, nullable=False)
+    changed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    change_type = Column(String(10), nullable=False)  # baseline | create | update | delete
+    # Değişiklik sonrası madde durumu (silmelerde boş)
+    category = Column(String(255), nullable=True)
+    sub_category = Column(String(255), nullable=True)
+    item_text = Column(Text, nullable=True)
+    standards = Column(Text, nullable=True)
+    status = Column(Boolean, nullable=True)
+    
+    __table_args__ = (
+        # Madde bazında denetim izi ve zaman noktası sorguları için
+        Index("ix_checklist_item_history_item_id_changed_at", "item_id", "changed_at"),
+        # Kontrol noktası ve zaman noktası sorgularında zaman aralığı seçimi için
+        Index("ix_checklist_item_history_changed_at", "changed_at"),
+    )
+
+# Geçmişin created_at anındaki özeti: her madde için geçerli geçmiş kaydının kimliği (sıkıştırılmış)
+class ChecklistHistoryCheckpoint(Base):
+    __tablename__ = "checklist_history_checkpoints"
+    
+    checkpoint_id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    last_history_id = Column(Integer, nullable=False)
+    item_count = Column(Integer, nullable=False)
+    payload = Column(LargeBinary, nullable=False)
+
+# Çeklist verisinin kalıcı sürüm sayacı (tek satır; her yazma ile aynı işlemde artırılır)
+class DataVersionState(Base):
+    __tablename__ = "data_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    # Veritabanı oluşturulduğunda üretilen önek; veritabanı değiştirilirse eski ETag'ler geçersiz olur
+    token = Column(String(32), nullable=False)
+
+# Arka planda çalışan içe/dışa aktarma işleri (durum sorgulama ve sonuç indirme için kalıcı kayıt)
+class ImportExportJob(Base):
+    __tablename__ = "import_export_jobs"
+    
+    job_id = Column(String(32), primary_key=True)
+    kind = Column(String(20), nullable=False)  # import | export
+    format = Column(String(10), nullable=False)  # json | csv
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    filename = Column(String(255), nullable=True)
+    replace_existing = Column(Boolean, default=False)
+    total_bytes = Column(Integer, nullable=True)
+    bytes_read = Column(Integer, default=0)
+    total_rows = Column(Integer, nullable=True)
+    rows_read = Column(Integer, default=0)
+    imported_count = Column(Integer, default=0)
+    skipped_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    errors = Column(Text, nullable=True)  # JSON listesi
+    message = Column(Text, nullable=True)
+    artifact_path = Column(String(512), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+# Uygulama kullanıcıları (kimlik doğrulama katmanının kullanıcı deposu)
+class User(Base):
+    __tablename__ = "users"
+    
+    username = Column(String(100), primary_key=True)
+    hashed_password = Column(String(255), nullable=False)
+    role = Column(String(20), nullable=False, default="user")
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,394 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool as _run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from jose import JWTError
+
+from auth import decode_token, get_current_admin_user
+from metrics import request_query_stats
+
+# Başlık olmadan da profillenecek isteklerin oranı (0 = yalnızca başlıkla istenenler)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Örnekleme aralığı (milisaniye)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+# Bellekte tutulan son profil raporu sayısı
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "100"))
+# Raporların JSON olarak yazılacağı dizin (boşsa yalnızca bellekte tutulur)
+PROFILE_DIR = os.getenv("PROFILE_DIR", "")
+# Örnek başına kaydedilen en fazla çağrı derinliği
+PROFILE_MAX_DEPTH = int(os.getenv("PROFILE_MAX_DEPTH", "96"))
+
+# Admin token'ı ile birlikte gönderildiğinde isteği profiller
+PROFILE_HEADER = b"x-profile"
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+# Uygulama dizinindeki ama isteğin kendisine ait olmayan (middleware) modüller
+_FRAMEWORK_MODULES = {_APP_DIR + name for name in ("profiling.py", "metrics.py", "logging_config.py")}
+
+# Süre dağılımı kategorileri: dosya yolu parçaları (içteki çerçeveden dışa doğru ilk eşleşen kazanır)
+_SQL_PATHS = ("/sqlite3/", "/aiosqlite/", "/sqlalchemy/engine/", "/sqlalchemy/dialects/",
+              "/sqlalchemy/pool/", "/pyodbc", "/aioodbc/", "/pymssql")
+_ORM_PATHS = ("/sqlalchemy/orm/", "/sqlalchemy/sql/", "/sqlalchemy/ext/")
+_SERIALIZATION_PATHS = ("/json/", "/pydantic/", "/pydantic_core/", "/fastapi/encoders.py",
+                        "/starlette/responses.py", "/fastapi/responses.py")
+_SERIALIZATION_FUNCTIONS = {"serialize_response", "_prepare_response_content", "jsonable_encoder"}
+CATEGORIES = ("sql", "orm", "serialization", "handler", "framework")
+
+# Aktif isteğin profili (iş parçacığı havuzuna run_in_threadpool ile taşınır)
+active_profile: contextvars.ContextVar = contextvars.ContextVar("active_profile", default=None)
+
+
+def _classify(stack) -> str:
+    for code in stack:
+        filename = code.co_filename
+        if any(part in filename for part in _SQL_PATHS):
+            return "sql"
+        if any(part in filename for part in _ORM_PATHS):
+            return "orm"
+        if code.co_name in _SERIALIZATION_FUNCTIONS or any(part in filename for part in _SERIALIZATION_PATHS):
+            return "serialization"
+        if filename.startswith(_APP_DIR) and filename not in _FRAMEWORK_MODULES and os.sep + "venv" + os.sep not in filename:
+            return "handler"
+    return "framework"
+
+
+def _frame_name(code) -> str:
+    filename = code.co_filename
+    if "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    elif filename.startswith(_APP_DIR):
+        filename = filename[len(_APP_DIR):]
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{code.co_name}:{code.co_firstlineno}"
+
+
+class RequestProfile:
+    """Tek bir isteğin örneklenen çağrı yığınları"""
+
+    def __init__(self, method: str, path: str, reason: str):
+        self.profile_id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.route = None
+        self.status_code = None
+        self.started_at = datetime.utcnow()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+        # İstek adına iş parçacığı havuzunda çalışan iş parçacıkları -> iç içe çağrı sayısı
+        self.threads: Dict[int, int] = {}
+        self.stacks: collections.Counter = collections.Counter()
+        self.ticks = 0
+        self.idle_ticks = 0
+        self.query_stats = request_query_stats.get()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def thread(self):
+        """Bloğu çalıştıran iş parçacığını bu isteğe ait say"""
+        ident = threading.get_ident()
+        with self._lock:
+            self.threads[ident] = self.threads.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self.threads[ident] == 1:
+                    del self.threads[ident]
+                else:
+                    self.threads[ident] -= 1
+
+    def sample(self, frames: Dict[int, Any]) -> None:
+        """Örnekleyici iş parçacığından: isteğe ait çalışan yığınları kaydet"""
+        sampled = False
+        if asyncio.current_task(self.loop) is self.task:
+            sampled = self._record(frames.get(self.loop_thread))
+        with self._lock:
+            threads = list(self.threads)
+        for ident in threads:
+            sampled = self._record(frames.get(ident)) or sampled
+        self.ticks += 1
+        if not sampled:
+            self.idle_ticks += 1
+
+    def _record(self, frame) -> bool:
+        if frame is None:
+            return False
+        stack = []
+        while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        self.stacks[tuple(stack)] += 1
+        return True
+
+    def report(self, top: int = 30) -> Dict[str, Any]:
+        """Örneklerden süre dağılımı, en pahalı fonksiyonlar ve katlanmış yığınlar üret"""
+        per_tick_ms = self.duration * 1000 / self.ticks if self.ticks else 0.0
+        categories = dict.fromkeys(CATEGORIES, 0)
+        own: collections.Counter = collections.Counter()
+        cumulative: collections.Counter = collections.Counter()
+        folded = []
+        for stack, count in self.stacks.most_common():
+            categories[_classify(stack)] += count
+            names = [_frame_name(code) for code in stack]
+            own[names[0]] += count
+            for name in set(names):
+                cumulative[name] += count
+            folded.append((";".join(reversed(names)), count))
+
+        samples = sum(categories.values())
+
+        def timing(count: int) -> Dict[str, Any]:
+            return {
+                "samples": count,
+                "ms": round(count * per_tick_ms, 2),
+                "percent": round(count / samples * 100, 2) if samples else 0,
+            }
+
+        stats = self.query_stats
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "reason": self.reason,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 2),
+            "interval_ms": PROFILE_INTERVAL_MS,
+            "samples": samples,
+            # İsteğin hiçbir iş parçacığında çalışmadığı süre (asenkron SQL sürücüsü, G/Ç, diğer istekler)
+            "waiting_ms": round(self.idle_ticks * per_tick_ms, 2),
+            "sql_queries": stats.count if stats else None,
+            "sql_wall_ms": round(stats.seconds * 1000, 2) if stats else None,
+            "categories": {name: timing(count) for name, count in categories.items()},
+            "top_self": [{"function": name, **timing(count)} for name, count in own.most_common(top)],
+            "top_cumulative": [{"function": name, **timing(count)} for name, count in cumulative.most_common(top)],
+            "folded": folded,
+        }
+
+
+class SamplingProfiler:
+    """Profillenen isteklerin yığınlarını ayrı bir iş parçacığında periyodik olarak örnekleyen profiler
+
+    Profillenen istek yokken örnekleyici bekler; profilleme kapalıyken isteklere
+    eklenen maliyet yalnızca middleware'deki başlık kontrolüdür.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, keep: int = PROFILE_KEEP,
+                 storage_dir: str = PROFILE_DIR):
+        self.interval = interval_ms / 1000
+        self.storage_dir = storage_dir
+        self._active: List[RequestProfile] = []
+        self._finished: collections.deque = collections.deque()
+        self._reports: "collections.OrderedDict[str, Dict[str, Any]]" = collections.OrderedDict()
+        self._keep = keep
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.profiled_requests = 0
+
+    def start(self, method: str, path: str, reason: str) -> RequestProfile:
+        profile = RequestProfile(method, path, reason)
+        with self._lock:
+            self._active.append(profile)
+            self.profiled_requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return profile
+
+    def finish(self, profile: RequestProfile) -> None:
+        """Örneklemeyi durdur; rapor örnekleyici iş parçacığında oluşturulur"""
+        profile.duration = time.perf_counter() - profile.started
+        with self._lock:
+            self._active.remove(profile)
+            self._finished.append(profile)
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                active = list(self._active)
+            if active:
+                frames = sys._current_frames()
+                for profile in active:
+                    profile.sample(frames)
+                del frames
+                time.sleep(self.interval)
+            elif self._finished:
+                self._store(self._finished.popleft())
+            else:
+                self._wakeup.wait()
+                self._wakeup.clear()
+            # Uzun süren istekler sırasında biten kısa isteklerin raporları da bekletilmez
+            if active and self._finished:
+                self._store(self._finished.popleft())
+
+    def _store(self, profile: RequestProfile) -> None:
+        report = profile.report()
+        with self._lock:
+            self._reports[report["profile_id"]] = report
+            while len(self._reports) > self._keep:
+                self._reports.popitem(last=False)
+        if self.storage_dir:
+            os.makedirs(self.storage_dir, exist_ok=True)
+            path = os.path.join(self.storage_dir, f"{report['profile_id']}.json")
+            with open(path, "w", encoding="utf-8") as output:
+                json.dump(report, output, ensure_ascii=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._reports.get(profile_id)
+
+    def slowest(self, limit: int = 10, path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Bellekteki son raporlardan en yavaş istekleri (yığın ayrıntısı olmadan) döndür"""
+        with self._lock:
+            reports = list(self._reports.values())
+        if path:
+            reports = [report for report in reports if path in (report["path"], report["route"])]
+        reports.sort(key=lambda report: report["duration_ms"], reverse=True)
+        summary_fields = ("top_self", "top_cumulative", "folded")
+        return [
+            {key: value for key, value in report.items() if key not in summary_fields}
+            for report in reports[:limit]
+        ]
+
+
+def _bind(profile: RequestProfile, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with profile.thread():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+async def run_in_threadpool(func, *args, **kwargs):
+    """fastapi.concurrency.run_in_threadpool; istek profilleniyorsa iş parçacığı da örneklenir"""
+    profile = active_profile.get()
+    if profile is not None:
+        func = _bind(profile, func)
+    return await _run_in_threadpool(func, *args, **kwargs)
+
+
+def profiled_iterator(iterator: Iterator) -> Iterator:
+    """Akış yanıtlarının iş parçacığı havuzunda üretilen parçalarını da profile dahil et"""
+    profile = active_profile.get()
+    if profile is None:
+        return iterator
+
+    def generate():
+        while True:
+            with profile.thread():
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+            yield chunk
+
+    return generate()
+
+
+class ProfilingMiddleware:
+    """Admin başlığıyla istenen veya örneklenen istekleri profilleyen saf ASGI middleware
+
+    İstek ``X-Profile: 1`` başlığı ve admin Bearer token'ı ile gönderildiğinde ya da
+    ``PROFILE_SAMPLE_RATE`` oranında rastgele seçildiğinde profillenir; yanıta
+    raporun kimliği ``X-Profile-Id`` olarak eklenir.
+    """
+
+    def __init__(self, app, profiler: Optional[SamplingProfiler] = None, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.profiler = profiler or request_profiler
+        self.sample_rate = sample_rate
+
+    def _reason(self, scope) -> Optional[str]:
+        requested = authorization = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                requested = value
+            elif name == b"authorization":
+                authorization = value
+        if requested is not None and requested.lower() in (b"1", b"true", b"yes") and authorization:
+            scheme, _, token = authorization.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                try:
+                    if decode_token(token).get("role") == "admin":
+                        return "header"
+                except JWTError:
+                    pass
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        reason = self._reason(scope) if scope["type"] == "http" else None
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.profiler.start(scope["method"], scope["path"], reason)
+        token = active_profile.set(profile)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.profile_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.route = getattr(scope.get("route"), "path", None)
+            self.profiler.finish(profile)
+            active_profile.reset(token)
+
+
+# Uygulama genelinde paylaşılan profiler
+request_profiler = SamplingProfiler()
+
+router = APIRouter(prefix="/profiling", tags=["profiling"])
+
+
+@router.get("/requests")
+async def list_profiled_requests(limit: int = 10, path: Optional[str] = None,
+                                 current_user: dict = Depends(get_current_admin_user)):
+    """Son profillenen isteklerden en yavaş ``limit`` tanesini süre dağılımıyla listele"""
+    return {
+        "profiled_requests": request_profiler.profiled_requests,
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "requests": request_profiler.slowest(limit, path),
+    }
+
+
+@router.get("/requests/{profile_id}")
+async def get_profiled_request(profile_id: str, format: str = "json",
+                               current_user: dict = Depends(get_current_admin_user)):
+    """Profil raporunu getir; format=folded flame graph araçları için katlanmış yığınları döndürür"""
+    report = request_profiler.get(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profil raporu bulunamadı")
+    if format == "folded":
+        return PlainTextResponse("".join(f"{stack} {count}\n" for stack, count in report["folded"]))
+    return report
@@ -0,0 +1,317 @@
+import html
+import logging
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger("nuclear_checklist_db")
+
+# Aranan alanlar (FTS5 sütun sırası ve bm25 ağırlıkları ile aynı sırada)
+SEARCH_FIELDS = ("item_text", "standards", "category", "sub_category")
+FIELD_WEIGHTS = (1.0, 2.0, 0.5, 0.5)
+
+FTS_TABLE = "checklist_items_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(value: Optional[str]) -> str:
+    """Türkçe/İngilizce büyük-küçük harf ve aksan katlaması (I, ı, İ, i -> i; ç -> c, ş -> s ...)"""
+    if not value:
+        return ""
+    value = value.replace("İ", "i").replace("ı", "i").casefold()
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Metni katlanmış kelimelere böl"""
+    return _TOKEN_RE.findall(fold(value))
+
+
+def _sql_fold(column: str) -> str:
+    # FTS5 unicode61 tokenizer'ı noktasız ı harfini katlamaz; tetikleyicide i'ye çevrilir
+    return f"replace(replace(coalesce({column}, ''), 'ı', 'i'), 'İ', 'i')"
+
+
+def highlight(value: Optional[str], terms: List[str], width: int = 12,
+              start_mark: str = "<mark>", end_mark: str = "</mark>") -> Optional[str]:
+    """Eşleşen kelimeleri işaretleyerek ilk eşleşme çevresinden kısa bir özet üret
+
+    Terimler önek olarak eşleşir; işaretlenmeyen metin HTML olarak kaçışlanır.
+    """
+    if not value or not terms:
+        return None
+
+    tokens = list(_TOKEN_RE.finditer(value))
+    matched = [any(fold(token.group()).startswith(term) for term in terms) for token in tokens]
+    if not any(matched):
+        return None
+
+    first = matched.index(True)
+    start = max(0, first - width // 3)
+    end = min(len(tokens), start + width)
+
+    parts = ["…" if start > 0 else ""]
+    position = tokens[start].start()
+    for index in range(start, end):
+        token = tokens[index]
+        parts.append(html.escape(value[position:token.start()]))
+        if matched[index]:
+            parts.append(f"{start_mark}{html.escape(token.group())}{end_mark}")
+        else:
+            parts.append(html.escape(token.group()))
+        position = token.end()
+    if end < len(tokens):
+        parts.append("…")
+    else:
+        parts.append(html.escape(value[position:]))
+    return "".join(parts)
+
+
+class PythonSearchIndex:
+    """FTS5 bulunmadığında kullanılan, yazmalarla güncellenen bellek içi ters indeks (BM25)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Dict[str, float]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._doc_categories: Dict[int, str] = {}
+        self._sorted_terms: Optional[List[str]] = None
+        self._valid = False
+        self._generation = 0
+
+    def _remove(self, item_id: int) -> None:
+        for term in self._doc_terms.pop(item_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(item_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._sorted_terms = None
+        self._doc_lengths.pop(item_id, None)
+        self._doc_categories.pop(item_id, None)
+
+    def _add(self, item_id: int, fields: Dict[str, Any]) -> None:
+        weights: Dict[str, float] = defaultdict(float)
+        for field, weight in zip(SEARCH_FIELDS, FIELD_WEIGHTS):
+            for term in tokenize(fields.get(field)):
+                weights[term] += weight
+        self._doc_terms[item_id] = dict(weights)
+        self._doc_lengths[item_id] = sum(weights.values())
+        self._doc_categories[item_id] = fields.get("category")
+        for term, weight in weights.items():
+            if term not in self._postings:
+                self._sorted_terms = None
+            self._postings[term][item_id] = weight
+
+    def ensure(self, loader) -> None:
+        """İndeks geçersizse ``loader`` ile tüm kayıtlardan yeniden oluştur"""
+        with self._lock:
+            if self._valid:
+                return
+            generation = self._generation
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._doc_categories.clear()
+            self._sorted_terms = None
+            for row in loader():
+                self._add(row["item_id"], row)
+            self._valid = generation == self._generation
+
+    def item_upserted(self, item_id: int, fields: Dict[str, Any]) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                self._remove(item_id)
+                self._add(item_id, fields)
+
+    def item_removed(self, item_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                self._remove(item_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._valid = False
+
+    def _expand(self, term: str) -> List[str]:
+        """Önek eşleşmesi: sıralı terim listesinde ikili arama"""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        index = bisect_left(self._sorted_terms, term)
+        expanded = []
+        while index < len(self._sorted_terms) and self._sorted_terms[index].startswith(term):
+            expanded.append(self._sorted_terms[index])
+            index += 1
+        return expanded
+
+    def search(self, terms: List[str], limit: int, category: Optional[str] = None) -> List[Tuple[int, float]]:
+        """Tüm terimleri (önek olarak) içeren belgeleri BM25 puanına göre sırala"""
+        k1, b = 1.2, 0.75
+        with self._lock:
+            documents = len(self._doc_lengths)
+            if not documents:
+                return []
+            average_length = sum(self._doc_lengths.values()) / documents
+
+            scores: Optional[Dict[int, float]] = None
+            for term in terms:
+                term_scores: Dict[int, float] = defaultdict(float)
+                for expanded in self._expand(term):
+                    postings = self._postings[expanded]
+                    idf = math.log(1 + (documents - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for item_id, frequency in postings.items():
+                        norm = k1 * (1 - b + b * self._doc_lengths[item_id] / average_length)
+                        term_scores[item_id] += idf * frequency * (k1 + 1) / (frequency + norm)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {item_id: score + term_scores[item_id] for item_id, score in scores.items() if item_id in term_scores}
+                if not scores:
+                    return []
+
+            if category:
+                scores = {item_id: score for item_id, score in scores.items() if self._doc_categories.get(item_id) == category}
+            return sorted(scores.items(), key=lambda pair: (-pair[1], pair[0]))[:limit]
+
+
+class SearchIndex:
+    """SQLite'ta FTS5, diğer veritabanlarında bellek içi ters indeks ile tam metin arama"""
+
+    def __init__(self):
+        self.backend = "python"
+        self._python = PythonSearchIndex()
+        self._engine = None
+        self._table = None
+
+    def setup(self, engine, table) -> None:
+        """Arama altyapısını hazırla; SQLite FTS5 varsa sanal tablo ve tetikleyicileri oluştur"""
+        self._engine = engine
+        self._table = table
+        if engine.dialect.name != "sqlite":
+            return
+
+        fields = ", ".join(SEARCH_FIELDS)
+        new_values = ", ".join(_sql_fold(f"new.{field}") for field in SEARCH_FIELDS)
+        try:
+            with engine.begin() as connection:
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE}
+                ).first()
+                if not exists:
+                    connection.execute(text(
+                        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                        f"{fields}, tokenize = 'unicode61 remove_diacritics 2')"
+                    ))
+                    connection.execute(text(
+                        f"INSERT INTO {FTS_TABLE} (rowid, {fields}) "
+                        f"SELECT item_id, {', '.join(_sql_fold(field) for field in SEARCH_FIELDS)} FROM {table.name}"
+                    ))
+                    logger.info("FTS5 arama indeksi oluşturuldu: %s", FTS_TABLE)
+
+                # Tetikleyiciler ORM, toplu INSERT ve harici araçlarla yapılan tüm yazmaları kapsar
+                connection.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {table.name} BEGIN "
+                    f"INSERT INTO {FTS_TABLE} (rowid, {fields}) VALUES (new.item_id, {new_values}); END"
+                ))
+                connection.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {table.name} BEGIN "
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.item_id; END"
+                ))
+                connection.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {table.name} BEGIN "
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.item_id; "
+                    f"INSERT INTO {FTS_TABLE} (rowid, {fields}) VALUES (new.item_id, {new_values}); END"
+                ))
+            self.backend = "fts5"
+        except OperationalError as e:
+            # SQLite FTS5 olmadan derlenmişse bellek içi indekse geri dön
+            logger.warning("FTS5 kullanılamıyor, bellek içi arama indeksi kullanılacak: %s", e)
+
+    # --- Yazma bildirimleri (FTS5 tetikleyicilerle güncellendiği için yalnızca bellek içi indeks için) ---
+
+    def item_upserted(self, item) -> None:
+        if self.backend == "python":
+            self._python.item_upserted(item.item_id, {field: getattr(item, field) for field in SEARCH_FIELDS})
+
+    def item_removed(self, item_id: int) -> None:
+        if self.backend == "python":
+            self._python.item_removed(item_id)
+
+    def invalidate(self) -> None:
+        if self.backend == "python":
+            self._python.invalidate()
+
+    # --- Arama ---
+
+    def search(self, db, query: str, limit: int = 20, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sıralı, önek eşleşmeli ve vurgulanmış özetli arama sonuçlarını döndür"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        if self.backend == "fts5":
+            ranked = self._search_fts(db, terms, limit, category)
+        else:
+            self._python.ensure(lambda: self._load_documents(db))
+            ranked = self._python.search(terms, limit, category)
+        if not ranked:
+            return []
+
+        columns = ", ".join(("item_id", "category", "sub_category", "item_text", "standards", "status"))
+        rows = db.execute(
+            text(f"SELECT {columns} FROM {self._table.name} WHERE item_id IN ({', '.join(str(int(item_id)) for item_id, _ in ranked)})")
+        ).mappings()
+        rows_by_id = {row["item_id"]: row for row in rows}
+
+        results = []
+        for item_id, score in ranked:
+            row = rows_by_id.get(item_id)
+            if row is None:
+                continue
+            results.append({
+                **row,
+                "status": bool(row["status"]),
+                "score": round(score, 4),
+                "snippet": next(
+                    (snippet for snippet in (highlight(row[field], terms) for field in SEARCH_FIELDS) if snippet),
+                    html.escape(row["item_text"])
+                )
+            })
+        return results
+
+    def _search_fts(self, db, terms: List[str], limit: int, category: Optional[str]) -> List[Tuple[int, float]]:
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in FIELD_WEIGHTS)
+        sql = (
+            f"SELECT f.rowid, bm25({FTS_TABLE}, {weights}) AS rank FROM {FTS_TABLE} f "
+            f"JOIN {self._table.name} c ON c.item_id = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH :match"
+        )
+        params: Dict[str, Any] = {"match": match, "limit": limit}
+        if category:
+            sql += " AND c.category = :category"
+            params["category"] = category
+        sql += " ORDER BY rank LIMIT :limit"
+        return [(item_id, -rank) for item_id, rank in db.execute(text(sql), params)]
+
+    def _load_documents(self, db) -> Iterable[Dict[str, Any]]:
+        columns = ", ".join(("item_id", *SEARCH_FIELDS))
+        return db.execute(text(f"SELECT {columns} FROM {self._table.name}")).mappings()
+
+
+# Uygulama genelinde paylaşılan arama indeksi
+search_index = SearchIndex()
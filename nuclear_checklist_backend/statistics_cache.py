@@ -0,0 +1,232 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bir maddenin istatistiklere etki eden alanları: (kategori, alt kategori, standartlar, durum)
+ItemKey = Tuple[str, str, Optional[str], bool]
+
+
+def completion_summary(total_items, completed_items) -> Dict[str, Any]:
+    """Toplam ve tamamlanan sayılarından özet istatistik sözlüğü oluştur"""
+    total_items = int(total_items or 0)
+    completed_items = int(completed_items or 0)
+    completion_rate = (completed_items / total_items * 100) if total_items > 0 else 0
+
+    return {
+        "total_items": total_items,
+        "completed_items": completed_items,
+        "pending_items": total_items - completed_items,
+        "completion_rate": round(completion_rate, 2)
+    }
+
+
+def split_standards(standards: Optional[str]) -> List[str]:
+    """Virgülle ayrılmış standart metnini tek tek standartlara böl"""
+    if not standards:
+        return []
+    return [part.strip() for part in standards.split(',') if part.strip()]
+
+
+def item_key(category, sub_category, standards, status) -> ItemKey:
+    """İstatistik sayaçları için madde anahtarı oluştur"""
+    return (category, sub_category, standards or None, bool(status))
+
+
+class StatisticsCache:
+    """Yazma işlemleriyle yerinde güncellenen, süreç içi istatistik sayaçları
+
+    Sayaçlar (kategori, alt kategori) ve standart metni bazında [toplam, tamamlanan]
+    olarak tutulur. Önbellek geçersizse bir sonraki okuma ``loader`` ile
+    veritabanından tam yeniden oluşturma yapar.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups: Dict[Tuple[str, str], List[int]] = {}
+        self._standards: Dict[str, List[int]] = {}
+        self._valid = False
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.invalidations = 0
+
+    # --- Okuma ---
+
+    def _ensure(self, loader: Callable[[], Tuple[Iterable, Iterable]]) -> None:
+        """Önbellek geçerliyse isabet say, değilse veritabanından yeniden oluştur"""
+        with self._lock:
+            if self._valid:
+                self.hits += 1
+                return
+            self.misses += 1
+            generation = self._generation
+
+        group_rows, standard_rows = loader()
+
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for category, sub_category, total, completed in group_rows:
+            groups[(category, sub_category)] = [int(total or 0), int(completed or 0)]
+
+        standards: Dict[str, List[int]] = {}
+        for standards_text, total, completed in standard_rows:
+            if standards_text:
+                standards[standards_text] = [int(total or 0), int(completed or 0)]
+
+        with self._lock:
+            self.rebuilds += 1
+            self._groups = groups
+            self._standards = standards
+            # Yeniden oluşturma sırasında yazma olduysa sayaçlar eksik olabilir;
+            # bir sonraki okuma tekrar oluştursun
+            self._valid = generation == self._generation
+
+    def summary(self, loader) -> Dict[str, Any]:
+        """Genel toplam istatistikleri döndür"""
+        self._ensure(loader)
+        with self._lock:
+            total = sum(counts[0] for counts in self._groups.values())
+            completed = sum(counts[1] for counts in self._groups.values())
+        return completion_summary(total, completed)
+
+    def breakdown(self, loader) -> Dict[str, Any]:
+        """Kategori, alt kategori ve standart kırılımlı istatistikleri döndür"""
+        self._ensure(loader)
+        with self._lock:
+            groups = sorted((key, list(counts)) for key, counts in self._groups.items() if counts[0] > 0)
+            standard_counts = [(text, list(counts)) for text, counts in self._standards.items() if counts[0] > 0]
+
+        categories: Dict[str, Dict[str, Any]] = {}
+        total_items = 0
+        completed_items = 0
+        for (category, sub_category), (total, completed) in groups:
+            total_items += total
+            completed_items += completed
+
+            entry = categories.setdefault(category, {"total": 0, "completed": 0, "sub_categories": []})
+            entry["total"] += total
+            entry["completed"] += completed
+            entry["sub_categories"].append({"sub_category": sub_category, **completion_summary(total, completed)})
+
+        standards: Dict[str, List[int]] = {}
+        for standards_text, (total, completed) in standard_counts:
+            for standard in split_standards(standards_text):
+                entry = standards.setdefault(standard, [0, 0])
+                entry[0] += total
+                entry[1] += completed
+
+        return {
+            **completion_summary(total_items, completed_items),
+            "categories": [
+                {
+                    "category": category,
+                    **completion_summary(entry["total"], entry["completed"]),
+                    "sub_categories": entry["sub_categories"]
+                }
+                for category, entry in categories.items()
+            ],
+            "standards": [
+                {"standard": standard, **completion_summary(total, completed)}
+                for standard, (total, completed) in sorted(standards.items())
+            ]
+        }
+
+    def categories(self, loader) -> List[str]:
+        """Madde içeren kategorileri döndür"""
+        self._ensure(loader)
+        with self._lock:
+            return sorted({category for (category, _), counts in self._groups.items() if counts[0] > 0})
+
+    def sub_categories(self, loader, category: Optional[str] = None) -> List[str]:
+        """Madde içeren alt kategorileri döndür (isteğe bağlı kategori filtresi ile)"""
+        self._ensure(loader)
+        with self._lock:
+            return sorted({
+                sub_category
+                for (item_category, sub_category), counts in self._groups.items()
+                if counts[0] > 0 and (not category or item_category == category)
+            })
+
+    # --- Yazma ---
+
+    def _apply(self, key: ItemKey, delta: int) -> None:
+        category, sub_category, standards, status = key
+        group = self._groups.setdefault((category, sub_category), [0, 0])
+        group[0] += delta
+        group[1] += delta if status else 0
+        if standards:
+            counts = self._standards.setdefault(standards, [0, 0])
+            counts[0] += delta
+            counts[1] += delta if status else 0
+
+    def items_added(self, keys: Iterable[ItemKey]) -> None:
+        """Eklenen maddeleri sayaçlara işle"""
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                for key in keys:
+                    self._apply(key, 1)
+
+    def item_counts_added(self, counts: Dict[ItemKey, int]) -> None:
+        """Anahtar başına eklenen madde sayılarını sayaçlara işle (toplu içe aktarma için)"""
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                for key, count in counts.items():
+                    self._apply(key, count)
+
+    def item_added(self, key: ItemKey) -> None:
+        """Eklenen maddeyi sayaçlara işle"""
+        self.items_added([key])
+
+    def item_removed(self, key: ItemKey) -> None:
+        """Silinen maddeyi sayaçlardan düş"""
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                self._apply(key, -1)
+
+    def item_changed(self, old_key: ItemKey, new_key: ItemKey) -> None:
+        """Güncellenen maddenin eski ve yeni değerlerini sayaçlara işle"""
+        if old_key == new_key:
+            return
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                self._apply(old_key, -1)
+                self._apply(new_key, 1)
+
+    def groups_changed(self, changes: Iterable[Tuple[ItemKey, ItemKey, int]]) -> None:
+        """Toplu güncellemede (eski anahtar, yeni anahtar, kayıt sayısı) değişikliklerini işle"""
+        with self._lock:
+            self._generation += 1
+            if self._valid:
+                for old_key, new_key, count in changes:
+                    if old_key != new_key:
+                        self._apply(old_key, -count)
+                        self._apply(new_key, count)
+
+    def invalidate(self) -> None:
+        """Önbelleği geçersiz kıl (bir sonraki okuma tam yeniden oluşturur)"""
+        with self._lock:
+            self._generation += 1
+            self._valid = False
+            self.invalidations += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Önbellek isabet/ıskalama metriklerini döndür"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "valid": self._valid,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0,
+                "rebuilds": self.rebuilds,
+                "invalidations": self.invalidations,
+                "groups": len(self._groups),
+                "standards": len(self._standards)
+            }
+
+
+# Uygulama genelinde paylaşılan önbellek
+statistics_cache = StatisticsCache()